@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Minimal runner of the benchmarks when asv is not available
+
+Usage: python -m benchmarks [name_filter] [--number N]
+Each time_* method of each benchmark class is timed for all its parameter combinations and the
+mean duration of one call is printed.
+"""
+import argparse
+import importlib
+import itertools
+import pkgutil
+import timeit
+from pathlib import Path
+
+
+def iter_benchmarks():
+    for module_info in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if not module_info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module(f'{__package__}.{module_info.name}')
+        for class_name in dir(module):
+            klass = getattr(module, class_name)
+            if isinstance(klass, type) and class_name.startswith('Time') and \
+                    klass.__module__ == module.__name__:
+                for method_name in dir(klass):
+                    if method_name.startswith('time_'):
+                        yield f'{module_info.name}.{class_name}.{method_name}', klass, method_name
+
+
+def run(name_filter: str = '', number: int = 20):
+    for name, klass, method_name in iter_benchmarks():
+        if name_filter not in name:
+            continue
+        params = getattr(klass, 'params', ())
+        param_names = getattr(klass, 'param_names', [])
+        for param in itertools.product(*params) if len(params) != 0 else [()]:
+            bench = klass()
+            if hasattr(bench, 'setup'):
+                bench.setup(*param)
+            try:
+                method = getattr(bench, method_name)
+                duration = timeit.timeit(lambda: method(*param), number=number) / number
+            finally:
+                if hasattr(bench, 'teardown'):
+                    bench.teardown(*param)
+            param_str = ', '.join([f'{param_name}={value!r}'
+                                   for param_name, value in zip(param_names, param)])
+            print(f'{name}({param_str}): {duration * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the pymodaq_data benchmarks')
+    parser.add_argument('name_filter', nargs='?', default='',
+                        help='only run the benchmarks whose name contains this string')
+    parser.add_argument('--number', type=int, default=20,
+                        help='number of calls of each benchmark')
+    args = parser.parse_args()
+    run(args.name_filter, args.number)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the DataWithAxes and DataToExport hot paths
+"""
+import numpy as np
+
+from pymodaq_data.data import DataRaw, DataToExport
+
+from .common import CHANNELS, DIMS, SHAPES, make_axes, make_dwa
+
+
+class TimeDataWithAxes:
+    params = (DIMS, CHANNELS)
+    param_names = ['dim', 'n_channels']
+
+    def setup(self, dim, n_channels):
+        self.arrays = [np.random.rand(*SHAPES[dim]) for _ in range(n_channels)]
+        self.axes = make_axes(SHAPES[dim])
+        self.dwa = make_dwa(dim, n_channels)
+        self.new_arrays = [array.copy() for array in self.dwa]
+
+    def time_construction(self, dim, n_channels):
+        DataRaw('bench', units='V', data=self.arrays, axes=self.axes)
+
+    def time_deepcopy_with_new_data(self, dim, n_channels):
+        self.dwa.deepcopy_with_new_data(self.new_arrays)
+
+    def time_deepcopy(self, dim, n_channels):
+        self.dwa.deepcopy()
+
+
+class TimeSlicing:
+    params = (['Data1D', 'Data2D'], CHANNELS)
+    param_names = ['dim', 'n_channels']
+
+    def setup(self, dim, n_channels):
+        self.dwa = make_dwa(dim, n_channels, nav_shape=(10, 12))
+        self.sig_slices = (5,) if dim == 'Data1D' else (5, slice(None))
+
+    def time_inav_index(self, dim, n_channels):
+        self.dwa.inav[3, 4]
+
+    def time_inav_slice(self, dim, n_channels):
+        self.dwa.inav[2:8, :]
+
+    def time_isig_index(self, dim, n_channels):
+        self.dwa.isig[self.sig_slices]
+
+    def time_vnav(self, dim, n_channels):
+        self.dwa.vnav[0.2:0.8, 0.5]
+
+
+class TimeDataToExport:
+    params = ([10, 100], CHANNELS)
+    param_names = ['n_dwa', 'n_channels']
+
+    def setup(self, n_dwa, n_channels):
+        self.dwas = [make_dwa('Data1D', n_channels, name=f'data{ind:03d}') for ind in range(n_dwa)]
+        self.dte = DataToExport('bench', data=self.dwas)
+
+    def time_append(self, n_dwa, n_channels):
+        dte = DataToExport('bench')
+        for dwa in self.dwas:
+            dte.append(dwa)
+
+    def time_get_data_from_name(self, n_dwa, n_channels):
+        self.dte.get_data_from_name(self.dwas[-1].name)
+
+    def time_get_data_from_full_name(self, n_dwa, n_channels):
+        self.dte.get_data_from_full_name(self.dwas[-1].get_full_name())
+
+    def time_get_data_from_dim(self, n_dwa, n_channels):
+        self.dte.get_data_from_dim('Data1D')
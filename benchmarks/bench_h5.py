@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the saving and loading of data into/from h5 files
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from pymodaq_data.data import Axis, DataToExport
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import (DataToExportSaver, DataToExportEnlargeableSaver,
+                                                DataToExportExtendedSaver, DataLoader)
+
+from .common import BACKENDS, CHANNELS, DIMS, make_dte
+
+
+class H5Benchmark:
+    """Base class creating a temporary h5 file for each benchmark"""
+    params = (DIMS, CHANNELS, BACKENDS)
+    param_names = ['dim', 'n_channels', 'backend']
+
+    def setup(self, dim, n_channels, backend):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.h5saver = H5SaverLowLevel(backend=backend)
+        self.h5saver.init_file(file_name=Path(self.tmp_dir).joinpath('bench.h5'), new_file=True)
+        self.det_group = self.h5saver.get_set_group(self.h5saver.raw_group, 'Detector')
+        self.dte = make_dte(dim, n_channels)
+
+    def teardown(self, dim, n_channels, backend):
+        self.h5saver.close_file()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class TimeDataToExportSaver(H5Benchmark):
+    def setup(self, dim, n_channels, backend):
+        super().setup(dim, n_channels, backend)
+        self.saver = DataToExportSaver(self.h5saver)
+
+    def time_add_data(self, dim, n_channels, backend):
+        self.saver.add_data(self.det_group, self.dte)
+
+
+class TimeDataToExportEnlargeableSaver(H5Benchmark):
+    """Appending rate of DataToExport into enlargeable arrays (time per appended DataToExport)"""
+    params = H5Benchmark.params + ([1, 100],)
+    param_names = H5Benchmark.param_names + ['buffer_size']
+
+    def setup(self, dim, n_channels, backend, buffer_size):
+        super().setup(dim, n_channels, backend)
+        self.saver = DataToExportEnlargeableSaver(self.h5saver, buffer_size=buffer_size)
+        self.axis_value = 0.
+
+    def teardown(self, dim, n_channels, backend, buffer_size):
+        self.saver.flush()
+        super().teardown(dim, n_channels, backend)
+
+    def time_append(self, dim, n_channels, backend, buffer_size):
+        self.axis_value += 1.
+        self.saver.add_data(self.det_group, self.dte, axis_values=[self.axis_value])
+
+
+class TimeDataExtendedSaver(H5Benchmark):
+    """Filling of all the points of a 2D scan"""
+    scan_shape = (10, 10)
+
+    def setup(self, dim, n_channels, backend):
+        super().setup(dim, n_channels, backend)
+        self.saver = DataToExportExtendedSaver(self.h5saver, extended_shape=self.scan_shape)
+        self.saver.add_nav_axes(self.det_group,
+                                [Axis(f'nav{ind}', '', data=np.linspace(0, 1, size), index=ind)
+                                 for ind, size in enumerate(self.scan_shape)])
+
+    def time_scan_fill(self, dim, n_channels, backend):
+        for ind_0 in range(self.scan_shape[0]):
+            for ind_1 in range(self.scan_shape[1]):
+                self.saver.add_data(self.det_group, self.dte, indexes=[ind_0, ind_1])
+
+
+class TimeDataLoader(H5Benchmark):
+    def setup(self, dim, n_channels, backend):
+        super().setup(dim, n_channels, backend)
+        DataToExportSaver(self.h5saver).add_data(self.det_group, self.dte)
+        self.loader = DataLoader(self.h5saver)
+        self.data_path = f'{self.det_group.path}/{dim}/CH00/Data00'
+
+    def time_load_data(self, dim, n_channels, backend):
+        self.loader.load_data(self.data_path, load_all=True)
+
+    def time_load_all(self, dim, n_channels, backend):
+        self.loader.load_all(self.h5saver.raw_group, DataToExport('all'))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the numpy ufuncs applied on DataWithAxes objects
+
+Compares the fast path (ufuncs applied directly on the magnitudes) with the path going through
+pint quantities. Can be run with asv or as a script: python -m benchmarks.bench_ufunc
+"""
+import timeit
+
+import numpy as np
+
+from pymodaq_data import data as data_mod
+
+
+def _pint_only(*args, **kwargs):
+    return False, None
+
+
+class TimeUfunc:
+    params = ([1, 10, 100], [(100,), (256, 256)], ['', 'm'], [True, False])
+    param_names = ['n_channels', 'shape', 'units', 'fast']
+
+    def setup(self, n_channels, shape, units, fast):
+        self.dwa = data_mod.DataRaw('bench', units=units,
+                                    data=[np.random.rand(*shape) for _ in range(n_channels)])
+        self._get_ufunc_result_units = data_mod.get_ufunc_result_units
+        if not fast:
+            data_mod.get_ufunc_result_units = _pint_only
+
+    def teardown(self, n_channels, shape, units, fast):
+        data_mod.get_ufunc_result_units = self._get_ufunc_result_units
+
+    def time_add(self, n_channels, shape, units, fast):
+        self.dwa + self.dwa
+
+    def time_multiply_scalar(self, n_channels, shape, units, fast):
+        self.dwa * 2
+
+
+def main(number=200):
+    bench = TimeUfunc()
+    for n_channels in TimeUfunc.params[0]:
+        for shape in TimeUfunc.params[1]:
+            for units in TimeUfunc.params[2]:
+                timings = dict([])
+                for fast in TimeUfunc.params[3]:
+                    bench.setup(n_channels, shape, units, fast)
+                    try:
+                        for operation in ('add', 'multiply_scalar'):
+                            func = getattr(bench, f'time_{operation}')
+                            timings[(operation, fast)] = timeit.timeit(
+                                lambda: func(n_channels, shape, units, fast), number=number) / number
+                    finally:
+                        bench.teardown(n_channels, shape, units, fast)
+                for operation in ('add', 'multiply_scalar'):
+                    print(f'{operation:>16} channels={n_channels:<4} shape={str(shape):<11} '
+                          f'units={units!r:<4} pint: {timings[(operation, False)] * 1e6:9.1f} us '
+                          f'fast: {timings[(operation, True)] * 1e6:9.1f} us '
+                          f'speedup: {timings[(operation, False)] / timings[(operation, True)]:5.1f}')
+
+
+if __name__ == '__main__':
+    main()
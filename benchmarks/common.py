@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Data factories shared by the benchmarks
+"""
+import numpy as np
+
+from pymodaq_data.data import Axis, DataRaw, DataToExport, DataWithAxes
+
+SHAPES = dict(Data0D=(1,), Data1D=(256,), Data2D=(128, 128))
+DIMS = list(SHAPES.keys())
+CHANNELS = [1, 8]
+BACKENDS = ['tables', 'h5py']
+
+
+def make_axes(shape, first_index=0):
+    return [Axis(f'axis{ind}', 'm', data=np.linspace(0, 1, size), index=first_index + ind)
+            for ind, size in enumerate(shape) if size > 1]
+
+
+def make_dwa(dim: str, n_channels: int, name='bench', nav_shape=()) -> DataWithAxes:
+    """Get a DataRaw of the given dimensionality with eventually some navigation dimensions"""
+    shape = tuple(nav_shape) + SHAPES[dim]
+    return DataRaw(name, units='V',
+                   data=[np.random.rand(*shape) for _ in range(n_channels)],
+                   labels=[f'CH{ind:02d}' for ind in range(n_channels)],
+                   axes=make_axes(shape), nav_indexes=tuple(range(len(nav_shape))))
+
+
+def make_dte(dim: str, n_channels: int, n_dwa=2, name='bench') -> DataToExport:
+    return DataToExport(name, data=[make_dwa(dim, n_channels, name=f'{name}{ind:02d}')
+                                    for ind in range(n_dwa)])
@@ -15,33 +15,15 @@ try:
     except Exception:
         print("Couldn't create the local folder to store logs , presets...")
 
-    logger.info('************************')
-    logger.info('Initializing the pint unit register')
-    logger.info('************************')
     ureg = UnitRegistry()
     ureg.default_format = '~'
     Q_ = ureg.Quantity
     Unit = ureg.Unit
-    logger.info('')
-    logger.info('')
-
-    from pymodaq_data.h5modules.utils import register_exporters
-    logger.info('')
-    logger.info('')
-    logger.info('************************')
-    logger.info(f"Registering exporters...")
-    register_exporters()
-    logger.info(f"Done")
-    logger.info('************************')
 
+    # exporters and plotters are registered when first requested from their factory
+    # see pymodaq_data.h5modules.exporter.EXPORTERS_MANIFEST and
+    # pymodaq_data.plotting.plotter.plotter.PLOTTERS_MANIFEST
     from pymodaq_data.plotting.plotter.plotter import register_plotter, PlotterFactory
-    logger.info('')
-    logger.info('')
-    logger.info('************************')
-    logger.info(f"Registering plotters...")
-    register_plotter()
-    logger.info(f"Done")
-    logger.info('************************')
 
     from pymodaq_data.data import (DataRaw, DataWithAxes, DataToExport, Axis,
                                    DataCalculated, DataDim, DataDistribution, DataSource, DataBase)
@@ -10,7 +10,7 @@ from abc import ABCMeta, abstractmethod, abstractproperty
 import numbers
 import numpy as np
 from numpy.lib.mixins import NDArrayOperatorsMixin
-from typing import List, Tuple, Union, Any, Callable
+from typing import List, Tuple, Union, Any, Callable, Dict
 from typing import Iterable as IterableType
 from collections.abc import Iterable
 from collections import OrderedDict
@@ -19,6 +19,8 @@ import logging
 import warnings
 from time import time
 import copy
+import hashlib
+import weakref
 import pint
 from pint.compat import upcast_type_map
 
@@ -32,7 +34,8 @@ from pymodaq_data.slicing import SpecialSlicersData
 from pymodaq_utils import math_utils as mutils
 from pymodaq_utils.config import Config
 from pymodaq_data.plotting.plotter.plotter import PlotterFactory
-from pymodaq_data.numpy_func import HANDLED_FUNCTIONS, HANDLED_UFUNCS, process_arguments_for_ufuncs
+from pymodaq_data.numpy_func import (HANDLED_FUNCTIONS, HANDLED_UFUNCS, process_arguments_for_ufuncs,
+                                     process_stacked_arguments_for_ufuncs, get_ufunc_result_units)
 from pymodaq_data import Q_, ureg, Unit
 
 config = Config()
@@ -58,6 +61,16 @@ def squeeze(data_array: np.ndarray, do_squeeze=True, squeeze_indexes: Tuple[int]
         return np.atleast_1d(data_array)
 
 
+def squeeze_stacked(stacked: np.ndarray, do_squeeze=True) -> np.ndarray:
+    """ Same as squeeze but applied to each (length, *shape) stacked array in one call"""
+    if do_squeeze:
+        stacked = np.squeeze(stacked, axis=tuple([ind for ind in range(1, stacked.ndim)
+                                                  if stacked.shape[ind] == 1]))
+    if stacked.ndim == 1:
+        stacked = stacked[:, np.newaxis]
+    return stacked
+
+
 class DataIndexWarning(Warning):
     pass
 
@@ -100,6 +113,264 @@ class DataUnitError(Exception):
     pass
 
 
+class DataMutationError(Exception):
+    pass
+
+
+class LazyArray(metaclass=ABCMeta):
+    """Base class for read-only array proxies deferring the reading of their values
+
+    Can be stored as data in DataBase objects: indexing a LazyArray only reads the requested
+    part of the underlying storage (for instance a hdf5 dataset) and returns a numpy array, while
+    numpy functions and operations read the whole array, except the reductions processed out-of-core
+    by the reduce method.
+
+    Parameters
+    ----------
+    shape: tuple of int
+    dtype: np.dtype
+
+    Attributes
+    ----------
+    chunk_bytes: int
+        The maximum size in bytes of the blocks read by the reduce method
+    """
+
+    chunk_bytes = 2 ** 26
+
+    def __init__(self, shape: Tuple[int], dtype: np.dtype):
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+
+    @abstractmethod
+    def _read(self, item) -> np.ndarray:
+        """Read and return the part of the array given by item"""
+        ...
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return self._shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self._shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self._shape))
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __getitem__(self, item) -> np.ndarray:
+        return self._read(item)
+
+    def read(self) -> np.ndarray:
+        """Read the whole array"""
+        return self._read(Ellipsis)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.read()
+        return array if dtype is None else array.astype(dtype)
+
+    def __deepcopy__(self, memo):
+        return self  # read-only so can be shared
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} <{self.shape}> <{self.dtype}>'
+
+    def iter_blocks(self, block_length: int = None) -> IterableType[np.ndarray]:
+        """Read the array by blocks along its first dimension
+
+        Parameters
+        ----------
+        block_length: int
+            the length of the blocks along the first dimension, if None computed so that each block
+            holds at most chunk_bytes (but always at least one element along the first dimension)
+        """
+        if block_length is None:
+            block_bytes = self.dtype.itemsize * int(np.prod(self.shape[1:]))
+            block_length = max(1, self.chunk_bytes // max(1, block_bytes))
+        for start in range(0, self.shape[0], block_length):
+            yield self[start:start + block_length]
+
+    def reduce(self, func: Callable, axis: Union[int, IterableType[int]] = None,
+               *args, **kwargs) -> np.ndarray:
+        """Apply a numpy reduction out-of-core, reading the array by blocks along its first dimension
+
+        np.sum, np.mean, np.max, np.min, np.std and np.var (with its ddof argument) are accumulated
+        block by block: running sums, extrema and mean/variance using the parallel version of
+        Welford's algorithm. Other functions or arguments fall back to reading the whole array.
+
+        Parameters
+        ----------
+        func: Callable
+            a numpy reduction function such as np.mean or np.sum
+        axis: int or iterable of int
+            The axis of the array to reduce, all of them if None
+
+        Returns
+        -------
+        np.ndarray: the same array as func(self.read(), axis) would return, up to rounding errors
+        """
+        name = LAZY_REDUCTIONS.get(func, None)
+        ddof = kwargs.get('ddof', 0)
+        if name is None or len(args) != 0 or len(set(kwargs.keys()) - {'ddof'}) != 0 or \
+                (ddof != 0 and name not in ('std', 'var')):
+            return np.asarray(func(self.read(), axis, *args, **kwargs))
+        if self.shape[0] == 0:  # no block to process, for instance an empty enlargeable array
+            return np.asarray(func(self.read(), axis, **kwargs))
+
+        axis = tuple(range(self.ndim)) if axis is None else np.atleast_1d(axis).tolist()
+        axis = tuple(sorted({ax % self.ndim for ax in axis}))
+        if 0 not in axis:  # the blocks are independent
+            return np.concatenate([np.asarray(func(block, axis, **kwargs)) for block in self.iter_blocks()],
+                                  axis=0)
+
+        out_dtype = get_reduction_dtype(name, self.dtype)
+        acc_dtype = np.result_type(self.dtype, float)
+        result = None
+        count = 0
+        m2 = None
+        for block in self.iter_blocks():
+            if name == 'sum':
+                partial = np.sum(block, axis)
+                result = partial if result is None else result + partial
+            elif name == 'max':
+                partial = np.max(block, axis)
+                result = partial if result is None else np.maximum(result, partial)
+            elif name == 'min':
+                partial = np.min(block, axis)
+                result = partial if result is None else np.minimum(result, partial)
+            else:
+                block_count = int(np.prod([block.shape[ax] for ax in axis]))
+                block_mean = np.mean(block, axis, dtype=acc_dtype, keepdims=True)
+                block_m2 = np.sum(np.abs(block - block_mean) ** 2, axis)
+                block_mean = np.squeeze(block_mean, axis=axis)
+                if result is None:
+                    result, m2 = block_mean, block_m2
+                else:
+                    delta = block_mean - result
+                    total = count + block_count
+                    result = result + delta * block_count / total
+                    m2 = m2 + block_m2 + np.abs(delta) ** 2 * count * block_count / total
+                count += block_count
+        if name in ('std', 'var'):
+            result = m2 / (count - ddof)
+            if name == 'std':
+                result = np.sqrt(result)
+        return np.asarray(result).astype(out_dtype)
+
+
+LAZY_REDUCTIONS = {np.sum: 'sum', np.mean: 'mean', np.max: 'max', np.amax: 'max', np.min: 'min',
+                   np.amin: 'min', np.std: 'std', np.var: 'var'}
+
+
+def get_reduction_dtype(name: str, dtype: np.dtype) -> np.dtype:
+    """Get the dtype numpy gives to the result of one of the LAZY_REDUCTIONS, without computing it
+
+    * sum: booleans and integers smaller than the platform integer are promoted to it
+    * mean, std and var: integers are computed as float64, std and var of complex are real
+    * max and min: the dtype of the array
+    """
+    dtype = np.dtype(dtype)
+    if name == 'sum':
+        if dtype.kind in 'bi' and dtype.itemsize <= np.dtype(np.int_).itemsize:
+            return np.dtype(np.int_)
+        elif dtype.kind == 'u' and dtype.itemsize <= np.dtype(np.uint).itemsize:
+            return np.dtype(np.uint)
+        return dtype
+    elif name in ('mean', 'std', 'var'):
+        if dtype.kind not in 'fc':
+            dtype = np.dtype(np.float64)
+        if name != 'mean' and dtype.kind == 'c':
+            dtype = np.finfo(dtype).dtype
+        return dtype
+    return dtype
+
+
+def get_sliced_shape(shape: Tuple[int], slices) -> Tuple[int]:
+    """Get the shape an array of a given shape would have once sliced, without any allocation"""
+    return np.lib.stride_tricks.as_strided(np.zeros((1,), dtype=bool), shape=shape,
+                                           strides=[0 for _ in shape])[slices].shape
+
+
+class StackedArrays(list):
+    """List of equal-shape arrays stored as views of a single contiguous (length, *shape) ndarray
+
+    Used as the data list of DataBase objects in contiguous mode so that numpy operations can be
+    applied in one call over all the channels. Assigning an array at a given index copies it into
+    the stacked array. Any other modification of the list (append, slice assignment...) unlinks
+    the views from the stacked array and the per channel processing is used instead.
+
+    Parameters
+    ----------
+    stacked: np.ndarray
+        array whose first dimension indexes the channels
+    """
+
+    def __init__(self, stacked: np.ndarray):
+        self.stacked = stacked
+        self._views = tuple([stacked[ind] for ind in range(len(stacked))])
+        super().__init__(self._views)
+
+    @classmethod
+    def from_arrays(cls, arrays: List[np.ndarray]) -> StackedArrays:
+        """Copy the given arrays into a single stacked array"""
+        return cls(np.stack([np.asarray(array) for array in arrays]))
+
+    def is_linked(self) -> bool:
+        """Check if the list items are still the views of the stacked array"""
+        return len(self) == len(self._views) and all(
+            [array is view for array, view in zip(self, self._views)])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, numbers.Integral) and self.is_linked():
+            self.stacked[index] = value
+        else:
+            super().__setitem__(index, value)
+
+    def __deepcopy__(self, memo):
+        if self.is_linked():
+            return StackedArrays(self.stacked.copy())
+        return StackedArrays.from_arrays([copy.deepcopy(array, memo) for array in self])
+
+    def __reduce__(self):
+        if self.is_linked():
+            return StackedArrays, (self.stacked,)
+        return StackedArrays.from_arrays, (list(self),)
+
+    def reduce(self, func: Callable, axis: Union[int, IterableType[int]] = None,
+               *args, **kwargs) -> StackedArrays:
+        """Apply a numpy reduction in one call over all the stacked arrays
+
+        Parameters
+        ----------
+        func: Callable
+            a numpy reduction function such as np.mean or np.sum
+        axis: int or iterable of int
+            The axis of the individual arrays to reduce, all of them if None
+
+        Returns
+        -------
+        StackedArrays: the reduced arrays, at least 1D as when processed one by one
+        """
+        if axis is None:
+            axis = tuple(range(1, self.stacked.ndim))
+        elif isinstance(axis, numbers.Integral):
+            axis = axis + 1 if axis >= 0 else axis
+        else:
+            axis = tuple([ax + 1 if ax >= 0 else ax for ax in axis])
+        reduced = np.asarray(func(self.stacked, axis, *args, **kwargs))
+        if reduced.ndim == 1:
+            reduced = reduced.reshape((len(self), 1))
+        return StackedArrays(reduced)
+
+
 class DwaType(BaseEnum):
     DataWithAxes = 0
     DataRaw = 1
@@ -159,6 +430,58 @@ class DataDistribution(BaseEnum):
     spread = 1
 
 
+class AxisKind(BaseEnum):
+    """Enum for the classification of axis data"""
+    linear = 0
+    monotonic = 1
+    irregular = 2
+
+
+def classify_axis_data(data: np.ndarray, chunk_size: int = 65536) -> AxisKind:
+    """Classify 1D axis data as linear, strictly monotonic or irregular
+
+    The data is processed in a single pass, chunk by chunk within a reused buffer, so that no full
+    size temporary array is allocated for large axes. Linearity is equivalent to
+    np.allclose(np.diff(data), np.mean(np.diff(data)))
+
+    Parameters
+    ----------
+    data: ndarray
+        1D array
+    chunk_size: int
+        the number of steps processed at once
+
+    Returns
+    -------
+    AxisKind
+    """
+    if isinstance(data, Q_):
+        data = data.magnitude
+    if data.size <= 1:
+        return AxisKind['linear']
+    mean_step = (data[-1] - data[0]) / (data.size - 1)
+    tolerance = 1e-8 + 1e-5 * np.abs(mean_step)
+    buffer = np.empty((min(chunk_size, data.size - 1),), dtype=np.result_type(data.dtype, float))
+    linear = increasing = decreasing = True
+    for start in range(0, data.size - 1, chunk_size):
+        stop = min(start + chunk_size, data.size - 1)
+        steps = buffer[:stop - start]
+        np.subtract(data[start + 1:stop + 1], data[start:stop], out=steps)
+        increasing = increasing and steps.min() > 0
+        decreasing = decreasing and steps.max() < 0
+        if linear:
+            np.subtract(steps, mean_step, out=steps)
+            np.abs(steps, out=steps)
+            linear = steps.max() <= tolerance
+        if not (linear or increasing or decreasing):
+            break
+    if linear:
+        return AxisKind['linear']
+    elif increasing or decreasing:
+        return AxisKind['monotonic']
+    return AxisKind['irregular']
+
+
 def _compute_slices_from_axis(axis: Axis, _slice, *ignored, is_index=True, **ignored_also):
     if not is_index:
         if isinstance(_slice, numbers.Number):
@@ -169,11 +492,10 @@ def _compute_slices_from_axis(axis: Axis, _slice, *ignored, is_index=True, **ign
         elif isinstance(_slice, slice):
             if not (_slice.start is None and
                     _slice.stop is None and _slice.step is None):
-                start = axis.find_index(
-                    _slice.start if _slice.start is not None else axis.get_data()[0])
-                stop = axis.find_index(
-                    _slice.stop if _slice.stop is not None else axis.get_data()[-1])
-                _slice = slice(start, stop)
+                start, stop = axis.find_indexes(
+                    [_slice.start if _slice.start is not None else axis.get_data()[0],
+                     _slice.stop if _slice.stop is not None else axis.get_data()[-1]])
+                _slice = slice(int(start), int(stop))
     return _slice
 
 
@@ -205,16 +527,33 @@ class Axis:
     Examples
     --------
     >>> axis = Axis('myaxis', units='seconds', data=np.array([1,2,3,4,5]), index=0)
+
+    Notes
+    -----
+    The iaxis and vaxis slicers are only created when first used, and the linear data of axes defined
+    by a scaling and an offset is computed once and cached (as a read-only array) until one of scaling,
+    offset or size is changed. The classification of the data (see kind) is also cached until new data
+    is set, hence the data array should not be modified in place except through the slicers.
+
+    Copies (see copy) share a read-only view of the data array of the original axis (also returned by their
+    data attribute), the copy getting its own array the first time it is modified through its slicers or
+    arithmetic operators.
     """
 
     base_type = 'Axis'
 
+    __slots__ = ('_iaxis', '_vaxis', '_size', '_data', '_index', '_label', '_units', '_scaling', '_offset',
+                 '_linear_cache', '_kind', '_shared', 'spread_order', '__weakref__')
+
     def __init__(self, label: str = '', units: str = '', data: np.ndarray = None, index: int = 0,
                  scaling=None, offset=None, size=None, spread_order: int = 0):
         super().__init__()
 
-        self.iaxis: Axis = SpecialSlicersData(self, False)
-        self.vaxis: Axis = SpecialSlicersData(self, False, False)
+        self._iaxis: SpecialSlicersData = None
+        self._vaxis: SpecialSlicersData = None
+        self._linear_cache: Tuple[Tuple[float, float, int], np.ndarray] = None
+        self._kind: AxisKind = None
+        self._shared = False
 
         self._size = size
         self._data = None
@@ -237,12 +576,69 @@ class Axis:
         return Axis(label, str(quantity.units), data=quantity.magnitude,
                     index=index)
 
+    @property
+    def iaxis(self) -> Axis:
+        """SpecialSlicersData: slicer of the axis using indexes"""
+        if self._iaxis is None:
+            self._iaxis = SpecialSlicersData(self, False)
+        return self._iaxis
+
+    @property
+    def vaxis(self) -> Axis:
+        """SpecialSlicersData: slicer of the axis using values"""
+        if self._vaxis is None:
+            self._vaxis = SpecialSlicersData(self, False, False)
+        return self._vaxis
+
     def copy(self):
-        return copy.copy(self)
+        """Cheap copy of the axis: its slicers are bound to the copy and its data array (if any)
+        is shared as a read-only view, copied on write by the copy"""
+        ax = copy.copy(self)
+        ax._iaxis = None
+        ax._vaxis = None
+        ax._data = self._shared_view()
+        ax._shared = ax._data is not None
+        return ax
+
+    def __deepcopy__(self, memo):
+        ax = copy.copy(self)
+        memo[id(self)] = ax
+        ax._iaxis = None
+        ax._vaxis = None
+        ax._data = copy.deepcopy(self._data, memo)
+        ax._shared = False
+        return ax
+
+    def _shared_view(self) -> Union[np.ndarray, None]:
+        """Get a read-only view of the axis data array to be shared with a copy, leaving the flags
+        of this axis array untouched"""
+        if self._data is None:
+            return None
+        view = self._data.view()
+        view.flags.writeable = False
+        return view
+
+    def _own_data(self):
+        """Replace the shared view of the data array (if any) by a copy owned by this axis"""
+        if self._shared:
+            if self._data is not None:
+                self._data = self._data.copy()
+            self._shared = False
+
+    def _writable_data(self) -> Union[np.ndarray, None]:
+        """Get the axis data array, copying it first if it is shared with other axes
+
+        As it is meant to be modified, the cached classification is reset
+        """
+        self._own_data()
+        if self._data is not None and not self._data.flags.writeable:
+            self._data = self._data.copy()
+        self._kind = None
+        return self._data
 
     def as_dwa(self, set_itself_as_axis=False) -> DataWithAxes:
         dwa = DataRaw(self.label, units=self.units,
-                      data=[self.get_data()],
+                      data=[np.array(self.get_data())],
                       labels=[f'{self.label}_{self.units}'])
         if not set_itself_as_axis:
             dwa.create_missing_axes()
@@ -323,13 +719,20 @@ class Axis:
 
     @property
     def data(self):
-        """np.ndarray: get/set the data of Axis"""
+        """np.ndarray: get/set the data of Axis
+
+        If the data array is shared with the axis this one is a copy of, it is returned as a read-only
+        view: set new data (or use the slicers) to modify it
+        """
         return self._data
 
     @data.setter
     def data(self, data: Union[np.ndarray, Q_]):
+        self._shared = False
         if data is not None:
             self._check_data_valid(data)
+            self._data = data
+            self._kind = None
             self.get_scale_offset_from_data(data)
             self._size = data.size
         elif self.size is None:
@@ -337,8 +740,18 @@ class Axis:
         self._data = data
 
     def get_data(self) -> np.ndarray:
-        """Convenience method to obtain the axis data (usually None because scaling and offset are used)"""
-        return self._data if self._data is not None else self._linear_data(self.size)
+        """Convenience method to obtain the axis data (usually None because scaling and offset are used)
+
+        For linear axes, the returned array is a cached read-only array
+        """
+        if self._data is not None:
+            return self._data
+        key = (self._offset, self._scaling, self._size)
+        if self._linear_cache is None or self._linear_cache[0] != key:
+            linear_data = self._linear_data(self._size)
+            linear_data.flags.writeable = False
+            self._linear_cache = (key, linear_data)
+        return self._linear_cache[1]
 
     def get_quantity(self) -> Q_:
         """ Convenience method to obtain the numerical data as a quantity array"""
@@ -372,17 +785,23 @@ class Axis:
             if len(data) == 1:
                 self._scaling = 1
             else:
-                self._scaling = np.mean(np.diff(data))
+                self._scaling = (data[-1] - data[0]) / (len(data) - 1)
             self._offset = data[0]
             self._data = None
 
+    @property
+    def kind(self) -> AxisKind:
+        """AxisKind: the classification of the axis data, computed once and cached until new data is set"""
+        if self._data is None:
+            return AxisKind['linear']
+        if self._kind is None:
+            self._kind = classify_axis_data(self._data)
+        return self._kind
+
     def is_axis_linear(self, data=None):
-        if data is None:
-            data = self.get_data()
-        if data is not None:
-            return np.allclose(np.diff(data), np.mean(np.diff(data)))
-        else:
-            return False
+        if data is None or data is self._data:
+            return self.kind == AxisKind['linear']
+        return classify_axis_data(data) == AxisKind['linear']
 
     @property
     def scaling(self):
@@ -446,7 +865,7 @@ class Axis:
         return _slice, _slice
 
     def _slicer(self, _slice, *ignored, is_index=True, **ignored_also):
-        ax: Axis = copy.deepcopy(self)
+        ax: Axis = self.copy()
         _slice, _slice = self._compute_slices(_slice, is_index=is_index)
         if isinstance(_slice, numbers.Number):
             ax.data = np.array([ax.get_data()[_slice]])
@@ -458,11 +877,10 @@ class Axis:
                 ax.data = ax._data.__getitem__(_slice)
                 return ax
             else:
-                start = _slice.start if _slice.start is not None else 0
-                stop = _slice.stop if _slice.stop is not None else self.size
-
+                start, stop, step = _slice.indices(self.size)
                 ax._offset = ax.offset + start * ax.scaling
-                ax._size = stop - start
+                ax._scaling = ax.scaling * step
+                ax._size = len(range(start, stop, step))
                 return ax
 
     def __getitem__(self, item):
@@ -477,8 +895,10 @@ class Axis:
     def __mul__(self, scale: numbers.Real):
         if isinstance(scale, numbers.Real):
             ax = copy.deepcopy(self)
-            if self.data is not None:
-                ax.data *= scale
+            if self._data is not None:
+                data = ax._writable_data()
+                data *= scale
+                ax.data = data
             else:
                 ax._offset *= scale
                 ax._scaling *= scale
@@ -487,8 +907,10 @@ class Axis:
     def __add__(self, offset: numbers.Real):
         if isinstance(offset, numbers.Real):
             ax = copy.deepcopy(self)
-            if self.data is not None:
-                ax.data += offset
+            if self._data is not None:
+                data = ax._writable_data()
+                data += offset
+                ax.data = data
             else:
                 ax._offset += offset
             return ax
@@ -498,9 +920,9 @@ class Axis:
             eq = self.label == other.label
             eq = eq and (Unit(self.units).is_compatible_with(other.units))
             eq = eq and (self.index == other.index)
-            if self.data is not None and other.data is not None:
-                eq = eq and (np.allclose(Q_(self.data, self.units),
-                                         Q_(other.data, other.units)))
+            if self._data is not None and other._data is not None:
+                eq = eq and (np.allclose(Q_(self._data, self.units),
+                                         Q_(other._data, other.units)))
             else:
                 eq = eq and (np.allclose(Q_(self.offset, self.units),
                                          Q_(other.offset, other.units)))
@@ -535,20 +957,52 @@ class Axis:
             return self.offset + (self.size * self.scaling if self.scaling > 0 else 0)
 
     def find_index(self, threshold: float) -> int:
-        """find the index of the threshold value within the axis"""
-        if threshold < self.min():
-            return 0
-        elif threshold > self.max():
-            return len(self) - 1
-        elif self._data is not None:
-            return mutils.find_index(self._data, threshold)[0][0]
-        else:
-            return int((threshold - self.offset) / self.scaling)
+        """find the index of the axis value the closest to threshold"""
+        return int(self.find_indexes(threshold)[0])
+
+    def find_indexes(self, thresholds: IterableType[float]) -> np.ndarray:
+        """find the indexes of the axis values the closest to each threshold
+
+        The lookup is vectorized over thresholds: closed form for linear axes, binary search for
+        strictly monotonic axes and a full scan otherwise. Ties are resolved to the lowest index.
+
+        Parameters
+        ----------
+        thresholds: float or iterable of float
+
+        Returns
+        -------
+        np.ndarray: the indexes as a 1D integer array
+        """
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        if self._data is None:
+            if self.size <= 1 or self.scaling == 0:
+                return np.zeros(thresholds.shape, dtype=int)
+            indexes = np.ceil((thresholds - self.offset) / self.scaling - 0.5)
+            return np.clip(indexes, 0, self.size - 1).astype(int)
+
+        data = self._data
+        if data.size <= 1:
+            return np.zeros(thresholds.shape, dtype=int)
+        kind = self.kind
+        mean_step = (data[-1] - data[0]) / (data.size - 1)
+        if kind == AxisKind['monotonic'] or (kind == AxisKind['linear'] and  # strictly monotonic too
+                                             np.abs(mean_step) * (1 - 1e-5) > 1e-8):
+            if mean_step > 0:
+                return self._search_sorted(data, thresholds)
+            return data.size - 1 - self._search_sorted(data[::-1], thresholds, lower_first=False)
+        return np.argmin(np.abs(data[np.newaxis, :] - thresholds[:, np.newaxis]), axis=1)
 
-    def find_indexes(self, thresholds: IterableType[float]) -> IterableType[int]:
-        if isinstance(thresholds, numbers.Number):
-            thresholds = [thresholds]
-        return [self.find_index(threshold) for threshold in thresholds]
+    @staticmethod
+    def _search_sorted(data: np.ndarray, thresholds: np.ndarray, lower_first=True) -> np.ndarray:
+        """Closest indexes of thresholds within a strictly increasing array"""
+        upper = np.clip(np.searchsorted(data, thresholds), 1, data.size - 1)
+        lower = upper - 1
+        if lower_first:
+            take_lower = thresholds - data[lower] <= data[upper] - thresholds
+        else:
+            take_lower = thresholds - data[lower] < data[upper] - thresholds
+        return np.where(take_lower, lower, upper)
 
 
 class NavAxis(Axis):
@@ -573,10 +1027,24 @@ class DataLowLevel:
         Time in seconds since epoch. See method time.time()
     """
 
+    _owners: weakref.WeakSet = None  # the DataToExport objects whose indexes hold this object
+
     def __init__(self, name: str):
         self._timestamp = time()
         self._name = name
 
+    def __getstate__(self):
+        """Copies (and pickles) are not held by the DataToExport indexes of the original"""
+        state = self.__dict__.copy()
+        state.pop('_owners', None)
+        return state
+
+    def _identity_changed(self):
+        """Invalidate the lookup indexes of the DataToExport objects this object is stored in"""
+        if self._owners:
+            for owner in list(self._owners):
+                owner._index_stale = True
+
     @property
     def name(self):
         """Get/Set the identifier of the data"""
@@ -585,6 +1053,7 @@ class DataLowLevel:
     @name.setter
     def name(self, other_name: str):
         self._name = other_name
+        self._identity_changed()
 
     @property
     def timestamp(self):
@@ -624,6 +1093,9 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         from when scanning multiple detectors.
     units: str
         A unit string identifier as specified in the UnitRegistry of the pint module
+    contiguous: bool
+        If True, the data arrays are stored as views of a single (length, *shape) ndarray so that
+        numpy operations apply in one call over all channels. See StackedArrays
 
     kwargs: named parameters
         All other parameters are stored dynamically using the name/value pair. The name of these
@@ -694,7 +1166,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
                  distribution: DataDistribution = DataDistribution.uniform,
                  data: List[np.ndarray] = None,
                  labels: List[str] = None, origin: str = '',
-                 units: str = '',
+                 units: str = '', contiguous: bool = False,
                  **kwargs):
 
         super().__init__(name=name)
@@ -707,7 +1179,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         self._dim = dim
         self._units = check_units(units)
         self._errors = None
-        self.origin = origin
+        self._origin = origin
 
         source = enum_checker(DataSource, source)
         self._source = source
@@ -716,11 +1188,23 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         self._distribution = distribution
 
         self.data = data  # dim consistency is actually checked within the setter method
+        if contiguous:
+            self.contiguous = True
 
         self._check_labels(labels)
         self.extra_attributes = []
         self.add_extra_attribute(**kwargs)
 
+    @property
+    def origin(self) -> str:
+        """str: the identifier of the element where the data originated"""
+        return self._origin
+
+    @origin.setter
+    def origin(self, origin: str):
+        self._origin = origin
+        self._identity_changed()
+
     @property
     def units(self):
         return self._units
@@ -875,19 +1359,43 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         ufunc_name = ufunc.__name__
         if ufunc_name not in HANDLED_UFUNCS:
             raise NotImplementedError
-        else:
-            ufunc = HANDLED_UFUNCS[ufunc_name]
         if method == '__call__':
-            elts = process_arguments_for_ufuncs(self, inputs)
-            dwa = self.deepcopy()
+            fast, fast_units = False, None
+            if 'out' not in kwargs:
+                fast, fast_units = get_ufunc_result_units(ufunc_name, inputs)
+            if fast:
+                # the result units are known: apply the numpy ufunc directly on the magnitudes
+                with_units = False
+            else:
+                ufunc = HANDLED_UFUNCS[ufunc_name]
+                with_units = True
+
+            dwa = self._clone_structure()
+            if self._errors is not None:
+                dwa._errors = copy.deepcopy(self._errors)
             dwa.name = f'{self.name}_{ufunc_name}'
-            units = dwa.units
-            ufunc_results = [ufunc(*zipped, **kwargs) for zipped in list(zip(*elts))]
-            if isinstance(ufunc_results[0], Q_):
-                ufunc_results = [ufunc_result.to_reduced_units() for ufunc_result in ufunc_results]
-                units = str(ufunc_results[0].units)
-                ufunc_results = [ufunc_result.magnitude for ufunc_result in ufunc_results]
-            dwa.data = ufunc_results
+            units = self.units
+            stacked_elts = process_stacked_arguments_for_ufuncs(self, inputs, with_units)
+            if stacked_elts is not None and 'out' not in kwargs:
+                ufunc_result = ufunc(*stacked_elts, **kwargs)
+                if isinstance(ufunc_result, Q_):
+                    ufunc_result = ufunc_result.to_reduced_units()
+                    units = str(ufunc_result.units)
+                    ufunc_result = ufunc_result.magnitude
+                dwa.data = StackedArrays(np.asarray(ufunc_result))
+            else:
+                elts = process_arguments_for_ufuncs(self, inputs, with_units)
+                ufunc_results = [ufunc(*zipped, **kwargs) for zipped in list(zip(*elts))]
+                if isinstance(ufunc_results[0], Q_):
+                    ufunc_results = [ufunc_result.to_reduced_units()
+                                     for ufunc_result in ufunc_results]
+                    units = str(ufunc_results[0].units)
+                    ufunc_results = [ufunc_result.magnitude for ufunc_result in ufunc_results]
+                dwa.data = ufunc_results
+                if self.contiguous:
+                    dwa.contiguous = True
+            if fast and fast_units is not None:
+                units = fast_units
             dwa.force_units(units)
             return dwa
         else:
@@ -911,6 +1419,16 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
                 return False
             if self.dim != other.dim:
                 return False
+            stacked = self.get_stacked()
+            other_stacked = other.get_stacked()
+            if (stacked is not None and other_stacked is not None and
+                    stacked.shape == other_stacked.shape):
+                if operator == '__eq__':
+                    return bool(np.allclose(Q_(stacked, self.units),
+                                            Q_(other_stacked, other.units)))
+                else:
+                    return bool(np.all(getattr(Q_(stacked, self.units), operator)(
+                        Q_(other_stacked, other.units))))
             eq = True
             for ind in range(len(self)):
                 if self[ind].shape != other[ind].shape:
@@ -954,6 +1472,31 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
     def deepcopy(self):
         return copy.deepcopy(self)
 
+    def _clone_structure(self, data: List[np.ndarray] = None) -> DataBase:
+        """Copy the metadata of this object around new data arrays
+
+        Neither the data arrays nor the errors are copied, the new object holding the given data
+        and no errors.
+
+        Parameters
+        ----------
+        data: list of numpy ndarray
+            The data of the new object
+
+        Returns
+        -------
+        DataBase
+        """
+        new_data = copy.copy(self)
+        new_data._data = data
+        new_data._errors = None
+        if self._labels is not None:
+            new_data._labels = self._labels[:]
+        new_data.extra_attributes = self.extra_attributes[:]
+        for attribute in self.extra_attributes:
+            setattr(new_data, attribute, copy.deepcopy(getattr(self, attribute)))
+        return new_data
+
     def average(self, other: 'DataBase', weight: int) -> 'DataBase':
         """ Compute the weighted average between self and other DataBase
 
@@ -1045,9 +1588,43 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         --------
         :meth:`np.stack`
         """
-
+        stacked = self.get_stacked()
+        if stacked is not None:
+            return np.array(np.moveaxis(stacked, 0, axis), dtype=dtype)
         return np.stack(self.data, axis=axis, dtype=dtype)
 
+    @property
+    def contiguous(self) -> bool:
+        """bool: get/set if the data arrays are stored as views of a single stacked ndarray"""
+        return isinstance(self._data, StackedArrays)
+
+    @contiguous.setter
+    def contiguous(self, contiguous: bool):
+        if contiguous and not self.contiguous:
+            self._data = StackedArrays.from_arrays(self._data)
+        elif not contiguous and self.contiguous:
+            self._data = list(self._data)
+
+    def get_stacked(self) -> Union[np.ndarray, None]:
+        """Get the (length, *shape) ndarray holding all data arrays in contiguous mode
+
+        Returns
+        -------
+        np.ndarray or None: None if not in contiguous mode or if the data list has been modified
+            such that its arrays are no more views of the stacked array
+        """
+        if self.contiguous and self._data.is_linked():
+            return self._data.stacked
+
+    def _reduce(self, func: Callable, axis: Union[int, IterableType[int]] = None,
+                *args, **kwargs) -> List[np.ndarray]:
+        """Apply a numpy reduction over each data array, in one call if in contiguous mode and
+        out-of-core for LazyArray data"""
+        if self.get_stacked() is not None:
+            return self._data.reduce(func, axis, *args, **kwargs)
+        return [np.atleast_1d(array.reduce(func, axis, *args, **kwargs) if isinstance(array, LazyArray)
+                              else func(array, axis, *args, **kwargs)) for array in self.data]
+
     @property
     def size(self):
         """The size of the nd-arrays"""
@@ -1062,6 +1639,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         """Addhoc modification of dim independantly of the real data shape,
         should be used with extra care"""
         self._dim = enum_checker(DataDim, dim)
+        self._identity_changed()
 
     @property
     def source(self):
@@ -1073,6 +1651,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         """DataSource: the enum representing the source of the data"""
         source_type = enum_checker(DataSource, source_type)
         self._source = source_type
+        self._identity_changed()
 
     @property
     def distribution(self):
@@ -1129,7 +1708,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
             if len(data) == 0:
                 is_valid = False
             elif not (isinstance(data[0], np.ndarray) or
-                             isinstance(data[0], Q_)):
+                      isinstance(data[0], Q_) or isinstance(data[0], LazyArray)):
                 is_valid = False
             elif len(data[0].shape) == 0:
                 is_valid = False
@@ -1184,6 +1763,7 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
                     DataDimWarning('The specified dimensionality is not coherent with the data '
                                    'shape, replacing it'))
                 self._dim = dim
+                self._identity_changed()
 
     def _check_same_shape(self, data: List[np.ndarray]):
         """Check that all nd-arrays have the same shape"""
@@ -1206,6 +1786,8 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         data = self._check_data_type(data)
         self._check_shape_dim_consistency(data)
         self._check_same_shape(data)
+        if self.contiguous and not (isinstance(data, StackedArrays) and data.is_linked()):
+            data = StackedArrays.from_arrays(data)
         self._data = data
 
     def to_dict(self):
@@ -1223,8 +1805,61 @@ class DataBase(DataLowLevel, NDArrayOperatorsMixin):
         return 10 * np.log10(self / np.max(self))
 
 
+class SlicePlan:
+    """Outcome of slicing data of a given shape and axes with a given form of slices
+
+    Everything that does not depend on the actual values of the integer slices is stored so
+    that slicing again in the same manner only requires the ndarray indexing and the slicing of
+    the kept axes.
+
+    Parameters
+    ----------
+    is_navigation: bool
+        True if the slices apply on the navigation dimensions, False for the signal ones
+    total_slices: tuple
+        template of the slices to apply to the data arrays
+    slice_positions: list of int
+        position in total_slices of each of the slices given by the user
+    do_squeeze: bool
+        The squeeze decision to apply on the sliced data arrays
+    indexes_to_get: tuple of int
+        the data dimension indexes the user slices apply to
+    kept_slices: list of int
+        the user slices keeping part of their axes (the other ones remove a dimension)
+    nav_indexes: tuple of int
+        the navigation indexes of the sliced data
+    lower_indexes: dict
+        for each axis index, how much it should be lowered in the sliced data
+    keep_distribution: bool
+        if True the sliced data keeps the distribution of the original data, else it is uniform
+    """
+
+    def __init__(self, is_navigation: bool, total_slices: tuple, slice_positions: List[int],
+                 do_squeeze: bool, indexes_to_get: Tuple[int], kept_slices: List[int],
+                 nav_indexes: Tuple[int], lower_indexes: dict, keep_distribution: bool):
+        self.is_navigation = is_navigation
+        self.total_slices = total_slices
+        self.slice_positions = slice_positions
+        self.do_squeeze = do_squeeze
+        self.indexes_to_get = indexes_to_get
+        self.kept_slices = kept_slices
+        self.nav_indexes = nav_indexes
+        self.lower_indexes = lower_indexes
+        self.keep_distribution = keep_distribution
+
+    def get_total_slices(self, slices) -> tuple:
+        """Fill in the template total slices with the given user slices"""
+        total_slices = list(self.total_slices)
+        for ind_slice, position in enumerate(self.slice_positions):
+            total_slices[position] = slices[ind_slice]
+        return tuple(total_slices)
+
+
 class AxesManagerBase:
+    slice_plans_max_length = 64
+
     def __init__(self, data_shape: Tuple[int], axes: List[Axis], nav_indexes=None, sig_indexes=None, **kwargs):
+        self._slice_plans = dict([])
         self._data_shape = data_shape[:]  # initial shape needed for self._check_axis
         self._axes = axes[:]
         self._nav_indexes = nav_indexes
@@ -1240,8 +1875,29 @@ class AxesManagerBase:
     @axes.setter
     def axes(self, axes: List[Axis]):
         self._axes = axes[:]
+        self.clear_slice_plans()
         self._check_axis(self._axes)
 
+    def copy(self) -> AxesManagerBase:
+        """Copy of the manager holding cheap copies of the axes (see Axis.copy)"""
+        axes_manager = copy.copy(self)
+        axes_manager._axes = [axis.copy() for axis in self._axes]
+        axes_manager._slice_plans = dict(self._slice_plans)
+        return axes_manager
+
+    def get_slice_plan(self, key: tuple) -> Union[SlicePlan, None]:
+        """Get a previously stored slice plan, None if not present"""
+        return self._slice_plans.get(key, None)
+
+    def set_slice_plan(self, key: tuple, plan: SlicePlan):
+        """Store a slice plan, the stored plans are forgotten if too many are present"""
+        if len(self._slice_plans) >= self.slice_plans_max_length:
+            self._slice_plans.clear()
+        self._slice_plans[key] = plan
+
+    def clear_slice_plans(self):
+        self._slice_plans.clear()
+
     @abstractmethod
     def _check_axis(self, axes):
         ...
@@ -1351,6 +2007,7 @@ class AxesManagerBase:
 
     def append_axis(self, axis: Axis):
         self._axes.append(axis)
+        self.clear_slice_plans()
         self._check_axis([axis])
 
     @property
@@ -1370,6 +2027,7 @@ class AxesManagerBase:
                     break
             if valid:
                 self._nav_indexes = nav_indexes
+                self.clear_slice_plans()
         else:
             logger.warning('Could not set the corresponding sig_indexes into the data object, should be an iterable')
         self.sig_indexes = self.compute_sig_indexes()
@@ -1397,6 +2055,7 @@ class AxesManagerBase:
                     break
             if valid:
                 self._sig_indexes = sig_indexes
+                self.clear_slice_plans()
         else:
             logger.warning('Could not set the corresponding sig_indexes into the data object, should be an iterable')
 
@@ -1846,7 +2505,7 @@ class DataWithAxes(DataBase):
             self._errors = None
             return
         if isinstance(errors, (tuple, list)) and len(errors) == len(self):
-            if np.all([isinstance(error, np.ndarray) for error in errors]):
+            if np.all([isinstance(error, (np.ndarray, LazyArray)) for error in errors]):
                 if np.all([error_array.shape == self.shape for error_array in errors]):
                     check = True
                 else:
@@ -1996,12 +2655,7 @@ class DataWithAxes(DataBase):
         -------
         DataWithAxes
         """
-        dat_mean = []
-        for dat in self.data:
-            mean = np.mean(dat, axis=axis)
-            if isinstance(mean, numbers.Number):
-                mean = np.array([mean])
-            dat_mean.append(mean)
+        dat_mean = self._reduce(np.mean, axis)
         return self.deepcopy_with_new_data(dat_mean, remove_axes_index=axis)
 
     def moment(self) -> Tuple[DataWithAxes, DataWithAxes]:
@@ -2040,9 +2694,7 @@ class DataWithAxes(DataBase):
         -------
         DataWithAxes
         """
-        dat_sum = []
-        for dat in self.data:
-            dat_sum.append(np.atleast_1d(np.sum(dat, axis=axis)))
+        dat_sum = self._reduce(np.sum, axis)
         return self.deepcopy_with_new_data(dat_sum, remove_axes_index=axis)
 
     def interp(self,  new_axis_data: Union[Axis, np.ndarray], **kwargs) -> DataWithAxes:
@@ -2258,6 +2910,7 @@ class DataWithAxes(DataBase):
     def get_dim_from_data_axes(self) -> DataDim:
         """Get the dimensionality DataDim from data taking into account nav indexes
         """
+        previous_dim = self._dim
         if len(self.axes) != len(self.shape):
             self._dim = self.get_dim_from_data(self.data)
         else:
@@ -2272,6 +2925,8 @@ class DataWithAxes(DataBase):
                     self._dim = DataDim['Data2D']
         if len(self.nav_indexes) > 0:
             self._dim = DataDim['DataND']
+        if self._dim != previous_dim:
+            self._identity_changed()
         return self._dim
 
 
@@ -2382,7 +3037,15 @@ class DataWithAxes(DataBase):
         list(slice): the computed slices as index (eventually for all axes)
         list(slice): a version as index of the input argument
         """
+        total_slices, _slices_as_index, _ = self._compute_slices_positions(slices, is_navigation,
+                                                                           is_index)
+        return total_slices, _slices_as_index
+
+    def _compute_slices_positions(self, slices, is_navigation=True, is_index=True):
+        """Same as _compute_slices but returning also the positions of the given slices within
+        the total slices"""
         _slices_as_index = []
+        slice_positions = []
         if isinstance(slices, numbers.Number) or isinstance(slices, slice):
             slices = [slices]
         if is_navigation:
@@ -2398,56 +3061,72 @@ class DataWithAxes(DataBase):
                     axis = self.get_axis_from_index(ind)[0]
                     _slice = _compute_slices_from_axis(axis, _slice, is_index=is_index)
                 _slices_as_index.append(_slice)
+                slice_positions.append(len(total_slices))
                 total_slices.append(_slice)
             elif len(total_slices) == 0:
                 total_slices.append(Ellipsis)
             elif not (Ellipsis in total_slices and total_slices[-1] is Ellipsis):
                 total_slices.append(slice(None))
         total_slices = tuple(total_slices)
-        return total_slices, _slices_as_index
+        return total_slices, _slices_as_index, slice_positions
 
     def check_squeeze(self, total_slices: List[slice], is_navigation: bool):
 
         do_squeeze = True
-        if 1 in self.data[0][total_slices].shape:
-            if not is_navigation and self.data[0][total_slices].shape.index(1) in self.nav_indexes:
+        sliced_shape = get_sliced_shape(self.shape, total_slices)
+        if 1 in sliced_shape:
+            if not is_navigation and sliced_shape.index(1) in self.nav_indexes:
                 do_squeeze = False
-            elif is_navigation and self.data[0][total_slices].shape.index(1) in self.sig_indexes:
+            elif is_navigation and sliced_shape.index(1) in self.sig_indexes:
                 do_squeeze = False
         return do_squeeze
 
-    def _slicer(self, slices, is_navigation=True, is_index=True):
-        """Apply a given slice to the data either navigation or signal dimension
-
-        Parameters
-        ----------
-        slices: tuple of slice or int
-            the slices to apply to the data
-        is_navigation: bool
-            if True apply the slices to the navigation dimension else to the signal ones
-        is_index: bool
-            if True the slices are indexes otherwise the slices are axes values to be indexed first
+    def _slices_as_index(self, slices, is_navigation=True) -> list:
+        """Convert slices given as axes values into slices given as indexes
 
-        Returns
-        -------
-        DataWithAxes
-            Object of the same type as the initial data, derived from DataWithAxes. But with lower
-            data size due to the slicing and with eventually less axes.
+        As for index slicing, the slices apply to the navigation (or signal) dimensions in
+        ascending order
         """
-        if isinstance(slices, numbers.Number) or isinstance(slices, slice):
-            slices = [slices]
+        indexes = sorted(self._am.nav_indexes if is_navigation else self._am.sig_indexes)
+        slices = list(slices)
+        return [_compute_slices_from_axis(self.get_axis_from_index(index)[0], slices[ind_slice],
+                                          is_index=False)
+                for ind_slice, index in enumerate(indexes)]
 
-        total_slices, slices = self._compute_slices(slices, is_navigation, is_index=is_index)
+    def _slice_plan_key(self, slices, is_navigation=True) -> Union[tuple, None]:
+        """Get the key identifying the form of the given index slices, None if they cannot be cached
 
+        Integers are represented by their type only as the outcome of the slicing does not depend
+        on their value
+        """
+        pattern = []
+        for _slice in slices:
+            if isinstance(_slice, numbers.Integral):
+                pattern.append(int)
+            elif isinstance(_slice, slice):
+                bounds = (_slice.start, _slice.stop, _slice.step)
+                if not all([bound is None or isinstance(bound, numbers.Integral)
+                            for bound in bounds]):
+                    return None
+                pattern.append(tuple([bound if bound is None else int(bound) for bound in bounds]))
+            elif _slice is Ellipsis:
+                pattern.append(Ellipsis)
+            else:
+                return None
+        axes_signature = tuple([(axis.index, axis.spread_order, axis.size) for axis in self.axes])
+        return (is_navigation, tuple(pattern), tuple(self.shape), tuple(self.nav_indexes),
+                tuple(self.sig_indexes), axes_signature)
+
+    def _get_slice_plan(self, slices, is_navigation=True) -> SlicePlan:
+        """Compute how the given index slices should be applied to this data"""
+        total_slices, slices, slice_positions = self._compute_slices_positions(slices,
+                                                                               is_navigation)
         do_squeeze = self.check_squeeze(total_slices, is_navigation)
-        new_arrays_data = [squeeze(dat[total_slices], do_squeeze) for dat in self.data]
         tmp_axes = self._am.get_signal_axes() if is_navigation else self._am.get_nav_axes()
-        axes_to_append = [copy.deepcopy(axis) for axis in tmp_axes]
-
-        # axes_to_append are the axes to append to the new produced data
+        # tmp_axes are the axes to append to the new produced data
         # (basically the ones to keep)
 
-        indexes_to_get = self.nav_indexes if is_navigation else self.sig_indexes
+        indexes_to_get = tuple(self.nav_indexes if is_navigation else self.sig_indexes)
         # indexes_to_get are the indexes of the axes where the slice should be applied
 
         _indexes = list(self.nav_indexes)
@@ -2457,52 +3136,106 @@ class DataWithAxes(DataBase):
         # because one axis has
         # been removed
 
-        axes = []
+        kept_slices = []
         nav_indexes = [] if is_navigation else list(self._am.nav_indexes)
         for ind_slice, _slice in enumerate(slices):
             if ind_slice < len(indexes_to_get):
                 ax = self._am.get_axis_from_index(indexes_to_get[ind_slice])
                 if len(ax) != 0 and ax[0] is not None:
-                    for ind in range(len(ax)):
-                        ax[ind] = ax[ind].iaxis[_slice]
-
-                    if not(ax[0] is None or ax[0].size <= 1):  # means the slice kept part of the axis
+                    sliced_axis = ax[0].iaxis[_slice]
+                    if not(sliced_axis is None or sliced_axis.size <= 1):
+                        # means the slice kept part of the axis
                         if is_navigation:
                             nav_indexes.append(self._am.nav_indexes[ind_slice])
-                        axes.extend(ax)
+                        kept_slices.append(ind_slice)
                     else:
-                        for axis in axes_to_append:  # means we removed one of the axes (and data dim),
+                        for axis in tmp_axes:  # means we removed one of the axes (and data dim),
                             # hence axis index above current index should be lowered by 1
                             if axis.index > indexes_to_get[ind_slice]:
                                 lower_indexes[axis.index] += 1
                         for index in indexes_to_get[ind_slice+1:]:
                             lower_indexes[index] += 1
 
-        axes.extend(axes_to_append)
-        for axis in axes:
-            axis.index -= lower_indexes[axis.index]
         for ind in range(len(nav_indexes)):
             nav_indexes[ind] -= lower_indexes[nav_indexes[ind]]
 
-        if len(nav_indexes) != 0:
+        return SlicePlan(is_navigation, total_slices, slice_positions, do_squeeze,
+                         indexes_to_get, kept_slices, tuple(nav_indexes), lower_indexes,
+                         keep_distribution=len(nav_indexes) != 0)
+
+    def _slicer(self, slices, is_navigation=True, is_index=True):
+        """Apply a given slice to the data either navigation or signal dimension
+
+        The way to apply a given form of slices is stored as a SlicePlan within the axes manager,
+        so that repeated slicing only performs the ndarray indexing and the slicing of the axes.
+
+        Parameters
+        ----------
+        slices: tuple of slice or int
+            the slices to apply to the data
+        is_navigation: bool
+            if True apply the slices to the navigation dimension else to the signal ones
+        is_index: bool
+            if True the slices are indexes otherwise the slices are axes values to be indexed first
+
+        Returns
+        -------
+        DataWithAxes
+            Object of the same type as the initial data, derived from DataWithAxes. But with lower
+            data size due to the slicing and with eventually less axes.
+        """
+        if isinstance(slices, numbers.Number) or isinstance(slices, slice):
+            slices = [slices]
+        if not is_index:
+            slices = self._slices_as_index(slices, is_navigation)
+        slices = list(slices)
+
+        key = self._slice_plan_key(slices, is_navigation)
+        plan = self._am.get_slice_plan(key) if key is not None else None
+        if plan is None:
+            plan = self._get_slice_plan(slices, is_navigation)
+            if key is not None:
+                self._am.set_slice_plan(key, plan)
+
+        total_slices = plan.get_total_slices(slices)
+        stacked = self.get_stacked()
+        if stacked is not None:  # slice all the channels at once, keeping the contiguous mode
+            new_arrays_data = StackedArrays(squeeze_stacked(stacked[(slice(None),) + tuple(total_slices)],
+                                                            plan.do_squeeze))
+        else:
+            new_arrays_data = [squeeze(dat[total_slices], plan.do_squeeze) for dat in self.data]
+
+        axes = []
+        for ind_slice in plan.kept_slices:
+            for axis in self._am.get_axis_from_index(plan.indexes_to_get[ind_slice]):
+                axes.append(axis.iaxis[slices[ind_slice]])
+        tmp_axes = self._am.get_signal_axes() if is_navigation else self._am.get_nav_axes()
+        axes.extend([axis.copy() for axis in tmp_axes])
+        for axis in axes:
+            axis.index -= plan.lower_indexes[axis.index]
+
+        if plan.keep_distribution:
             distribution = self.distribution
         else:
             distribution = DataDistribution.uniform
 
-        data = DataWithAxes(self.name, data=new_arrays_data, nav_indexes=tuple(nav_indexes),
+        data = DataWithAxes(self.name, data=new_arrays_data, nav_indexes=plan.nav_indexes,
                             axes=axes,
                             source=DataSource.calculated, origin=self.origin,
                             labels=self.labels[:],
-                            distribution=distribution)
+                            distribution=distribution,
+                            contiguous=stacked is not None)
         return data
 
     def deepcopy_with_new_data(self, data: List[np.ndarray] = None,
                                remove_axes_index: Union[int, List[int]] = None,
                                source: DataSource = DataSource.calculated,
-                               keep_dim=False) -> DataWithAxes:
+                               keep_dim=False,
+                               errors: List[np.ndarray] = None) -> DataWithAxes:
         """deepcopy without copying the initial data (saving memory)
 
-        The new data, may have some axes stripped as specified in remove_axes_index
+        Only the metadata are copied, see _clone_structure. The new data, may have some axes
+        stripped as specified in remove_axes_index
 
         Parameters
         ----------
@@ -2514,71 +3247,92 @@ class DataWithAxes(DataBase):
         keep_dim: bool
             if False (the default) will calculate the new dim based on the data shape
             else keep the same (be aware it could lead to issues)
+        errors: list of ndarray
+            The errors of the new data. The errors of this object are not carried over as they
+            do not correspond to the new data
 
         Returns
         -------
         DataWithAxes
         """
-        try:
-            old_data = self.data
-            self._data = None
-            new_data = self.deepcopy()
-            new_data._data = data
-            new_data.get_dim_from_data(data)
-
-            if source is not None:
-                source = enum_checker(DataSource, source)
-                new_data._source = source
-
-            if remove_axes_index is not None:
-                if not isinstance(remove_axes_index, Iterable):
-                    remove_axes_index = [remove_axes_index]
-                    
-                lower_indexes = dict(zip(new_data.get_axis_indexes(),
-                                         [0 for _ in range(len(new_data.get_axis_indexes()))]))
-                # lower_indexes will store for each *axis index* how much the index should be reduced because one axis has
-                # been removed
-
-                nav_indexes = list(new_data.nav_indexes)
-                sig_indexes = list(new_data.sig_indexes)
-                for index in remove_axes_index:
-                    for axis in new_data.get_axis_from_index(index):
-                        if axis is not None:
-                            new_data.axes.remove(axis)
-
-                    if index in new_data.nav_indexes:
-                        nav_indexes.pop(nav_indexes.index(index))
-                    if index in new_data.sig_indexes:
-                        sig_indexes.pop(sig_indexes.index(index))
-
-                    # for ind, nav_ind in enumerate(nav_indexes):
-                    #     if nav_ind > index and nav_ind not in remove_axes_index:
-                    #         nav_indexes[ind] -= 1
-
-                    # for ind, sig_ind in enumerate(sig_indexes):
-                    #     if sig_ind > index:
-                    #         sig_indexes[ind] -= 1
-                    for axis in new_data.axes:
-                        if axis.index > index and axis.index not in remove_axes_index:
-                            lower_indexes[axis.index] += 1
-
+        new_data = self._clone_structure(data)
+        new_data.get_dim_from_data(data)
+
+        if source is not None:
+            source = enum_checker(DataSource, source)
+            new_data._source = source
+
+        if remove_axes_index is not None:
+            if not isinstance(remove_axes_index, Iterable):
+                remove_axes_index = [remove_axes_index]
+                
+            lower_indexes = dict(zip(new_data.get_axis_indexes(),
+                                     [0 for _ in range(len(new_data.get_axis_indexes()))]))
+            # lower_indexes will store for each *axis index* how much the index should be reduced because one axis has
+            # been removed
+
+            nav_indexes = list(new_data.nav_indexes)
+            sig_indexes = list(new_data.sig_indexes)
+            for index in remove_axes_index:
+                for axis in new_data.get_axis_from_index(index):
+                    if axis is not None:
+                        new_data.axes.remove(axis)
+
+                if index in new_data.nav_indexes:
+                    nav_indexes.pop(nav_indexes.index(index))
+                if index in new_data.sig_indexes:
+                    sig_indexes.pop(sig_indexes.index(index))
+
+                # for ind, nav_ind in enumerate(nav_indexes):
+                #     if nav_ind > index and nav_ind not in remove_axes_index:
+                #         nav_indexes[ind] -= 1
+
+                # for ind, sig_ind in enumerate(sig_indexes):
+                #     if sig_ind > index:
+                #         sig_indexes[ind] -= 1
                 for axis in new_data.axes:
-                    axis.index -= lower_indexes[axis.index]
-                for ind in range(len(nav_indexes)):
-                    nav_indexes[ind] -= lower_indexes[nav_indexes[ind]]
+                    if axis.index > index and axis.index not in remove_axes_index:
+                        lower_indexes[axis.index] += 1
+
+            for axis in new_data.axes:
+                axis.index -= lower_indexes[axis.index]
+            for ind in range(len(nav_indexes)):
+                nav_indexes[ind] -= lower_indexes[nav_indexes[ind]]
+
+            new_data.nav_indexes = tuple(nav_indexes)
+            # new_data._am.sig_indexes = tuple(sig_indexes)
+
+        new_data._shape = data[0].shape
+        if not keep_dim:
+            new_data._dim = self._get_dim_from_data(data)
+        if errors is not None:
+            new_data.errors = errors
+        return new_data
 
-                new_data.nav_indexes = tuple(nav_indexes)
-                # new_data._am.sig_indexes = tuple(sig_indexes)
+    def _clone_structure(self, data: List[np.ndarray] = None) -> DataWithAxes:
+        """Copy the metadata of this object around new data arrays
 
-            new_data._shape = data[0].shape
-            if not keep_dim:
-                new_data._dim = self._get_dim_from_data(data)
-            return new_data
+        Neither the data arrays nor the errors are copied, the new object holding the given data
+        and no errors. The axes are cheap copies sharing their arrays read-only (see Axis.copy)
 
-        except Exception as e:
-            pass
-        finally:
-            self._data = old_data
+        Parameters
+        ----------
+        data: list of numpy ndarray
+            The data of the new object
+
+        Returns
+        -------
+        DataWithAxes
+        """
+        new_data = super()._clone_structure(data)
+        new_data.axes_manager = self.axes_manager.copy()
+        new_data._axes = new_data.axes_manager.axes
+
+        new_data.inav = SpecialSlicersData(new_data, True)
+        new_data.isig = SpecialSlicersData(new_data, False)
+        new_data.vnav = SpecialSlicersData(new_data, True, is_index=False)
+        new_data.vsig = SpecialSlicersData(new_data, False, is_index=False)
+        return new_data
 
     @property
     def _am(self) -> AxesManagerBase:
@@ -2621,6 +3375,13 @@ class DataToExport(DataLowLevel):
     Stored data have a unique identifier their name. If some data is appended with an existing name, it will replace
     the existing data. So if you want to append data that has the same name
 
+    Lookups from name, origin, dim or source use internal indexes kept in sync by the append, pop, remove and
+    __setitem__ methods, so the stored list should not be modified directly.
+
+    Appending with copy=False moves the ownership of the DataWithAxes to this object. Set the class attribute
+    debug_ownership to True to make the arrays of such data read-only and to check they have not been
+    modified by their producer when removed/replaced or when calling check_adopted_data.
+
     Parameters
     ----------
     name: str
@@ -2635,6 +3396,8 @@ class DataToExport(DataLowLevel):
     data
     """
 
+    debug_ownership = False
+
     def __init__(self, name: str, data: List[DataWithAxes] = [], **kwargs):
         """
 
@@ -2648,6 +3411,7 @@ class DataToExport(DataLowLevel):
             raise TypeError('Data stored in a DataToExport object should be as a list of objects'
                             ' inherited from DataWithAxis')
         self._data = []
+        self._adopted: List[Tuple[DataWithAxes, List[bytes]]] = []
 
         self.data = data
         for key in kwargs:
@@ -2774,7 +3538,11 @@ class DataToExport(DataLowLevel):
 
     def __setitem__(self, key, value: DataWithAxes):
         if isinstance(key, int) and 0 <= key < len(self) and isinstance(value, DataWithAxes):
-            self.data[key] = value
+            self._check_index()
+            self._unindex_data(self._data[key])
+            self._release_ownership(self._data[key])
+            self._data[key] = value
+            self._index_data(value, key)
         else:
             raise IndexError(f'The index should be a positive integer lower than the data length')
 
@@ -2848,12 +3616,8 @@ class DataToExport(DataLowLevel):
         return DataToExport(name=self.name, data=data)
 
     def get_dim_presents(self) -> List[str]:
-        dims = []
-        for dim in DataDim.names():
-            if len(self.get_data_from_dim(dim)) != 0:
-                dims.append(dim)
-
-        return dims
+        self._check_index()
+        return [dim for dim in DataDim.names() if dim in self._dim_index]
 
     def get_data_from_source(self, source: DataSource, deepcopy=False) -> DataToExport:
         """Get the data matching the given DataSource
@@ -2863,7 +3627,8 @@ class DataToExport(DataLowLevel):
         DataToExport: filtered with data matching the dimensionality
         """
         source = enum_checker(DataSource, source)
-        return self.get_data_from_attribute('source', source, deepcopy=deepcopy)
+        self._check_index()
+        return self._from_bucket(self._source_index.get(source.name, []), deepcopy=deepcopy)
 
     def get_data_from_missing_attribute(self, attribute: str, deepcopy=False) -> DataToExport:
         """ Get the data matching a given attribute value
@@ -2907,7 +3672,15 @@ class DataToExport(DataLowLevel):
         DataToExport: filtered with data matching the dimensionality
         """
         dim = enum_checker(DataDim, dim)
-        return self.get_data_from_attribute('dim', dim, deepcopy=deepcopy)
+        self._check_index()
+        return self._from_bucket(self._dim_index.get(dim.name, []), deepcopy=deepcopy)
+
+    def _from_bucket(self, bucket: List[DataWithAxes], deepcopy=False) -> DataToExport:
+        """Get a DataToExport from an index bucket, sorted by name as in get_data_from_attribute"""
+        selection = sorted(bucket, key=lambda dwa: dwa.name)
+        if deepcopy:
+            selection = [dwa.deepcopy() for dwa in selection]
+        return DataToExport(name=self.name, data=selection)
 
     def get_data_from_dims(self, dims: List[DataDim], deepcopy=False) -> DataToExport:
         """Get the data matching the given DataDim
@@ -2986,8 +3759,9 @@ class DataToExport(DataLowLevel):
 
     def get_data_from_name(self, name: str) -> DataWithAxes:
         """Get the data matching the given name"""
-        data, _ = find_objects_in_list_from_attr_name_val(self.data, 'name', name, return_first=True)
-        return data
+        self._check_index()
+        bucket = self._name_index.get(name)
+        return bucket[0] if bucket else None
 
     def get_data_from_names(self, names: List[str]) -> DataToExport:
         return DataToExport(self.name, data=[dwa for dwa in self if dwa.name in names])
@@ -2995,36 +3769,118 @@ class DataToExport(DataLowLevel):
     def get_data_from_name_origin(self, name: str, origin: str = '') -> DataWithAxes:
         """Get the data matching the given name and the given origin"""
         if origin == '':
-            data, _ = find_objects_in_list_from_attr_name_val(self.data, 'name', name, return_first=True)
-        else:
-            selection = find_objects_in_list_from_attr_name_val(self.data, 'name', name, return_first=False)
-            selection = [sel[0] for sel in selection]
-            data, _ = find_objects_in_list_from_attr_name_val(selection, 'origin', origin)
-        return data
+            return self.get_data_from_name(name)
+        self._check_index()
+        bucket = self._name_origin_index.get((name, origin))
+        return bucket[0] if bucket else None
 
     def index(self, data: DataWithAxes):
         """ Here use a comparison to assert data is equal to one element in the list
 
         But the __eq__ method is not checking the name while it is the main issue for elt finding
-        Hence here I'm doing both checks
+        Hence here I'm doing both checks. Only the data sharing the name are compared, identity
+        being checked first to avoid comparing the arrays
         """
-        for ind, dwa in enumerate(self.data):
-            if dwa.name == data.name and dwa == data:
+        self._check_index()
+        for dwa in self._name_index.get(data.name, []):
+            if dwa is data or dwa == data:
+                return self._position(dwa)
+        raise ValueError
+
+    def index_from_name_origin(self, name: str, origin: str = '') -> int:
+        """Get the index of the DataWithAxes matching the given name and the given origin"""
+        data = self.get_data_from_name_origin(name, origin)
+        if data is None:
+            return -1
+        return self._position(data)
+
+    def _position(self, dwa: DataWithAxes) -> int:
+        """Get the position of a stored object from identity, never comparing arrays"""
+        position = self._positions.get(id(dwa))
+        if position is not None and position < len(self._data) and self._data[position] is dwa:
+            return position
+        for ind, stored in enumerate(self._data):  # the list has been modified behind our back
+            if stored is dwa:
                 return ind
         raise ValueError
 
-    def index_from_name_origin(self, name: str, origin: str = '') -> List[DataWithAxes]:
-        """Get the index of a given DataWithAxes within the list of data"""
-        """Get the data matching the given name and the given origin"""
-        if origin == '':
-            _, index = find_objects_in_list_from_attr_name_val(self.data, 'name', name, return_first=True)
-        else:
-            selection = find_objects_in_list_from_attr_name_val(self.data, 'name', name, return_first=False)
-            data_selection = [sel[0] for sel in selection]
-            index_selection = [sel[1] for sel in selection]
-            _, index = find_objects_in_list_from_attr_name_val(data_selection, 'origin', origin)
-            index = index_selection[index]
-        return index
+    def __getstate__(self):
+        """Copies (and pickles) rebuild their indexes from their own stored objects when used"""
+        state = super().__getstate__()
+        for attribute in ('_name_index', '_name_origin_index', '_dim_index', '_source_index',
+                          '_positions'):
+            state.pop(attribute, None)
+        state['_index_stale'] = True
+        return state
+
+    def _check_index(self):
+        """Rebuild the lookup indexes if stale
+
+        They are stale if the stored list length changed behind our back or if the name, origin,
+        dim or source of any stored DataWithAxes changed since they were built (the DataWithAxes
+        invalidating the indexes of the DataToExport objects they are stored in)
+        """
+        if self._index_stale or self._index_length != len(self._data):
+            self._build_index()
+
+    def _build_index(self):
+        self._name_index: Dict[str, List[DataWithAxes]] = dict([])
+        self._name_origin_index: Dict[Tuple[str, str], List[DataWithAxes]] = dict([])
+        self._dim_index: Dict[str, List[DataWithAxes]] = dict([])
+        self._source_index: Dict[str, List[DataWithAxes]] = dict([])
+        self._positions: Dict[int, int] = dict([])
+        self._index_length = 0
+        for ind, dwa in enumerate(self._data):
+            self._index_data(dwa, ind, ordered=False)
+        self._index_stale = False
+
+    def _buckets(self, dwa: DataWithAxes):
+        return ((self._name_index, dwa.name), (self._name_origin_index, (dwa.name, dwa.origin)),
+                (self._dim_index, enum_checker(DataDim, dwa.dim).name),
+                (self._source_index, enum_checker(DataSource, dwa.source).name))
+
+    def _index_data(self, dwa: DataWithAxes, position: int = None, ordered=True):
+        """Add an object to the indexes
+
+        Parameters
+        ----------
+        dwa: DataWithAxes
+            the object stored in self._data
+        position: int
+            its position in self._data, default the last one
+        ordered: bool
+            if True and position is not the last one, insert the object in the buckets so that they
+            keep the list order. Not needed if the objects are indexed in the list order
+        """
+        if dwa._owners is None:
+            dwa._owners = weakref.WeakSet()
+        dwa._owners.add(self)
+        if position is None:
+            position = len(self._data) - 1
+        self._positions[id(dwa)] = position
+        for index, key in self._buckets(dwa):
+            bucket = index.setdefault(key, [])
+            if not ordered or position == len(self._data) - 1:
+                bucket.append(dwa)
+            else:
+                positions = [self._position(elt) for elt in bucket]
+                bucket.insert(int(np.searchsorted(positions, position)), dwa)
+        self._index_length += 1
+
+    def _unindex_data(self, dwa: DataWithAxes):
+        """Remove an object from the indexes (called before its removal from self._data)"""
+        if dwa._owners is not None:
+            dwa._owners.discard(self)
+        self._positions.pop(id(dwa), None)
+        for index, key in self._buckets(dwa):
+            bucket = index[key]
+            for ind, elt in enumerate(bucket):
+                if elt is dwa:
+                    bucket.pop(ind)
+                    break
+            if len(bucket) == 0:
+                index.pop(key)
+        self._index_length -= 1
 
     def pop(self, index: int) -> DataWithAxes:
         """return and remove the DataWithAxes referred by its index
@@ -3038,10 +3894,21 @@ class DataToExport(DataLowLevel):
         --------
         index_from_name_origin
         """
-        return self.data.pop(index)
+        self._check_index()
+        self._unindex_data(self._data[index])
+        dwa = self._data.pop(index)
+        for position in range(index if index >= 0 else len(self._data) + index + 1,
+                              len(self._data)):
+            self._positions[id(self._data[position])] = position
+        self._release_ownership(dwa)
+        return dwa
 
     def remove(self, dwa: DataWithAxes):
-        return self.pop(self.data.index(dwa))
+        try:
+            index = self._position(dwa)
+        except ValueError:
+            index = self.data.index(dwa)
+        return self.pop(index)
 
     @property
     def data(self) -> List[DataWithAxes]:
@@ -3056,6 +3923,9 @@ class DataToExport(DataLowLevel):
         # list is changed, the change will not be applied in here
 
         self.affect_name_to_origin_if_none()
+        self._build_index()
+        self._adopted[:] = [(dwa, fingerprint) for dwa, fingerprint in self._adopted
+                            if any(dwa is dat for dat in self._data)]
 
     @staticmethod
     def _check_data_type(data: DataWithAxes):
@@ -3067,29 +3937,81 @@ class DataToExport(DataLowLevel):
         return DataToExport('Copy', data=[data.deepcopy() for data in self])
 
     @dispatch(list)
-    def append(self, data_list: List[DataWithAxes]):
+    def append(self, data_list: List[DataWithAxes], copy: bool = True):
         for dwa in data_list:
-            self.append(dwa)
+            self.append(dwa, copy=copy)
 
     @dispatch(DataWithAxes)
-    def append(self, dwa: DataWithAxes):
+    def append(self, dwa: DataWithAxes, copy: bool = True):
         """Append/replace DataWithAxes object to the data attribute
 
         Make sure only one DataWithAxes object with a given name is in the list except if they don't
         have the same
         origin identifier
+
+        Parameters
+        ----------
+        dwa: DataWithAxes
+        copy: bool
+            If True (default) a deepcopy of dwa is stored. If False dwa itself is stored: this is a move,
+            the caller gives up the object and its arrays and should neither modify nor reuse them.
+            See the debug_ownership class attribute to detect such modifications.
         """
-        dwa = dwa.deepcopy()
+        if copy:
+            dwa = dwa.deepcopy()
         self._check_data_type(dwa)
         obj = self.get_data_from_name_origin(dwa.name, dwa.origin)
         if obj is not None:
-            self._data.pop(self.data.index(obj))
+            self.pop(self._position(obj))
         self._data.append(dwa)
+        self._index_data(dwa)
+        if not copy and self.debug_ownership:
+            self._take_ownership(dwa)
 
     @dispatch(object)
-    def append(self, dte: DataToExport):
+    def append(self, dte: DataToExport, copy: bool = True):
         if isinstance(dte, DataToExport):
-            self.append(dte.data)
+            self.append(dte.data, copy=copy)
+
+    @staticmethod
+    def _fingerprint(dwa: DataWithAxes) -> List[bytes]:
+        return [hashlib.blake2b(np.ascontiguousarray(array).data).digest() if isinstance(array, np.ndarray)
+                else None for array in dwa.data]
+
+    def _take_ownership(self, dwa: DataWithAxes):
+        """Make the arrays of moved data read-only and store their fingerprint"""
+        if dwa.get_stacked() is not None:
+            dwa.get_stacked().flags.writeable = False
+        for array in dwa.data:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        self._adopted.append((dwa, self._fingerprint(dwa)))
+
+    def _release_ownership(self, dwa: DataWithAxes):
+        """Check a moved data has not been modified when it is removed from this object"""
+        for ind, (adopted, fingerprint) in enumerate(self._adopted):
+            if adopted is dwa:
+                self._adopted.pop(ind)
+                self._check_fingerprint(adopted, fingerprint)
+                return
+
+    @staticmethod
+    def _check_fingerprint(dwa: DataWithAxes, fingerprint: List[bytes]):
+        if DataToExport._fingerprint(dwa) != fingerprint:
+            raise DataMutationError(f'The data of {dwa.get_full_name()} has been modified after being '
+                                    f'appended with copy=False')
+
+    def check_adopted_data(self):
+        """Check the data appended with copy=False have not been modified since then
+
+        Only effective if the debug_ownership class attribute was True when appending
+
+        Raises
+        ------
+        DataMutationError
+        """
+        for dwa, fingerprint in self._adopted:
+            self._check_fingerprint(dwa, fingerprint)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,2 @@
 from . import browsing
 from .utils import register_exporter, register_exporters
-
-register_exporters()
-
-
@@ -7,8 +7,10 @@ Created the 15/11/2022
 import numpy as np
 import importlib
 from importlib import metadata
+import json
 import pickle
-from typing import Dict
+import weakref
+from typing import Dict, List, Tuple, Union
 
 from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_utils.config import Config
@@ -133,6 +135,271 @@ def set_attr(node, attr_name, attr_value, backend='tables'):
         node._v_attrs[attr_name] = JsonConverter.object2json(attr_value)
     else:
         node.attrs[attr_name] = JsonConverter.object2json(attr_value)
+    if attr_name in INDEX_KEYS and node_index.is_active():
+        node_index.update(*get_node_location(node, backend), {attr_name: attr_value})
+
+
+def set_attrs(node, attributes: dict, backend='tables'):
+    """Write all the name/value pairs of attributes on the node in one pass
+
+    The attribute set of the node is fetched once, each value converted as in set_attr and the index updated once.
+    Neither PyTables nor h5py can write several attributes in a single call (AttributeSet._f_copy only copies all
+    the attributes of a node to another one), so there is still one HDF5 write per attribute: the gain is only the
+    per attribute overhead of set_attr and of the Attributes wrapper
+    """
+    if backend == 'tables':
+        attribute_set = node._v_attrs
+        for attr_name, attr_value in attributes.items():
+            attribute_set[attr_name] = JsonConverter.object2json(attr_value)
+    else:
+        attribute_manager = node.attrs
+        for attr_name, attr_value in attributes.items():
+            attribute_manager[attr_name] = JsonConverter.object2json(attr_value)
+    if node_index.is_active() and not INDEX_KEYS.isdisjoint(attributes):
+        node_index.update(*get_node_location(node, backend), attributes)
+
+
+def get_node_location(node, backend='tables') -> Tuple[str, str]:
+    """Get the file name and the path of a backend node"""
+    if backend == 'tables':
+        return str(node._v_file.filename), node._v_pathname
+    else:
+        return str(node.file.filename), node.name
+
+
+def get_index_entry(node, backend='tables') -> dict:
+    """Get the index entry of a backend node: its parent path, the values of its INDEXED_ATTRIBUTES and
+    the presence of its INDEXED_FLAGS attributes"""
+    path = get_node_location(node, backend)[1]
+    attrs_name = node._v_attrs._v_attrnames if backend == 'tables' else node.attrs.keys()
+    entry = dict(parent=None if path == '/' else path.rsplit('/', 1)[0] or '/')
+    for attr_name in INDEXED_ATTRIBUTES:
+        if attr_name in attrs_name:
+            entry[attr_name] = get_attr(node, attr_name, backend)
+    entry.setdefault('CLASS', 'GROUP')  # as considered by get_node_class
+    for attr_name in INDEXED_FLAGS:
+        entry[attr_name] = attr_name in attrs_name
+    return entry
+
+
+def match_node_attributes(node: 'Node', attributes: dict) -> bool:
+    """Check if a node has all the given attribute values (True/False for the presence of INDEXED_FLAGS)"""
+    attrs = node.attrs
+    for attr_name, attr_value in attributes.items():
+        if attr_name in INDEXED_FLAGS:
+            if (attr_name in attrs) != attr_value:
+                return False
+        elif attr_name not in attrs or attrs[attr_name] != attr_value:
+            return False
+    return True
+
+
+def match_index_entry(entry: dict, attributes: dict) -> bool:
+    """Check if an index entry has all the given attribute values (True/False for INDEXED_FLAGS)"""
+    for attr_name, attr_value in attributes.items():
+        if attr_name in INDEXED_FLAGS:
+            if entry.get(attr_name, False) != attr_value:
+                return False
+        elif attr_name not in entry or entry[attr_name] != attr_value:
+            return False
+    return True
+
+
+class NodeCounters:
+    """Cache of the number of nodes per data_type hanging (recursively) from the groups of a file
+
+    Counts are stored per file name then per group path. They are seeded once by walking the
+    group, then kept up to date by the objects creating nodes (see H5SaverLowLevel.add_array)
+    and dropped when nodes are removed or when the file is (re)opened or closed.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, Dict[str, int]]] = dict([])
+
+    def get(self, filename: str, path: str) -> Union[Dict[str, int], None]:
+        """Get the counts of a group (keys are data_type names), None if not cached"""
+        return self._counters.get(str(filename), dict([])).get(path, None)
+
+    def set(self, filename: str, path: str, counts: Dict[str, int]):
+        self._counters.setdefault(str(filename), dict([]))[path] = counts
+
+    def increment(self, filename: str, path: str, data_type: str):
+        """Increment the count of data_type for the group at path and all its cached ancestors"""
+        file_counters = self._counters.get(str(filename), None)
+        if not file_counters:
+            return
+        while True:
+            if path in file_counters:
+                counts = file_counters[path]
+                counts[data_type] = counts.get(data_type, 0) + 1
+            if path == '/':
+                break
+            path = path.rsplit('/', 1)[0] or '/'
+
+    def invalidate(self, filename: str, path: str = None):
+        """Drop the cached counts of a file, or only the ones related to the group at path
+        (itself, its ancestors and descendants)"""
+        filename = str(filename)
+        if path is None:
+            self._counters.pop(filename, None)
+        elif filename in self._counters:
+            file_counters = self._counters[filename]
+            for key in list(file_counters.keys()):
+                if (key == path or key == '/' or key.startswith(path.rstrip('/') + '/') or
+                        path.startswith(key + '/')):
+                    file_counters.pop(key)
+
+
+node_counters = NodeCounters()
+
+
+class NodeCache:
+    """Cache of the Node wrappers of the nodes of the opened files
+
+    Wrappers, whose class is resolved once from the CLASS attribute of their node, are stored per file name
+    then per node path. They are dropped when the file is (re)opened or closed and when nodes are created or
+    removed through H5Backend. A cached wrapper is also checked to still point to an opened node at the same
+    path before being returned, in case the file has been modified directly with the backend library.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, 'Node']] = dict([])
+
+    def get(self, h5file, path: str) -> Union['Node', None]:
+        """Get the cached wrapper of the node at path in h5file, None if not cached"""
+        file_nodes = self._nodes.get(str(h5file.filename), None)
+        if file_nodes is None:
+            return None
+        node = file_nodes.get(path, None)
+        if node is not None and not node.is_valid(h5file, path):
+            file_nodes.pop(path)
+            return None
+        return node
+
+    def set(self, h5file, path: str, node: 'Node'):
+        self._nodes.setdefault(str(h5file.filename), dict([]))[path] = node
+
+    def invalidate(self, filename: str, path: str = None):
+        """Drop the cached wrappers of a file, or only the ones of the node at path and its descendants"""
+        filename = str(filename)
+        if path is None:
+            self._nodes.pop(filename, None)
+        elif filename in self._nodes:
+            file_nodes = self._nodes[filename]
+            prefix = path.rstrip('/') + '/'
+            for key in list(file_nodes.keys()):
+                if key == path or key.startswith(prefix):
+                    file_nodes.pop(key)
+
+
+node_cache = NodeCache()
+
+
+INDEX_NODE_NAME = '_p_index'
+INDEX_VERSION = 1
+INDEXED_ATTRIBUTES = ('CLASS', 'TITLE', 'data_type', 'data_dimension', 'shape', 'dtype', 'type')
+INDEXED_FLAGS = ('pixmap2D',)
+INDEX_KEYS = frozenset(INDEXED_ATTRIBUTES + INDEXED_FLAGS)
+
+
+class NodeIndex:
+    """Index of the nodes of the opened files, mapping their path to an entry (see get_index_entry)
+
+    The index of a file is loaded from its INDEX_NODE_NAME array, or built once by walking the file, then kept up
+    to date when nodes are created or removed through H5Backend and when indexed attributes are written. It is saved
+    back in the file (see H5Backend.save_index) when the file is closed after a modification. Lookups of nodes from
+    their attributes (see H5Backend.find_nodes) then don't need to open any node.
+
+    Indexes are held per H5Backend instance (so that a file opened by several backends keeps one index for each),
+    modifications of a file being propagated to the indexes of all the backends having it opened.
+    """
+
+    def __init__(self):
+        self._entries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._filenames: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._modified: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def is_active(self) -> bool:
+        """True if at least one file is indexed"""
+        return len(self._entries) != 0
+
+    def get(self, owner: 'H5Backend') -> Union[Dict[str, dict], None]:
+        """Get the entries of the file opened by owner (keys are node paths), None if not indexed"""
+        return self._entries.get(owner, None)
+
+    def set(self, owner: 'H5Backend', filename: str, entries: Dict[str, dict], modified=False):
+        self._entries[owner] = entries
+        self._filenames[owner] = str(filename)
+        self._modified[owner] = modified
+
+    def is_modified(self, owner: 'H5Backend') -> bool:
+        return self._modified.get(owner, False)
+
+    def _owners(self, filename: str) -> List['H5Backend']:
+        return [owner for owner, owner_filename in list(self._filenames.items())
+                if owner_filename == str(filename)]
+
+    def add(self, filename: str, path: str, entry: dict):
+        for owner in self._owners(filename):
+            self._entries[owner][path] = dict(entry)
+            self._modified[owner] = True
+
+    def update(self, filename: str, path: str, attributes: dict):
+        """Update the entry of the node at path with the values of its indexed attributes"""
+        for owner in self._owners(filename):
+            entries = self._entries[owner]
+            if path in entries:
+                entry = entries[path]
+                for attr_name, attr_value in attributes.items():
+                    if attr_name in INDEXED_FLAGS:
+                        entry[attr_name] = True
+                    elif attr_name in INDEX_KEYS:
+                        entry[attr_name] = attr_value
+                self._modified[owner] = True
+
+    def remove(self, filename: str, path: str):
+        """Remove the entries of the node at path and of its descendants"""
+        prefix = path.rstrip('/') + '/'
+        for owner in self._owners(filename):
+            entries = self._entries[owner]
+            for key in list(entries.keys()):
+                if key == path or key.startswith(prefix):
+                    entries.pop(key)
+            self._modified[owner] = True
+
+    def invalidate(self, owner: 'H5Backend'):
+        self._entries.pop(owner, None)
+        self._filenames.pop(owner, None)
+        self._modified.pop(owner, None)
+
+
+node_index = NodeIndex()
+
+
+def get_node_class(node, backend='tables') -> type:
+    """Get the Node subclass wrapping a backend node, from its CLASS attribute (GROUP if missing)"""
+    attrs_name = node._v_attrs._v_attrnames if backend == 'tables' else node.attrs.keys()
+    if 'CLASS' not in attrs_name:
+        return GROUP
+    klass = get_attr(node, 'CLASS', backend)
+    if 'ARRAY' not in klass:
+        return GROUP
+    elif klass == 'VLARRAY' and 'subdtype' in attrs_name and get_attr(node, 'subdtype', backend) == 'string':
+        return StringARRAY
+    return ARRAY_CLASSES.get(klass, CARRAY)
+
+
+def wrap_node(node, backend='tables') -> 'Node':
+    """Get the Node wrapper of a backend node, from the node cache if possible"""
+    if backend == 'tables':
+        h5file, path = node._v_file, node._v_pathname
+    else:
+        h5file, path = node.file, node.name
+    wrapper = node_cache.get(h5file, path)
+    if wrapper is None:
+        wrapper = get_node_class(node, backend)(node, backend)
+        node_cache.set(h5file, path, wrapper)
+    return wrapper
 
 
 class InvalidGroupType(Exception):
@@ -183,19 +450,26 @@ class Node(object):
     def __eq__(self, other):
         return self.node == other.node
 
+    def is_valid(self, h5file, path: str) -> bool:
+        """Check if the wrapped node is still opened and located at path in h5file"""
+        try:
+            if self.backend == 'tables':
+                return bool(self._node._v_isopen and self._node._v_file is h5file and
+                            self._node._v_pathname == path)
+            else:
+                return bool(self._node.id.valid and self._node.name == path)
+        except Exception:
+            return False
+
     @property
     def parent_node(self) -> 'GROUP':
         if self.path == '/':
             return None
-        mod = importlib.import_module('.backends', 'pymodaq_data.h5modules')
-
         if self.backend == 'tables':
             p = self.node._v_parent
         else:
             p = self.node.parent
-        klass = get_attr(p, 'CLASS', self.backend)
-        _cls = getattr(mod, klass)
-        return _cls(p, self.backend)
+        return wrap_node(p, self.backend)
 
     @property
     def h5file(self):
@@ -289,26 +563,9 @@ class GROUP(Node):
         --------
         children_name
         """
-        mod = importlib.import_module('.backends', 'pymodaq_data.h5modules')
-        children = dict([])
-        if self.backend == 'tables':
-            for child_name, child in self.node._v_children.items():
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        else:
-            for child_name, child in self.node.items():
-
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        return children
+        items = self.node._v_children.items() if self.backend == 'tables' else self.node.items()
+        return dict([(child_name, wrap_node(child, self.backend)) for child_name, child in items
+                     if child_name != INDEX_NODE_NAME])
 
     def get_child(self, name: str) -> Node:
         return self.children()[name]
@@ -323,16 +580,77 @@ class GROUP(Node):
         if self.backend == 'tables':
             return sorted(list(self.node._v_children.keys()))
         else:
-            return sorted(list(self.node.keys()))
-        pass
+            return sorted([name for name in self.node.keys() if name != INDEX_NODE_NAME])
 
     def remove_children(self):
         children_dict = self.children()
         for child_name in children_dict:
+            child_path = children_dict[child_name].path
             if self.backend == 'tables':
                 children_dict[child_name].node._f_remove(recursive=True)
             else:
                 self.node.__delitem__(child_name)
+            node_index.remove(self.h5file.filename, child_path)
+        node_counters.invalidate(self.h5file.filename, self.path)
+        node_cache.invalidate(self.h5file.filename, self.path)
+
+
+def get_selection_item(shape: Tuple[int], nav_indexes: Tuple[int] = (), nav=None, sig=None,
+                       step: Union[int, Tuple[int]] = None) -> tuple:
+    """Translate a selection on the navigation and signal dimensions of an array into an item of integers and
+    slices (with explicit bounds and positive steps), one per dimension
+
+    Parameters
+    ----------
+    shape: tuple of int
+        the shape of the array
+    nav_indexes: tuple of int
+        the indexes of the navigation dimensions, the other ones being the signal dimensions
+    nav: int, slice or tuple of those
+        the selection on the navigation dimensions (in the order of nav_indexes), the missing ones being
+        entirely selected
+    sig: int, slice or tuple of those
+        the selection on the signal dimensions
+    step: int or tuple of int
+        the decimation step applied to the dimensions selected with a slice without step, either for all the
+        dimensions or one per dimension
+
+    Returns
+    -------
+    tuple of int and slice
+    """
+    nav_indexes = tuple(nav_indexes) if nav_indexes is not None else ()
+    sig_indexes = tuple([ind for ind in range(len(shape)) if ind not in nav_indexes])
+    item = [slice(None) for _ in range(len(shape))]
+    for indexes, selection in ((nav_indexes, nav), (sig_indexes, sig)):
+        if selection is None:
+            continue
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+        if len(selection) > len(indexes):
+            raise IndexError(f'Too many indices for the {len(indexes)} selected dimensions')
+        for ind, sel in zip(indexes, selection):
+            item[ind] = sel
+    steps = step if isinstance(step, tuple) else tuple([step for _ in range(len(shape))])
+    if len(steps) != len(shape):
+        raise IndexError(f'The step should be given for each of the {len(shape)} dimensions')
+
+    for ind, sel in enumerate(item):
+        if isinstance(sel, (int, np.integer)):
+            sel = int(sel) + shape[ind] if sel < 0 else int(sel)
+            if not 0 <= sel < shape[ind]:
+                raise IndexError(f'Index {item[ind]} is out of bounds for a dimension of size {shape[ind]}')
+        elif isinstance(sel, slice):
+            if sel.step is None and steps[ind] is not None:
+                sel = slice(sel.start, sel.stop, steps[ind])
+            start, stop, sel_step = sel.indices(shape[ind])
+            if sel_step <= 0:
+                raise ValueError('Only positive steps are supported by the backends')
+            sel = slice(start, max(start, stop), sel_step)
+        else:
+            raise TypeError(f'Unsupported selection {sel}, should be an integer or a slice')
+        item[ind] = sel
+    return tuple(item)
 
 
 class CARRAY(Node):
@@ -357,11 +675,91 @@ class CARRAY(Node):
     def __setitem__(self, key, value):
         self._array.__setitem__(key, value)
 
-    def read(self):
+    def read(self, out: np.ndarray = None) -> np.ndarray:
+        """Read the whole array
+
+        Parameters
+        ----------
+        out: np.ndarray or None
+            If not None, a C-contiguous array of the array shape the data are directly read into
+            (pytables read(out=...) or h5py read_direct) and which is returned. Should be of the array
+            dtype for the read to be direct, otherwise the data are cast into it
+        """
         if self.backend == 'tables':
-            return self._array.read()
-        else:
+            if out is None:
+                return self._array.read()
+            elif out.dtype != self._array.dtype:
+                out[...] = self._array.read()
+                return out
+            return self._array.read(out=out)
+        elif out is None:
             return self._array[:]
+        else:
+            if out.size != 0:
+                self._array.read_direct(out)
+            return out
+
+    def read_hyperslab(self, item: tuple, out: np.ndarray = None) -> np.ndarray:
+        """Read only the hyperslab of the array given by item
+
+        Parameters
+        ----------
+        item: tuple of int and slice
+            one per dimension, as returned by get_selection_item
+        out: np.ndarray or None
+            If not None, the array (of the selection shape and of the array dtype) the hyperslab is read into,
+            directly with the h5py backend (read_direct)
+
+        Returns
+        -------
+        np.ndarray: the selected data, the dimensions selected with an integer being dropped
+        """
+        if self.backend == 'tables':
+            data = np.asarray(self._array[item])
+            if out is None:
+                return data
+            out[...] = data
+            return out
+        if out is None:
+            out = np.empty([len(range(sel.start, sel.stop, sel.step)) for sel in item
+                            if isinstance(sel, slice)], dtype=self._array.dtype)
+        if out.size != 0:
+            self._array.read_direct(out, source_sel=item)
+        return out
+
+    def read_selection(self, nav=None, sig=None, step: Union[int, Tuple[int]] = None,
+                       out: np.ndarray = None) -> np.ndarray:
+        """Read only a selection of the array made on its navigation and signal dimensions
+
+        The navigation dimensions are given by the nav_indexes attribute (none if missing). For instance
+        read_selection(nav=(2, 3)) reads a single scan point of a 2D scan and read_selection(step=4) a
+        decimated preview of the whole array
+
+        Parameters
+        ----------
+        nav: int, slice or tuple of those
+            the selection on the navigation dimensions, see get_selection_item
+        sig: int, slice or tuple of those
+            the selection on the signal dimensions
+        step: int or tuple of int
+            the decimation step of the dimensions selected with a slice without step
+        out: np.ndarray or None
+            see read_hyperslab
+
+        See Also
+        --------
+        get_selection_item, read_hyperslab
+        """
+        nav_indexes = self.attrs['nav_indexes'] if 'nav_indexes' in self.attrs else ()
+        return self.read_hyperslab(get_selection_item(self._array.shape, nav_indexes, nav, sig, step), out)
+
+    @property
+    def chunkshape(self) -> Union[tuple, None]:
+        """ Get the shape of the array chunks as stored in the file, None if not chunked"""
+        if self.backend == 'tables':
+            return self._array.chunkshape
+        else:
+            return self._array.chunks
 
     def __len__(self):
         if self.backend == 'tables':
@@ -394,29 +792,62 @@ class EARRAY(CARRAY):
             If True the data array will have its shape expanded by one dim
 
         """
+        data, extended_first_index = self._format_appended(data, expand)
+        self.append_backend(data)
+
+        sh = list(self.attrs['shape'])
+        sh[0] += extended_first_index
+        self.attrs['shape'] = tuple(sh)
+
+    def append_frames(self, frames: List[np.ndarray], expand=True):
+        """ appends a collection of ndarrays in a single write to the enlargeable array
+
+        Each element of frames is interpreted as in the append method. They are concatenated
+        along the enlargeable dimension so that the backend and the shape attribute are only
+        accessed once.
+
+        Parameters
+        ----------
+        frames: list of np.ndarray
+            the data arrays to append to the enlargeable node
+        expand: bool
+            If True each data array will have its shape expanded by one dim
+
+        See Also
+        --------
+        append
+        """
+        if len(frames) == 0:
+            return
+        shape = self.attrs['shape']
+        formatted = [self._format_appended(data, expand, shape) for data in frames]
+        self.append_backend(np.concatenate([data for data, _ in formatted], axis=0))
+
+        sh = list(shape)
+        sh[0] += sum([extended_first_index for _, extended_first_index in formatted])
+        self.attrs['shape'] = tuple(sh)
+
+    def _format_appended(self, data: np.ndarray, expand=True, shape: tuple = None):
+        """ Get the data reshaped as it will be appended and the number of added elements"""
         if not isinstance(data, np.ndarray):
             raise TypeError('The appended object should be a ndarray')
-        if len(self.attrs['shape']) > 1 and data.shape == self.attrs['shape'][1:]:
-            shape = [1]
-            shape.extend(data.shape)
-            data = data.reshape(shape)
+        if shape is None:
+            shape = self.attrs['shape']
+        if len(shape) > 1 and data.shape == tuple(shape[1:]):
+            data = data.reshape([1] + list(data.shape))
             extended_first_index = 1
         else:
             extended_first_index = data.shape[0]
         if expand and (len(data.shape) == 1 and not data.shape == (1, )):
             data = np.expand_dims(data, 1)
-        self.append_backend(data)
-
-        sh = list(self.attrs['shape'])
-        sh[0] += extended_first_index
-        self.attrs['shape'] = tuple(sh)
+        return data, extended_first_index
 
     def append_backend(self, data):
         if self.backend == 'tables':
             self.array.append(data)
         else:
-            self.array.resize(self.array.len() + 1, axis=0)
-            self.array[-1] = data
+            self.array.resize(self.array.len() + data.shape[0], axis=0)
+            self.array[-data.shape[0]:] = data
 
 
 class VLARRAY(EARRAY):
@@ -430,6 +861,13 @@ class VLARRAY(EARRAY):
         sh[0] += 1
         self.attrs['shape'] = tuple(sh)
 
+    def append_backend(self, data):
+        if self.backend == 'tables':
+            self.array.append(data)
+        else:
+            self.array.resize(self.array.len() + 1, axis=0)
+            self.array[-1] = data
+
 
 class StringARRAY(VLARRAY):
     def __init__(self, array, backend):
@@ -453,6 +891,9 @@ class StringARRAY(VLARRAY):
         return np.frombuffer(pickle.dumps(string), np.uint8)
 
 
+ARRAY_CLASSES = dict(CARRAY=CARRAY, EARRAY=EARRAY, VLARRAY=VLARRAY)
+
+
 class Attributes(object):
     def __init__(self, node, backend='tables'):
         self._node = node
@@ -485,12 +926,42 @@ class Attributes(object):
     def __len__(self):
         return len(self.attrs_name)
 
+    def __contains__(self, item):
+        if item == 'title':
+            item = item.upper()
+        if self.backend == 'tables':
+            return item in self._node.node._v_attrs
+        else:
+            return item in self._node.node.attrs
+
     def to_dict(self) -> dict:
         """Returns attributes name/value as a dict"""
-        attrs_dict = dict()
-        for name in self.attrs_name:
-            attrs_dict[name] = self[name]
-        return attrs_dict
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """Read all the attributes name/value in one pass
+
+        The attribute set is fetched once but there is still one HDF5 read per attribute, PyTables and h5py
+        having no bulk attribute read
+
+        Returns
+        -------
+        dict: the decoded attributes (as returned by get_attr), the title being keyed as TITLE
+        """
+        return get_attr(self._node.node, None, backend=self.backend)
+
+    def update(self, attributes: dict):
+        """Write all the name/value pairs of attributes in one pass (see set_attrs)
+
+        Parameters
+        ----------
+        attributes: dict
+            the attributes to write, a 'title' key is written as TITLE
+        """
+        if 'title' in attributes:
+            attributes = dict(attributes)
+            attributes['TITLE'] = attributes.pop('title')
+        set_attrs(self._node.node, attributes, backend=self.backend)
 
     @property
     def node(self):
@@ -531,12 +1002,24 @@ class Attributes(object):
 
 
 class H5Backend:
-    def __init__(self, backend='tables'):
+    """Wrapper around the pytables/h5py/h5pyd libraries
+
+    Attributes
+    ----------
+    use_index: bool
+        If True, the nodes of the file are indexed (see NodeIndex) and the index saved in the file.
+        Default False
+    """
+    use_index = False
+
+    def __init__(self, backend='tables', use_index: bool = None):
 
         self._h5file = None
         self.backend = backend
         self.file_path = None
         self.compression = None
+        if use_index is not None:
+            self.use_index = use_index
         if backend == 'tables':
             if is_tables:
                 self.h5_library = tables
@@ -581,6 +1064,11 @@ class H5Backend:
         """
         try:
             if self._h5file is not None:
+                if self.use_index and node_index.is_modified(self) and self.isopen():
+                    self.save_index()
+                node_index.invalidate(self)
+                node_counters.invalidate(self._h5file.filename)
+                node_cache.invalidate(self._h5file.filename)
                 self.flush()
                 if self.isopen():
                     self._h5file.close()
@@ -589,6 +1077,8 @@ class H5Backend:
 
     def open_file(self, fullpathname, mode='r', title='PyMoDAQ file', **kwargs):
         self.file_path = fullpathname
+        node_counters.invalidate(fullpathname)
+        node_cache.invalidate(fullpathname)
         if self.backend == 'tables':
             self._h5file = self.h5_library.open_file(str(fullpathname), mode=mode, title=title, **kwargs)
             if mode == 'w':
@@ -597,6 +1087,7 @@ class H5Backend:
                 except importlib.metadata.PackageNotFoundError:
                     self.root().attrs['pymodaq_version'] = '0.0.0'
                 self.root().attrs['pymodaq_data_version'] = utils.get_version('pymodaq_data')
+            self._init_index(mode)
             return self._h5file
         else:
             self._h5file = self.h5_library.File(str(fullpathname), mode=mode, **kwargs)
@@ -608,8 +1099,131 @@ class H5Backend:
                 except importlib.metadata.PackageNotFoundError:
                     self.root().attrs['pymodaq_version'] = '0.0.0'
                 self.root().attrs['pymodaq_data_version'] = utils.get_version('pymodaq_data')
+            self._init_index(mode)
             return self._h5file
 
+    def is_writable(self) -> bool:
+        if self.backend == 'tables':
+            return self._h5file.mode != 'r'
+        else:
+            return self._h5file.mode == 'r+'
+
+    def _init_index(self, mode: str):
+        node_index.invalidate(self)
+        if self.use_index:
+            if mode == 'w':
+                node_index.set(self, self.filename, dict([]), modified=True)
+                self._index_node(self.root())
+            else:
+                self.load_index()
+
+    def _index_node(self, node: Node):
+        """Add the entry of a newly created node in the index of the file (if indexed)"""
+        if node_index.get(self) is not None:
+            node_index.add(self.filename, node.path, get_index_entry(node.node, self.backend))
+
+    def _get_index_node(self):
+        if self.backend == 'tables':
+            return self._h5file.get_node('/', INDEX_NODE_NAME)
+        else:
+            return self._h5file[INDEX_NODE_NAME]
+
+    def _list_node_paths(self) -> List[str]:
+        """Get the paths of all the nodes of the file from the children names of its groups, without opening
+        the other nodes"""
+        paths = ['/']
+        if self.backend == 'tables':
+            for group in self._h5file.walk_groups('/'):
+                prefix = group._v_pathname.rstrip('/') + '/'
+                paths.extend([prefix + name for name in group._v_children.keys()])
+        else:
+            self._h5file.visit(lambda name: paths.append('/' + name))
+        return [path for path in paths if path != f'/{INDEX_NODE_NAME}']
+
+    def has_index(self) -> bool:
+        """Check if the file contains a saved index"""
+        if self.backend == 'tables':
+            return f'/{INDEX_NODE_NAME}' in self._h5file
+        else:
+            return INDEX_NODE_NAME in self._h5file
+
+    def load_index(self) -> bool:
+        """Load the index saved in the file
+
+        The saved index is trusted only if its paths are the ones of the nodes of the file (listed from the
+        children names of the groups), so that nodes added or removed by another library since the index was saved
+        are detected. Attributes modified by another library are not
+
+        Returns
+        -------
+        bool: False if the file contains no index, an index of another INDEX_VERSION or a stale index
+        """
+        if not self.has_index():
+            return False
+        node = self._get_index_node()
+        attrs_name = node._v_attrs._v_attrnames if self.backend == 'tables' else node.attrs.keys()
+        if 'index_version' not in attrs_name or get_attr(node, 'index_version', self.backend) != INDEX_VERSION:
+            return False
+        entries = json.loads(self.read(node).tobytes().decode())
+        if set(entries.keys()) != set(self._list_node_paths()):
+            return False
+        for entry in entries.values():
+            if 'shape' in entry:
+                entry['shape'] = tuple(entry['shape'])
+        node_index.set(self, self.filename, entries)
+        return True
+
+    def save_index(self):
+        """Save the index of the file as a json encoded array of bytes located at INDEX_NODE_NAME
+
+        This is done when closing a file whose index has been modified. The array is hidden from the children of
+        the root group
+        """
+        entries = node_index.get(self)
+        if entries is None or not self.is_writable():
+            return
+        buffer = np.frombuffer(json.dumps(entries, default=lambda obj: obj.item() if isinstance(obj, np.generic)
+                                          else str(obj)).encode(), dtype=np.uint8)
+        if self.backend == 'tables':
+            if self.has_index():
+                self._h5file.remove_node('/', INDEX_NODE_NAME)
+            node = self._h5file.create_carray('/', INDEX_NODE_NAME, obj=buffer, filters=self.compression)
+        else:
+            if self.has_index():
+                del self._h5file[INDEX_NODE_NAME]
+            node = self._h5file.create_dataset(INDEX_NODE_NAME, data=buffer,
+                                               **(self.compression if self.compression is not None
+                                                  else dict([])))
+            node.attrs['CLASS'] = 'CARRAY'
+        set_attr(node, 'index_version', INDEX_VERSION, self.backend)
+        node_index.set(self, self.filename, entries)
+
+    def rebuild_index(self, save=True):
+        """Build the index of the file by walking all its nodes, for instance for files written without index
+
+        Parameters
+        ----------
+        save: bool
+            If True (and the file is writable), the index is saved in the file now, otherwise when closing it
+        """
+        entries = dict([])
+        for node in self.walk_nodes('/'):
+            entries[node.path] = get_index_entry(node.node, self.backend)
+        node_index.set(self, self.filename, entries, modified=True)
+        if save:
+            self.save_index()
+
+    def get_index(self) -> Union[Dict[str, dict], None]:
+        """Get the index of the file (keys are node paths, values the entries, see get_index_entry)
+
+        The index is loaded or built if not already done. None if use_index is False
+        """
+        if not self.use_index:
+            return None
+        if node_index.get(self) is None and not self.load_index():
+            self.rebuild_index(save=False)
+        return node_index.get(self)
+
     def save_file_as(self, filenamepath='h5copy.txt'):
         if self.backend == 'tables':
             self.h5file.copy_file(str(filenamepath))
@@ -632,6 +1246,11 @@ class H5Backend:
             node = node.node
         return set_attr(node, attr_name, attr_value, self.backend)
 
+    def set_attrs(self, node, attributes: dict):
+        if isinstance(node, Node):
+            node = node.node
+        return set_attrs(node, attributes, self.backend)
+
     def has_attr(self, node, attr_name):
         return attr_name in self.get_node(node).attrs.attrs_name
 
@@ -684,10 +1303,12 @@ class H5Backend:
                 group = self.get_node(where).node.create_group(name)
                 group.attrs['TITLE'] = title
                 group.attrs['CLASS'] = 'GROUP'
-
+            group = GROUP(group, self.backend)
+            node_cache.invalidate(self.filename, group.path)
+            self._index_node(group)
         else:
             group = self.get_node(where, name)
-        return GROUP(group, self.backend)
+        return group
 
     def get_group_by_title(self, where, title):
         if isinstance(where, Node):
@@ -722,8 +1343,18 @@ class H5Backend:
         return name.lower() in [name.lower() for name in self.get_children(where)]
 
     def get_node(self, where, name=None) -> Node:
+        """Get the Node wrapper of a node given by its path or by its parent and name
+
+        Wrappers are cached per file and node path (see NodeCache), so that getting again a node
+        doesn't require reading its attributes
+        """
         if isinstance(where, Node):
             where = where.node
+        if isinstance(where, str) and where.startswith('/') and self._h5file is not None:
+            path = where if name is None else f"{where.rstrip('/')}/{name}"
+            node = node_cache.get(self._h5file, path)
+            if node is not None:
+                return node
         try:
             if self.backend == 'tables':
                 node = self._h5file.get_node(where, name)
@@ -742,23 +1373,13 @@ class H5Backend:
                         node = where
         except Exception as e:
             raise NodeError(str(e))
+        if node is None:  # h5py returns None for missing nodes
+            raise NodeError(f'{where} has no child named {name}' if name is not None else f'No node at {where}')
 
-        if 'CLASS' not in self.get_attr(node):
+        attrs_name = node._v_attrs._v_attrnames if self.backend == 'tables' else node.attrs.keys()
+        if 'CLASS' not in attrs_name:
             self.set_attr(node, 'CLASS', 'GROUP')
-            return GROUP(node, self.backend)
-        else:
-            attr = self.get_attr(node, 'CLASS')
-            if 'ARRAY' not in attr:
-                return GROUP(node, self.backend)
-            elif attr == 'CARRAY':
-                return CARRAY(node, self.backend)
-            elif attr == 'EARRAY':
-                return EARRAY(node, self.backend)
-            elif attr == 'VLARRAY':
-                if self.get_attr(node, 'subdtype') == 'string':
-                    return StringARRAY(node, self.backend)
-                else:
-                    return VLARRAY(node, self.backend)
+        return wrap_node(node, self.backend)
 
     def get_node_name(self, node):
         """return node name
@@ -817,29 +1438,7 @@ class H5Backend:
         :meth:`.GROUP.children_name`
 
         """
-        where = self.get_node(where)  # return a node object in case where is a string
-        if isinstance(where, Node):
-            where = where.node
-
-        mod = importlib.import_module('.backends', 'pymodaq_data.h5modules')
-        children = dict([])
-        if self.backend == 'tables':
-            for child_name, child in where._v_children.items():
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        else:
-            for child_name, child in where.items():
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        return children
+        return self.get_node(where).children()  # get_node returns a node object in case where is a string
 
     def walk_nodes(self, where):
         where = self.get_node(where)  # return a node object in case where is a string
@@ -848,6 +1447,41 @@ class H5Backend:
             for child in self.get_children(gr).values():
                 yield child
 
+    def count_data_type_nodes(self, where, data_type: str) -> int:
+        """Get the number of nodes hanging from where (including it) having a given data_type
+        attribute
+
+        For groups, the counts of all data types are computed once by walking the nodes then cached
+        (see NodeCounters) so that subsequent calls cost constant time
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+        data_type: str
+            the name of the data_type attribute to match
+        """
+        where = self.get_node(where)
+        if not isinstance(where, GROUP):
+            return int('data_type' in where.attrs and where.attrs['data_type'] == data_type)
+        counts = node_counters.get(self.filename, where.path)
+        if counts is None:
+            counts = dict([])
+            entries = node_index.get(self)
+            if entries is not None:
+                where_path = where.path
+                prefix = where_path.rstrip('/') + '/'
+                data_types = [entry['data_type'] for path, entry in entries.items()
+                              if 'data_type' in entry and (path == where_path or path.startswith(prefix))]
+            else:
+                data_types = [node.attrs['data_type'] for node in self.walk_nodes(where)
+                              if 'data_type' in node.attrs]
+            for node_data_type in data_types:
+                node_data_type = str(node_data_type)
+                counts[node_data_type] = counts.get(node_data_type, 0) + 1
+            node_counters.set(self.filename, where.path, counts)
+        return counts.get(data_type, 0)
+
     def walk_groups(self, where):
         where = self.get_node(where)  # return a node object in case where is a string
         if where.attrs['CLASS'] != 'GROUP':
@@ -865,6 +1499,86 @@ class H5Backend:
                     stack.append(child)
                     yield child
 
+    def find_nodes(self, where, **attributes) -> List[Node]:
+        """Get the nodes hanging from where (including it) having all the given attribute values
+
+        If the file is indexed (or where is the root group and use_index is True) and all attribute names are
+        INDEX_KEYS, the nodes are found from the index only opening them and their parent groups, otherwise by
+        walking the nodes.
+        Attributes of INDEXED_FLAGS should be given a boolean telling if they should be present or not
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+        attributes: dict
+            the attribute names and values to match
+
+        Returns
+        -------
+        list of Node: in the order of walk_nodes
+        """
+        where = self.get_node(where)
+        entries = None
+        if INDEX_KEYS.issuperset(attributes):
+            entries = node_index.get(self)
+            if entries is None and where.path == '/':
+                entries = self.get_index()
+        if entries is None:
+            return [node for node in self.walk_nodes(where) if match_node_attributes(node, attributes)]
+
+        where_path = where.path
+        prefix = where_path.rstrip('/') + '/'
+        paths = [path for path, entry in entries.items()
+                 if (path == where_path or path.startswith(prefix)) and match_index_entry(entry, attributes)]
+        try:
+            return self._sort_as_walked(where, [self.get_node(path) for path in paths])
+        except (NodeError, KeyError):  # stale index: the file has been modified out of this backend
+            self.rebuild_index(save=False)
+            return [node for node in self.walk_nodes(where) if match_node_attributes(node, attributes)]
+
+    def _sort_as_walked(self, where: Node, nodes: List[Node]) -> List[Node]:
+        """Sort nodes hanging from where in the order walk_nodes would yield them, only opening their parent groups
+
+        walk_nodes yields the children of each group in a block (in the order of get_children), the blocks following
+        the order walk_groups yields the groups: the child groups of a group are yielded together (sorted by name)
+        when it is popped from the stack of walk_groups, that is depth first, the last child group being popped first
+        """
+        positions = dict([])
+
+        def get_position(path: str, sort=False) -> int:
+            """Index of the node at path among the (sorted if sort) children of its parent"""
+            parent_path, name = path.rsplit('/', 1)
+            parent_path = parent_path or '/'
+            if parent_path not in positions:
+                parent = self.get_node(parent_path).node
+                names = list(parent._v_children.keys() if self.backend == 'tables' else parent.keys())
+                positions[parent_path] = (dict([(child_name, ind) for ind, child_name in enumerate(names)]),
+                                          dict([(child_name, ind) for ind, child_name in enumerate(sorted(names))]))
+            return positions[parent_path][int(sort)][name]
+
+        def get_block_key(group_path: str) -> tuple:
+            """Rank of the block of the children of a group: when its parent is popped, then its position"""
+            if group_path == where.path:
+                return (), -1
+            ancestors = []
+            path = group_path.rsplit('/', 1)[0] or '/'
+            while path != where.path:
+                ancestors.insert(0, path)
+                path = path.rsplit('/', 1)[0] or '/'
+            return tuple([-get_position(path, sort=True) for path in ancestors]), get_position(group_path, sort=True)
+
+        def get_key(node: Node) -> tuple:
+            if node.path == where.path:
+                return ((), -2), -1
+            return get_block_key(node.path.rsplit('/', 1)[0] or '/'), get_position(node.path)
+
+        return sorted(nodes, key=get_key)
+
+    def has_node(self, path: str) -> bool:
+        """Check if a node exists at path, without opening it"""
+        return path in self._h5file
+
     def read(self, array, *args, **kwargs):
         if isinstance(array, CARRAY):
             array = array.array
@@ -873,7 +1587,17 @@ class H5Backend:
         else:
             return array[:]
 
-    def create_carray(self, where, name, obj=None, title=''):
+    def create_carray(self, where, name, obj=None, title='', chunkshape: tuple = None):
+        """create a chunked array from data
+
+        Parameters
+        ----------
+        where: (str) group location in the file where to create the array node
+        name: (str) name of the array
+        obj: (ndarray) the data to save
+        title: (str) node title attribute (written in capitals)
+        chunkshape: (tuple or None) the shape of the chunks, if None let the backend decide
+        """
         if isinstance(where, Node):
             where = where.node
         if obj is None:
@@ -882,25 +1606,30 @@ class H5Backend:
         if self.backend == 'tables':
             array = CARRAY(self._h5file.create_carray(where, name, obj=obj,
                                                       title=title,
-                                                      filters=self.compression), self.backend)
+                                                      filters=self.compression,
+                                                      chunkshape=chunkshape), self.backend)
         else:
             if self.compression is not None:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, **self.compression),
+                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, chunks=chunkshape,
+                                                                        **self.compression),
                                self.backend)
             else:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj), self.backend)
+                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, chunks=chunkshape),
+                               self.backend)
             array.array.attrs['TITLE'] = title
             array.array.attrs[
                 'CLASS'] = 'CARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
-        array.attrs['shape'] = obj.shape
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = ''
-        array.attrs['backend'] = self.backend
+        array.attrs.update(dict(shape=obj.shape, dtype=dtype.name, subdtype='',
+                                backend=self.backend))
+        node_cache.invalidate(self.filename, array.path)
+        self._index_node(array)
         return array
 
-    def create_earray(self, where, name, dtype, data_shape=None, title=''):
+    def create_earray(self, where, name, dtype, data_shape=None, title='', chunkshape: tuple = None):
         """create enlargeable arrays from data with a given shape and of a given type. The array is enlargeable along
         the first dimension
+
+        The chunkshape (including the enlargeable dimension) is decided by the backend if None
         """
         if isinstance(where, Node):
             where = where.node
@@ -913,7 +1642,8 @@ class H5Backend:
         if self.backend == 'tables':
             atom = self.h5_library.Atom.from_dtype(dtype)
             array = EARRAY(self._h5file.create_earray(where, name, atom, shape=shape, title=title,
-                                                      filters=self.compression), self.backend)
+                                                      filters=self.compression,
+                                                      chunkshape=chunkshape), self.backend)
         else:
             maxshape = [None]
             if data_shape is not None:
@@ -922,19 +1652,20 @@ class H5Backend:
             if self.compression is not None:
                 array = EARRAY(
                     self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape,
-                                                             **self.compression), self.backend)
+                                                             chunks=chunkshape, **self.compression),
+                    self.backend)
             else:
                 array = EARRAY(
-                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape),
+                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape,
+                                                             chunks=chunkshape),
                     self.backend)
             array.array.attrs['TITLE'] = title
             array.array.attrs[
                 'CLASS'] = 'EARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
             array.array.attrs['EXTDIM'] = 0
-        array.attrs['shape'] = shape
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = ''
-        array.attrs['backend'] = self.backend
+        array.attrs.update(dict(shape=shape, dtype=dtype.name, subdtype='', backend=self.backend))
+        node_cache.invalidate(self.filename, array.path)
+        self._index_node(array)
         return array
 
     def create_vlarray(self, where, name, dtype, title=''):
@@ -993,10 +1724,10 @@ class H5Backend:
             array.array.attrs[
                 'CLASS'] = 'VLARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
             array.array.attrs['EXTDIM'] = 0
-        array.attrs['shape'] = (0,)
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = subdtype
-        array.attrs['backend'] = self.backend
+        array.attrs.update(dict(shape=(0,), dtype=dtype.name, subdtype=subdtype,
+                                backend=self.backend))
+        node_cache.invalidate(self.filename, array.path)
+        self._index_node(array)
         return array
 
     def add_group(self, group_name, group_type: GroupType, where, title='', metadata=dict([])) -> GROUP:
@@ -1024,8 +1755,8 @@ class H5Backend:
 
         else:
             node = self.get_set_group(where, utils.capitalize(group_name), title)
-            node.attrs['type'] = group_type.name.lower()
-            for metadat in metadata:
-                node.attrs[metadat] = metadata[metadat]
+            attributes = dict(type=group_type.name.lower())
+            attributes.update(metadata)
+            node.attrs.update(attributes)
         node.attrs['backend'] = self.backend
         return node
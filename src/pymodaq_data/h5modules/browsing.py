@@ -68,11 +68,10 @@ class H5BrowserUtil(H5Backend):
         # TODO add a test for this method
         scan_list = []
         where = self.get_node(where)
-        for node in self.walk_nodes(where):
-            if 'pixmap2D' in node.attrs:
-                scan_list.append(
-                    dict(scan_name='{:s}_{:s}'.format(node.parent_node.name, node.name), path=node.path,
-                         data=node.attrs['pixmap2D']))
+        for node in self.find_nodes(where, pixmap2D=True):
+            scan_list.append(
+                dict(scan_name='{:s}_{:s}'.format(node.parent_node.name, node.name), path=node.path,
+                     data=node.attrs['pixmap2D']))
 
         return scan_list
 
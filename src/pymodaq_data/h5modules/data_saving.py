@@ -4,21 +4,26 @@ Created the 21/11/2022
 
 @author: Sebastien Weber
 """
-from time import time
-from typing import Union, List, Tuple, Iterable
+import queue
+import threading
+from time import time, perf_counter
+from typing import Dict, Union, List, Tuple, Iterable
 from pathlib import Path
 
 import numpy as np
 
 from pymodaq_utils.abstract import ABCMeta, abstract_attribute
-from pymodaq_utils.enums import enum_checker
+from pymodaq_utils.enums import BaseEnum, enum_checker
+from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_data.data import (Axis, DataDim, DataWithAxes, DataToExport, DataDistribution,
-                               DataDimError, squeeze)
+                               DataDimError, squeeze, LazyArray)
 from .saving import DataType, H5SaverLowLevel
-from .backends import GROUP, CARRAY, Node, EARRAY, NodeError
+from .backends import GROUP, CARRAY, Node, EARRAY, NodeError, get_selection_item
 from pymodaq_utils.utils import capitalize
 
 
+logger = set_logger(get_module_name(__file__))
+
 SPECIAL_GROUP_NAMES = dict(nav_axes='NavAxes')
 
 
@@ -26,6 +31,168 @@ class AxisError(Exception):
     pass
 
 
+class SaverQueueFull(Exception):
+    pass
+
+
+class QueueFullPolicy(BaseEnum):
+    """ What to do when adding data to an asynchronous saver whose queue is full
+
+    * block: wait for the writer thread to free a slot
+    * drop_oldest: discard the oldest queued data and queue the new one
+    * error: raise a SaverQueueFull exception
+    """
+    block = 0
+    drop_oldest = 1
+    error = 2
+
+
+class LazyH5Array(LazyArray):
+    """Read-only proxy over a CARRAY/EARRAY node only reading the hyperslabs that are indexed
+
+    Parameters
+    ----------
+    array: CARRAY or EARRAY
+        the node holding the data
+    squeeze_indexes: tuple of int
+        the indexes of the dimensions (of length 1) to be hidden, as with np.squeeze (but the
+        proxy has always at least one dimension)
+    bkg: CARRAY or None
+        if not None, a background node with the same shape as array to be subtracted
+    """
+
+    def __init__(self, array: CARRAY, squeeze_indexes: Tuple[int] = (), bkg: CARRAY = None):
+        full_shape = tuple(array.attrs['shape'])
+        squeeze_indexes = sorted([ind for ind in squeeze_indexes if full_shape[ind] == 1])
+        if len(squeeze_indexes) == len(full_shape):
+            squeeze_indexes = squeeze_indexes[1:]  # as np.atleast_1d, see squeeze
+        super().__init__([full_shape[ind] for ind in range(len(full_shape))
+                          if ind not in squeeze_indexes], np.dtype(array.attrs['dtype']))
+        self._array = array
+        self._bkg = bkg
+        self._full_ndim = len(full_shape)
+        self._squeeze_indexes = squeeze_indexes
+
+    @property
+    def node(self) -> CARRAY:
+        return self._array
+
+    def _read(self, item) -> np.ndarray:
+        if not isinstance(item, tuple):
+            item = (item,)
+        if not all([isinstance(it, (int, np.integer, slice)) or it is Ellipsis for it in item]) \
+                or any([isinstance(it, slice) and it.step is not None and it.step < 0
+                        for it in item]) or sum([it is Ellipsis for it in item]) > 1:
+            # fancy indexing (or not supported by the backends): read all then index
+            return self._read_backend(Ellipsis)[item]
+        if Ellipsis in item:
+            ind_ellipsis = item.index(Ellipsis)
+            item = (item[:ind_ellipsis] + tuple([slice(None) for _ in range(self.ndim - len(item) + 1)])
+                    + item[ind_ellipsis + 1:])
+        item = list(item) + [slice(None) for _ in range(self.ndim - len(item))]
+        if len(item) > self.ndim:
+            raise IndexError(f'Too many indices for an array of dimension {self.ndim}')
+        full_item = []
+        for ind in range(self._full_ndim):
+            full_item.append(0 if ind in self._squeeze_indexes else item.pop(0))
+        return self._read_backend(tuple(full_item))
+
+    def _read_backend(self, item) -> np.ndarray:
+        if item is Ellipsis:
+            data = self._array.read()
+            if self._bkg is not None:
+                data = data - self._bkg.read()
+            return squeeze(data, squeeze_indexes=tuple(self._squeeze_indexes))
+        item = get_selection_item(self._array.array.shape, sig=item)
+        data = self._array.read_hyperslab(item)
+        if self._bkg is not None:
+            data = data - self._bkg.read_hyperslab(item)
+        return data
+
+
+def select_data(data: DataWithAxes, nav=None, sig=None, step: Union[int, Tuple[int]] = None) -> DataWithAxes:
+    """Get a DataWithAxes holding only a selection made on the navigation and signal dimensions of data
+
+    With LazyH5Array data (and errors), only the selected hyperslab is read from the file
+
+    Parameters
+    ----------
+    data: DataWithAxes
+    nav: int, slice or tuple of those
+        the selection on the navigation dimensions, see backends.get_selection_item
+    sig: int, slice or tuple of those
+        the selection on the signal dimensions
+    step: int or tuple of int
+        the decimation step of the dimensions selected with a slice without step
+
+    Returns
+    -------
+    DataWithAxes: the dimensions selected with an integer are dropped together with their axes
+    """
+    item = get_selection_item(data.shape, data.nav_indexes, nav, sig, step)
+    dropped = [ind for ind, sel in enumerate(item) if not isinstance(sel, slice)]
+
+    def new_index(index: int) -> int:
+        return index - len([ind for ind in dropped if ind < index])
+
+    axes = []
+    for axis in data.axes:
+        if axis.index not in dropped:
+            axis = axis.iaxis[item[axis.index]]
+            axis.index = new_index(axis.index)
+            axes.append(axis)
+    errors = None
+    if data.errors is not None:
+        errors = [np.atleast_1d(error[item]) for error in data.errors]
+    selected = DataWithAxes(data.name, source=data.source, distribution=data.distribution,
+                            data=[np.atleast_1d(array[item]) for array in data.data],
+                            labels=data.labels[:], origin=data.origin, units=data.units,
+                            nav_indexes=tuple([new_index(ind) for ind in data.nav_indexes
+                                               if ind not in dropped]),
+                            axes=axes, errors=errors,
+                            **dict([(name, getattr(data, name)) for name in data.extra_attributes]))
+    selected.timestamp = data.timestamp
+    selected.get_dim_from_data_axes()
+    return selected
+
+
+class BufferPool:
+    """Pool of preallocated arrays reused by the loaders to read nodes of the same shape again and again
+
+    Buffers are identified by a tag, their shape, dtype and an index (to get several buffers of the same
+    shape at once). The least recently used ones are dropped when the pool holds more than max_bytes.
+    A buffer given twice holds the data of the last read: arrays got from the pool should be copied to be
+    kept.
+
+    Attributes
+    ----------
+    max_bytes: int
+        The maximum size in bytes of the buffers held by the pool
+    """
+    max_bytes = 2 ** 30
+
+    def __init__(self):
+        self._buffers: Dict[tuple, np.ndarray] = dict([])
+
+    def get(self, shape: Tuple[int], dtype: np.dtype, index: int = 0, tag: str = '') -> np.ndarray:
+        """Get the buffer with the given shape, dtype, index and tag, allocating it if needed"""
+        key = (tag, tuple(shape), np.dtype(dtype).str, index)
+        buffer = self._buffers.pop(key, None)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=dtype)
+        self._buffers[key] = buffer  # most recently used last
+        while self.nbytes > self.max_bytes and len(self._buffers) > 1:
+            self._buffers.pop(next(iter(self._buffers)))
+        return buffer
+
+    @property
+    def nbytes(self) -> int:
+        return sum([buffer.nbytes for buffer in self._buffers.values()])
+
+    def clear(self):
+        self._buffers = dict([])
+
+
 class DataManagement(metaclass=ABCMeta):
     """Base abstract class to be used for all specialized object saving and loading data to/from a h5file
 
@@ -113,13 +280,12 @@ class DataManagement(metaclass=ABCMeta):
         Returns
         -------
         int: the next available integer to index the node name
+
+        See Also
+        --------
+        H5Backend.count_data_type_nodes
         """
-        ind = 0
-        for node in self._h5saver.walk_nodes(where):
-            if 'data_type' in node.attrs:
-                if node.attrs['data_type'] == self.data_type.name:
-                    ind += 1
-        return ind
+        return self._h5saver.count_data_type_nodes(where, self.data_type.name)
 
     def _is_node_of_data_type(self, where: Union[str, Node]) -> bool:
         """Check if a given node is of the data_type of the real class implementation
@@ -178,11 +344,7 @@ class DataManagement(metaclass=ABCMeta):
         else:
             parent_node = node.parent_node
 
-        nodes = []
-        for child_node in self._h5saver.walk_nodes(parent_node):
-            if self._is_node_of_data_type(child_node):
-                nodes.append(child_node)
-        return nodes
+        return self._h5saver.find_nodes(parent_node, data_type=self.data_type.name)
 
 
 class AxisSaverLoader(DataManagement):
@@ -239,9 +401,10 @@ class AxisSaverLoader(DataManagement):
         axis_node = self._get_node(where)
         if not self._is_node_of_data_type(axis_node):
             raise AxisError(f'Could not create an Axis object from this node: {axis_node}')
-        return Axis(label=axis_node.attrs['label'], units=axis_node.attrs['units'],
-                    data=squeeze(axis_node.read()), index=axis_node.attrs['index'],
-                    spread_order=axis_node.attrs['spread_order'])
+        attrs = axis_node.attrs.snapshot()
+        return Axis(label=attrs['label'], units=attrs['units'],
+                    data=squeeze(axis_node.read()), index=attrs['index'],
+                    spread_order=attrs['spread_order'])
 
     def get_axes(self, where: Union[Node, str]) -> List[Axis]:
         """Return a list of Axis objects from the Axis Nodes hanging from (or among) a given Node
@@ -287,6 +450,7 @@ class DataSaverLoader(DataManagement):
             h5saver = h5saver_tmp
 
         self._h5saver = h5saver
+        self._buffer_pool = BufferPool()
         self._axis_saver = AxisSaverLoader(h5saver)
         if not isinstance(self, ErrorSaverLoader):
             self._error_saver = ErrorSaverLoader(h5saver)
@@ -341,14 +505,11 @@ class DataSaverLoader(DataManagement):
         return self._axis_saver.get_axes(where)
 
     def get_bkg_nodes(self, where: Union[Node, str]):
-        bkg_nodes = []
-        for node in self._h5saver.walk_nodes(where):
-            if 'data_type' in node.attrs and node.attrs['data_type'] == 'bkg':
-                bkg_nodes.append(node)
-        return bkg_nodes
+        return self._h5saver.find_nodes(where, data_type='bkg')
 
     def get_data_arrays(self, where: Union[Node, str], with_bkg=False,
-                        load_all=False) -> List[np.ndarray]:
+                        load_all=False, lazy=False, out: List[np.ndarray] = None,
+                        reuse_buffers=False) -> List[Union[np.ndarray, LazyH5Array]]:
         """
 
         Parameters
@@ -359,10 +520,20 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the array with background subtraction
         load_all: bool
             If True load all similar nodes hanging from a parent
+        lazy: bool
+            If True, return proxies only reading the data from the file when indexed
+        out: list of ndarray or None
+            If not None, preallocated arrays (one per node, of the node shape and dtype) the data
+            are directly read into. The background is then subtracted in place, unless the result
+            has another dtype than the data (e.g. a float background of integer data)
+        reuse_buffers: bool
+            If True (and out is None), the data are read into buffers of the BufferPool of this
+            object, allocated only once per shape and dtype. The returned arrays are then
+            overwritten by the next loading of the same shape
 
         Returns
         -------
-        list of ndarray
+        list of ndarray or LazyH5Array
         """
         where = self._get_node(where)
         if with_bkg:
@@ -377,7 +548,29 @@ class DataSaverLoader(DataManagement):
         else:
             getter = self._get_nodes
 
-        if with_bkg:
+        if lazy:
+            arrays = getter(where)
+            return [LazyH5Array(array, self._get_signal_indexes_to_squeeze(array),
+                                bkg=bkg_nodes[ind] if with_bkg else None)
+                    for ind, array in enumerate(arrays)]
+        elif out is not None or reuse_buffers:
+            arrays = []
+            for ind, array in enumerate(getter(where)):
+                if out is not None:
+                    buffer = out[ind]
+                else:
+                    buffer = self._buffer_pool.get(array.array.shape, array.array.dtype, ind)
+                data = array.read(out=buffer)
+                if with_bkg:
+                    bkg = bkg_nodes[ind]
+                    bkg_data = bkg.read(out=self._buffer_pool.get(bkg.array.shape, bkg.array.dtype, ind, 'bkg'))
+                    if np.result_type(data.dtype, bkg_data.dtype) == data.dtype:
+                        np.subtract(data, bkg_data, out=data)
+                    else:  # the subtraction would be cast into the buffer, e.g. float bkg on int data
+                        data = data - bkg_data
+                arrays.append(squeeze(data, squeeze_indexes=self._get_signal_indexes_to_squeeze(array)))
+            return arrays
+        elif with_bkg:
             return [squeeze(array.read()-bkg.read(),
                             squeeze_indexes=self._get_signal_indexes_to_squeeze(array))
                     for array, bkg in zip(getter(where), bkg_nodes)]
@@ -389,13 +582,15 @@ class DataSaverLoader(DataManagement):
     def _get_signal_indexes_to_squeeze(self, array: Union[CARRAY, EARRAY]):
         """ Get the tuple of indexes in the array shape that are not navigation and should be
         squeezed"""
+        attrs = array.attrs.snapshot()
         sig_indexes = []
-        for ind in range(len(array.attrs['shape'])):
-            if ind not in array.attrs['nav_indexes'] and array.attrs['shape'][ind] == 1:
+        for ind in range(len(attrs['shape'])):
+            if ind not in attrs['nav_indexes'] and attrs['shape'][ind] == 1:
                 sig_indexes.append(ind)
         return tuple(sig_indexes)
 
-    def load_data(self, where, with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where, with_bkg=False, load_all=False, lazy=False,
+                  reuse_buffers=False, out: List[np.ndarray] = None) -> DataWithAxes:
         """Return a DataWithAxes object from the Data and Axis Nodes hanging from (or among) a
         given Node
 
@@ -410,6 +605,17 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the data with background subtraction
         load_all: bool
             If True, will load all data hanging from the same parent node
+        lazy: bool
+            If True, the data (and errors) arrays are LazyH5Array proxies: slicing the
+            DataWithAxes (inav, isig...) only reads the needed part of the file. The file
+            should stay opened while using the data
+        reuse_buffers: bool
+            If True, the data (and errors) are read into buffers allocated once per shape and
+            dtype and reused by the next calls (see get_data_arrays): for repeated loads of nodes
+            of the same shape, the returned data should be copied to be kept
+        out: list of ndarray or None
+            If not None, preallocated arrays (one per data node, of the node shape and dtype) the
+            data are directly read into, see get_data_arrays. Not used if lazy
 
         See Also
         --------
@@ -442,38 +648,42 @@ class DataSaverLoader(DataManagement):
                          data=np.linspace(0, ndarrays[0].size-1, ndarrays[0].size-1))]
             error_arrays = None
         else:
-            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all)
+            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all,
+                                            lazy=lazy, out=out, reuse_buffers=reuse_buffers)
             axes = self.get_axes(parent_node)
             if error_node is not None:
-                error_arrays = self._error_saver.get_data_arrays(error_node, load_all=load_all)
+                error_arrays = self._error_saver.get_data_arrays(error_node, load_all=load_all,
+                                                                 lazy=lazy,
+                                                                 reuse_buffers=reuse_buffers)
                 if len(error_arrays) == 0:
                     error_arrays = None
             else:
                 error_arrays = None
 
-        extra_attributes = data_node.attrs.to_dict()
+        attrs = data_node.attrs.snapshot()
+        extra_attributes = dict(attrs)
         for name in ['TITLE', 'CLASS', 'VERSION', 'backend', 'source', 'data_dimension',
                      'distribution', 'label', 'origin', 'nav_indexes', 'dtype', 'data_type',
-                     'subdtype', 'shape', 'size', 'EXTDIM', 'path', 'timestamp', 'units']:
+                     'subdtype', 'shape', 'size', 'EXTDIM', 'path', 'timestamp', 'units',
+                     'chunkshape']:
             extra_attributes.pop(name, None)
 
-        data = DataWithAxes(data_node.attrs['TITLE'],
-                            source=data_node.attrs['source'] if 'source' in data_node.attrs
-                            else 'raw',
-                            dim=data_node.attrs['data_dimension'],
-                            units=data_node.attrs['units'] if 'units' in data_node.attrs else '',
-                            distribution=data_node.attrs['distribution'],
+        data = DataWithAxes(attrs['TITLE'],
+                            source=attrs.get('source', 'raw'),
+                            dim=attrs['data_dimension'],
+                            units=attrs.get('units', ''),
+                            distribution=attrs['distribution'],
                             data=ndarrays,
-                            labels=[node.attrs['label'] for node in data_nodes],
-                            origin=data_node.attrs['origin'] if 'origin' in data_node.attrs else '',
-                            nav_indexes=data_node.attrs['nav_indexes'] if 'nav_indexes' in
-                                                                          data_node.attrs else (),
+                            labels=[attrs['label'] if node is data_node else node.attrs['label']
+                                    for node in data_nodes],
+                            origin=attrs.get('origin', ''),
+                            nav_indexes=attrs.get('nav_indexes', ()),
                             axes=axes,
                             errors=error_arrays,
                             path=data_node.path,
                             **extra_attributes)
         if 'axis' not in self.data_type.name:
-            data.timestamp = data_node.attrs['timestamp']
+            data.timestamp = attrs['timestamp']
         return data
 
 
@@ -513,7 +723,56 @@ class ErrorSaverLoader(DataSaverLoader):
         super().__init__(h5saver)
 
 
-class DataEnlargeableSaver(DataSaverLoader):
+class BufferedSaverMixin:
+    """ Mixin holding the state of savers buffering added data before writing them in a single
+    append to enlargeable arrays
+
+    Classes using it call _init_buffer from their __init__, _add_to_buffer after each buffered
+    addition and implement a flush method writing the buffered data then calling _clear_buffer.
+
+    The buffered data are written when buffer_size data have been added, when buffer_time has
+    elapsed (checked only when new data are added, there is no timer) and before the file of the
+    h5saver is closed, either from this object or directly from the h5saver (see
+    H5SaverLowLevel.add_close_hook)
+    """
+    def _init_buffer(self, h5saver: H5SaverLowLevel, buffer_size: Union[int, None],
+                     buffer_time: Union[float, None]):
+        self.buffer_size = buffer_size
+        self.buffer_time = buffer_time
+        self._buffer_length = 0
+        self._buffer_start = None
+        h5saver.add_close_hook(self.flush)
+
+    @property
+    def buffer_length(self) -> int:
+        """ Get the number of data added but not yet written into the file"""
+        return self._buffer_length
+
+    def is_flush_due(self) -> bool:
+        """ Check if the buffered data should be written given the buffer_size and buffer_time"""
+        if self._buffer_length == 0:
+            return False
+        if self.buffer_size is not None and self._buffer_length >= self.buffer_size:
+            return True
+        return self.buffer_time is not None and time() - self._buffer_start >= self.buffer_time
+
+    def flush(self):
+        raise NotImplementedError
+
+    def _add_to_buffer(self):
+        """ Account for newly buffered data and flush them if due"""
+        if self._buffer_length == 0:
+            self._buffer_start = time()
+        self._buffer_length += 1
+        if self.is_flush_due():
+            self.flush()
+
+    def _clear_buffer(self):
+        self._buffer_length = 0
+        self._buffer_start = None
+
+
+class DataEnlargeableSaver(BufferedSaverMixin, DataSaverLoader):
     """ Specialized Object to save and load enlargeable DataWithAxes saved object to and from a
     h5file
 
@@ -523,6 +782,17 @@ class DataEnlargeableSaver(DataSaverLoader):
     Parameters
     ----------
     h5saver: H5SaverLowLevel
+    enl_axis_names: Iterable[str]
+        The names of the enlargeable axis, default ['nav_axis']
+    enl_axis_units: Iterable[str]
+        The names of the enlargeable axis, default ['']
+    buffer_size: int or None
+        The number of added data kept in memory before being written in a single append to the
+        enlargeable arrays. Default 1: no buffering. If None, the number of buffered data is not
+        limited
+    buffer_time: float or None
+        The maximum time (in s) the buffered data are kept in memory. It is checked when new data
+        are added. Default None: no time limit
 
     Attributes
     ----------
@@ -533,18 +803,47 @@ class DataEnlargeableSaver(DataSaverLoader):
     -----
     To be used to save data from a timed logger (DAQViewer continuous saving or DAQLogger extension) or from an
     adaptive scan where the final shape is unknown or other module that need this feature
+
+    When buffering, the data only appear in the file once flushed, see the flush method and
+    BufferedSaverMixin. It is called when closing the file, from this object or from the h5saver
     """
     data_type = DataType['data_enlargeable']
 
     def __init__(self, h5saver: Union[H5SaverLowLevel, Path],
                  enl_axis_names: Iterable[str] = ('nav axis',),
-                 enl_axis_units: Iterable[str] = ('',)):
+                 enl_axis_units: Iterable[str] = ('',),
+                 buffer_size: Union[int, None] = 1,
+                 buffer_time: float = None):
         super().__init__(h5saver)
 
         self._n_enl_axes = len(enl_axis_names)
         self._enl_axis_names = enl_axis_names
         self._enl_axis_units = enl_axis_units
 
+        self._buffer: Dict[str, List[Tuple[List[np.ndarray], Union[Iterable[float], None]]]] = \
+            dict([])
+        self._init_buffer(self._h5saver, buffer_size, buffer_time)
+
+    def flush(self):
+        """ Write all the buffered data into their enlargeable arrays
+
+        All data (and enlargeable axis values) buffered for a given node are written with a
+        single append and the related shape and size attributes updated once
+        """
+        for where, buffered in self._buffer.items():
+            for ind_data in range(len(buffered[0][0])):
+                array: EARRAY = self.get_node_from_index(where, ind_data)
+                array.append_frames([arrays[ind_data] for arrays, _ in buffered])
+            axis_values = [values for _, values in buffered if values is not None]
+            if len(axis_values) != 0:
+                for ind_axis in range(self._n_enl_axes):
+                    axis_array: EARRAY = self._axis_saver.get_node_from_index(where, ind_axis)
+                    axis_array.append_frames([np.array([values[ind_axis]])
+                                              for values in axis_values])
+                    axis_array.attrs['size'] += len(axis_values)
+        self._buffer = dict([])
+        self._clear_buffer()
+
     def _create_data_arrays(self, where: Union[Node, str], data: DataWithAxes, save_axes=True,
                             add_enl_axes=True):
         """ Create enlargeable array to store data
@@ -579,6 +878,7 @@ class DataEnlargeableSaver(DataSaverLoader):
                                         array_type=data[ind_data].dtype,
                                         enlargeable=True,
                                         data_dimension=data.dim.name,
+                                        chunk_hint='write_signal',
                                         metadata=dict(timestamp=data.timestamp,
                                                       label=data.labels[ind_data],
                                                       source=data.source.name,
@@ -600,7 +900,7 @@ class DataEnlargeableSaver(DataSaverLoader):
                     self._axis_saver.add_axis(where, axis)
 
     def add_data(self, where: Union[Node, str], data: DataWithAxes,
-                 axis_values: Iterable[float] = None):
+                 axis_values: Iterable[float] = None, copy: bool = None):
         """ Append data to an enlargeable array node
 
         Data of dim (0, 1 or 2) will be just appended to the enlargeable array.
@@ -616,8 +916,9 @@ class DataEnlargeableSaver(DataSaverLoader):
         axis_values: optional, list of floats
             the new spread axis values added to the data
             if None the axes are not added to the h5 file
-
-
+        copy: bool or None
+            If True, the data arrays are copied before being buffered (the caller could modify them
+            before they are written). If None, they are copied only if buffering (buffer_size != 1)
         """
         add_enl_axes = axis_values is not None
 
@@ -628,14 +929,15 @@ class DataEnlargeableSaver(DataSaverLoader):
                 raise DataDimError('It is not possible to append DataND')
             self._create_data_arrays(where, data_init, save_axes=True, add_enl_axes=add_enl_axes)
 
-        for ind_data in range(len(data)):
-            array: EARRAY = self.get_node_from_index(where, ind_data)
-            array.append(data[ind_data])
-        if add_enl_axes and axis_values is not None:
-            for ind_axis in range(self._n_enl_axes):
-                axis_array: EARRAY = self._axis_saver.get_node_from_index(where, ind_axis)
-                axis_array.append(np.array([axis_values[ind_axis]]))
-                axis_array.attrs['size'] += 1
+        if copy is None:
+            copy = self.buffer_size != 1
+        if copy:  # data could be modified by the caller before being written
+            arrays = [np.array(data[ind_data]) for ind_data in range(len(data))]
+        else:
+            arrays = [data[ind_data] for ind_data in range(len(data))]
+        self._buffer.setdefault(self._get_node(where).path, []).append(
+            (arrays, list(axis_values) if add_enl_axes else None))
+        self._add_to_buffer()
 
 
 class DataExtendedSaver(DataSaverLoader):
@@ -686,6 +988,7 @@ class DataExtendedSaver(DataSaverLoader):
                                         scan_shape=self.extended_shape,
                                         add_scan_dim=True,
                                         data_dimension=data.dim.name,
+                                        chunk_hint='write_signal',
                                         metadata=dict(timestamp=data.timestamp, label=data.labels[ind_data],
                                                       source=data.source.name, distribution=distribution.name,
                                                       origin=data.origin,
@@ -821,7 +1124,7 @@ class DataToExportSaver:
                     self._bkg_saver.add_data(dwa_group, dwa, save_axes=False)
 
 
-class DataToExportEnlargeableSaver(DataToExportSaver):
+class DataToExportEnlargeableSaver(BufferedSaverMixin, DataToExportSaver):
     """Generic object to save DataToExport objects in an enlargeable h5 array
 
     The next enlarged value should be specified in the add_data method
@@ -837,11 +1140,29 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
         the name of the enlarged axis array
     axis_units: str, deprecated use enl_axis_units
         the units of the enlarged axis array
+    buffer_size: int or None
+        The number of added DataToExport kept in memory before being written in a single append to
+        the enlargeable arrays. Default 1: no buffering. If None, the number of buffered data is
+        not limited
+    buffer_time: float or None
+        The maximum time (in s) the buffered data are kept in memory. It is checked when new data
+        are added. Default None: no time limit
+
+    Notes
+    -----
+    When buffering, the data only appear in the file once flushed, see the flush method and
+    BufferedSaverMixin. It is called when closing the file, from this object or from the h5saver
+
+    See Also
+    --------
+    DataEnlargeableSaver
     """
     def __init__(self, h5saver: H5SaverLowLevel,
                  enl_axis_names: Iterable[str] = None,
                  enl_axis_units: Iterable[str] = None,
-                 axis_name: str = 'nav axis', axis_units: str = ''):
+                 axis_name: str = 'nav axis', axis_units: str = '',
+                 buffer_size: Union[int, None] = 1,
+                 buffer_time: float = None):
 
         super().__init__(h5saver)
         if enl_axis_names is None:  # for backcompatibility
@@ -856,9 +1177,29 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
         self._enl_axis_units = enl_axis_units
         self._n_enl = len(enl_axis_names)
 
-        self._data_saver = DataEnlargeableSaver(h5saver)
+        # the buffer of the data saver is flushed from here to keep data and nav axes in sync
+        self._data_saver = DataEnlargeableSaver(h5saver, buffer_size=None)
         self._nav_axis_saver = AxisSaverLoader(h5saver)
 
+        self._nav_buffer: Dict[str, List[List[np.ndarray]]] = dict([])
+        self._init_buffer(self._h5saver, buffer_size, buffer_time)
+
+    def flush(self):
+        """ Write all the buffered data and navigation axis values into their enlargeable arrays
+
+        See Also
+        --------
+        DataEnlargeableSaver.flush
+        """
+        self._data_saver.flush()
+        for nav_group, buffered in self._nav_buffer.items():
+            for ind in range(self._n_enl):
+                axis_array: EARRAY = self._nav_axis_saver.get_node_from_index(nav_group, ind)
+                axis_array.append_frames([values[ind] for values in buffered], expand=False)
+                axis_array.attrs['size'] += len(buffered)
+        self._nav_buffer = dict([])
+        self._clear_buffer()
+
     def add_data(self, where: Union[Node, str], data: DataToExport,
                  axis_values: List[Union[float, np.ndarray]] = None,
                  axis_value: Union[float, np.ndarray] = None,
@@ -885,7 +1226,9 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
         if axis_values is None and axis_value is not None:
             axis_values = [axis_value]
 
-        super().add_data(where, data, settings_as_xml, metadata)
+        # the data are only copied if kept in the buffer after this call
+        copy = self.buffer_size is None or self._buffer_length + 1 < self.buffer_size
+        super().add_data(where, data, settings_as_xml, metadata, copy=copy)
         # a parent navigation group (same for all data nodes)
 
         where = self._get_node(where)
@@ -898,11 +1241,9 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
                 axis_array = self._nav_axis_saver.add_axis(nav_group, axis, enlargeable=True)
                 axis_array.attrs['size'] = 0
 
-        for ind in range(self._n_enl):
-            axis_array: EARRAY = self._nav_axis_saver.get_node_from_index(nav_group, ind)
-            axis_array.append(squeeze(np.array([axis_values[ind]])),
-                              expand=False)
-            axis_array.attrs['size'] += 1
+        self._nav_buffer.setdefault(nav_group.path, []).append(
+            [squeeze(np.array([axis_values[ind]])) for ind in range(self._n_enl)])
+        self._add_to_buffer()
 
 
 class DataToExportTimedSaver(DataToExportEnlargeableSaver):
@@ -915,8 +1256,10 @@ class DataToExportTimedSaver(DataToExportEnlargeableSaver):
     -----
     This object is made for continuous saving mode of DAQViewer and logging to h5file for DAQLogger
     """
-    def __init__(self, h5saver: H5SaverLowLevel):
-        super().__init__(h5saver, enl_axis_names=('time',), enl_axis_units=('s',))
+    def __init__(self, h5saver: H5SaverLowLevel, buffer_size: Union[int, None] = 1,
+                 buffer_time: float = None):
+        super().__init__(h5saver, enl_axis_names=('time',), enl_axis_units=('s',),
+                         buffer_size=buffer_size, buffer_time=buffer_time)
 
     def add_data(self, where: Union[Node, str], data: DataToExport, settings_as_xml='',
                  metadata=None, **kwargs):
@@ -984,6 +1327,199 @@ class DataToExportExtendedSaver(DataToExportSaver):
                                           distribution=distribution)
 
 
+class DataToExportAsyncSaver:
+    """Save DataToExport objects from a dedicated writer thread using one of the DataToExport savers
+
+    All calls to the wrapped saver (add_data, add_bkg, add_error...) are queued as snapshots of
+    the data and executed in order by the writer thread, so that the caller is not blocked by
+    the hdf5 file I/O (compression, disk flushes...). Once wrapped, the saver and its
+    H5SaverLowLevel (file handle) should only be used through this object.
+
+    Parameters
+    ----------
+    saver: DataToExportSaver
+        any of the DataToExport savers (enlargeable, timed, extended...)
+    queue_size: int
+        the maximum number of pending operations
+    policy: QueueFullPolicy or str
+        what to do when the queue is full: block, drop_oldest or error
+    copy: bool
+        if True (default), a deepcopy of the DataToExport is queued so that the caller can modify
+        its data right after the call
+
+    Examples
+    --------
+    >>> with DataToExportAsyncSaver(DataToExportTimedSaver(h5saver), policy='drop_oldest') as saver:
+    ...     saver.add_data('/RawData/MyDet', dte)
+    """
+    _stop = object()
+
+    def __init__(self, saver: DataToExportSaver, queue_size: int = 100,
+                 policy: Union[QueueFullPolicy, str] = 'block', copy=True):
+        self._saver = saver
+        self.policy = enum_checker(QueueFullPolicy, policy)
+        self._copy = copy
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._errors: List[Exception] = []
+        self._close_error: Exception = None
+
+        self._n_written = 0
+        self._n_dropped = 0
+        self._max_queue_depth = 0
+        self._latency_sum = 0.
+        self._latency_max = 0.
+        self._latency_last = 0.
+
+        self._thread = threading.Thread(target=self._write_loop, name='DataToExportAsyncSaver',
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def saver(self) -> DataToExportSaver:
+        return self._saver
+
+    @property
+    def queue_depth(self) -> int:
+        """ Get the number of operations waiting to be processed by the writer thread"""
+        return self._queue.qsize()
+
+    @property
+    def errors(self) -> List[Exception]:
+        """ Get the exceptions raised in the writer thread"""
+        return self._errors[:]
+
+    @property
+    def stats(self) -> dict:
+        """ Get the queue and write latency statistics (latencies in s, from call to written)"""
+        return dict(queue_depth=self.queue_depth,
+                    max_queue_depth=self._max_queue_depth,
+                    written=self._n_written,
+                    dropped=self._n_dropped,
+                    latency_last=self._latency_last,
+                    latency_max=self._latency_max,
+                    latency_mean=self._latency_sum / self._n_written if self._n_written > 0
+                    else 0.)
+
+    def isopen(self) -> bool:
+        return not self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add_data(self, where: Union[Node, str], data: DataToExport, *args, **kwargs):
+        """ Queue data to be saved using the add_data method of the wrapped saver
+
+        See Also
+        --------
+        DataToExportSaver.add_data
+        """
+        self.submit('add_data', where, data, *args, **kwargs)
+
+    def add_bkg(self, where: Union[Node, str], data: DataToExport):
+        self.submit('add_bkg', where, data)
+
+    def add_error(self, where: Union[Node, str], data: DataToExport):
+        self.submit('add_error', where, data)
+
+    def submit(self, method: str, where: Union[Node, str], data: DataToExport = None,
+               *args, **kwargs):
+        """ Queue the call of a given method of the wrapped saver
+
+        Parameters
+        ----------
+        method: str
+            the name of the saver method to be called from the writer thread
+        where: Union[Node, str]
+            the path of a given node or the node itself
+        data: DataToExport
+            the data passed to the method (copied if the copy attribute is True)
+        args, kwargs:
+            extra arguments passed to the method
+        """
+        if self._closed:
+            raise ValueError('Cannot save data, the asynchronous saver has been closed')
+        if isinstance(where, Node):
+            where = where.path
+        if data is not None and self._copy:
+            data = data.deepcopy()
+        item = (method, where, data, args, kwargs, perf_counter())
+
+        if self.policy == QueueFullPolicy.block:
+            self._queue.put(item)
+        elif self.policy == QueueFullPolicy.drop_oldest:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self._queue.task_done()
+                        self._n_dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                raise SaverQueueFull(f'The saving queue is full ({self._queue.maxsize} items)')
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is self._stop:
+                try:
+                    self._saver.close_file()
+                except Exception as e:
+                    logger.exception(str(e))
+                    self._errors.append(e)
+                    self._close_error = e
+                finally:
+                    self._queue.task_done()
+                break
+            try:
+                method, where, data, args, kwargs, t_start = item
+                if data is None:
+                    getattr(self._saver, method)(where, *args, **kwargs)
+                else:
+                    getattr(self._saver, method)(where, data, *args, **kwargs)
+                latency = perf_counter() - t_start
+                self._n_written += 1
+                self._latency_sum += latency
+                self._latency_max = max(self._latency_max, latency)
+                self._latency_last = latency
+            except Exception as e:
+                logger.exception(str(e))
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """ Wait for all the queued operations to be written"""
+        self._queue.join()
+
+    def close(self):
+        """ Write all the queued operations then close the file from the writer thread
+
+        Raises the exception raised by the writer thread when closing the file, if any
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._stop)
+        self._thread.join()
+        if self._close_error is not None:
+            raise self._close_error
+
+    def close_file(self):
+        self.close()
+
+
 class DataLoader:
     """Specialized Object to load DataWithAxes object from a h5file
 
@@ -1053,11 +1589,14 @@ class DataLoader:
         node = self._h5saver.get_node(where)
         while node is not None:  # means we reached the root level
             if isinstance(node, GROUP):
-                if self._h5saver.is_node_in_group(node, SPECIAL_GROUP_NAMES['nav_axes']):
-                    return self._h5saver.get_node(node, SPECIAL_GROUP_NAMES['nav_axes'])
+                nav_path = f"{node.path.rstrip('/')}/{SPECIAL_GROUP_NAMES['nav_axes']}"
+                if self._h5saver.has_node(nav_path):
+                    return self._h5saver.get_node(nav_path)
             node = node.parent_node
 
-    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False,
+                  lazy=False, nav=None, sig=None, step: Union[int, Tuple[int]] = None,
+                  reuse_buffers=False, out: List[np.ndarray] = None) -> DataWithAxes:
         """Load data from a node (or channel node)
 
         Loaded data contains also nav_axes if any and with optional background subtraction
@@ -1070,14 +1609,37 @@ class DataLoader:
             If True will attempt to substract a background data node before loading
         load_all: bool
             If True, will load all data hanging from the same parent node
+        lazy: bool
+            If True, data are only read from the file when sliced or used in computations, see
+            DataSaverLoader.load_data
+        nav: int, slice or tuple of those
+            If not None, only load this selection of the navigation dimensions, for instance a
+            single scan point
+        sig: int, slice or tuple of those
+            If not None, only load this selection of the signal dimensions
+        step: int or tuple of int
+            If not None, decimation step of the loaded dimensions, for instance for a preview
+        reuse_buffers: bool
+            If True, the data are read (and background subtracted) into buffers reused from one
+            call to the next, avoiding allocations when repeatedly loading nodes of the same
+            shape. The data of the previous call are then overwritten, see
+            DataSaverLoader.load_data
+        out: list of ndarray or None
+            If not None, preallocated arrays (one per data node, of the node shape and dtype) the
+            data are directly read into, see DataSaverLoader.load_data. Not used if lazy or if a
+            selection is given
 
         Returns
         -------
-
+        DataWithAxes: if a selection is given (nav, sig or step), only the selected hyperslab
+        is read from the file, see select_data
         """
         node_data_type = DataType[self._h5saver.get_node(where).attrs['data_type']]
         self._data_loader.data_type = node_data_type
-        data = self._data_loader.load_data(where, with_bkg=with_bkg, load_all=load_all)
+        is_selection = nav is not None or sig is not None or step is not None
+        data = self._data_loader.load_data(where, with_bkg=with_bkg, load_all=load_all,
+                                           lazy=lazy or is_selection,
+                                           reuse_buffers=reuse_buffers, out=out)
         if 'axis' not in node_data_type.name:
             nav_group = self.get_nav_group(where)
             if nav_group is not None:
@@ -1087,6 +1649,8 @@ class DataLoader:
                 data.axes = axes
                 data.get_dim_from_data_axes()
         data.create_missing_axes()
+        if is_selection:
+            data = select_data(data, nav, sig, step)
         return data
 
     def load_all(self, where: GROUP, data: DataToExport, with_bkg=False) -> DataToExport:
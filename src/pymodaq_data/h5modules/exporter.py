@@ -6,6 +6,7 @@ Created the 02/03/2023
 """
 # Standard imports
 from abc import ABCMeta, abstractmethod
+from importlib import import_module
 from typing import Callable
 
 # 3rd party imports
@@ -13,10 +14,21 @@ import numpy as np
 
 # project imports
 from pymodaq_data.h5modules.backends import H5Backend, Node
+from pymodaq_data.h5modules.utils import register_exporters
 from pymodaq_utils.logger import set_logger, get_module_name
 
 logger = set_logger(get_module_name(__file__))
 
+# static manifest of the builtin exporters: {extension: {format description: module}}. The modules are only
+# imported (hence their exporters registered) when the corresponding exporter is first requested
+EXPORTERS_MANIFEST = {
+    'h5': {'Single node h5 file': 'pymodaq_data.h5modules.exporters.base'},
+    'txt': {'Text files': 'pymodaq_data.h5modules.exporters.base'},
+    'npy': {'Binary NumPy format': 'pymodaq_data.h5modules.exporters.base'},
+    'ascii': {'Ascii flimj file': 'pymodaq_data.h5modules.exporters.flimj'},
+    'hspy': {'Hyperspy file format': 'pymodaq_data.h5modules.exporters.hyperspy'},
+}
+
 
 class H5Exporter(metaclass=ABCMeta):
     """Base class for an exporter. """
@@ -46,11 +58,31 @@ class H5Exporter(metaclass=ABCMeta):
         pass
 
 
+class ExportersRegistry:
+    """Descriptor giving the registered exporters of ExporterFactory (from the class or an instance) as
+    {extension: {format description: exporter class}}
+
+    All the exporters (including the ones of plugins) are registered on first access
+    """
+
+    def __get__(self, obj, cls) -> dict:
+        cls.load_exporters()
+        return cls._exporters_registry
+
+
 class ExporterFactory:
-    """The factory class for creating executors"""
+    """The factory class for creating executors
 
-    exporters_registry = {}
+    Exporters are registered lazily: the module of a builtin exporter (see EXPORTERS_MANIFEST) is imported
+    when the exporter is first requested, all the exporters (including the ones of plugins) being loaded when
+    the requested one is not in the manifest, when all the file filters are requested or when the
+    exporters_registry attribute is accessed.
+    """
+
+    _exporters_registry = {}
+    exporters_registry = ExportersRegistry()
     file_filters = {}
+    _all_loaded = False
 
     @classmethod
     def register_exporter(cls) -> Callable:
@@ -66,10 +98,10 @@ class ExporterFactory:
             extension = wrapped_class.FORMAT_EXTENSION
             format_desc = wrapped_class.FORMAT_DESCRIPTION
 
-            if extension not in cls.exporters_registry:
-                cls.exporters_registry[extension] = {}
-            if filter not in cls.exporters_registry[extension]:
-                cls.exporters_registry[extension][format_desc] = wrapped_class
+            if extension not in cls._exporters_registry:
+                cls._exporters_registry[extension] = {}
+            if filter not in cls._exporters_registry[extension]:
+                cls._exporters_registry[extension][format_desc] = wrapped_class
 
             # Return wrapped_class
             return wrapped_class
@@ -92,19 +124,43 @@ class ExporterFactory:
         -------
         an instance of the executor created
         """
-        if extension not in cls.exporters_registry:
+        if filter not in cls._exporters_registry.get(extension, {}):
+            cls.load_exporter(extension, filter)
+        if extension not in cls._exporters_registry:
             raise ValueError(f".{extension} is not a supported file format.")
-        elif filter not in cls.exporters_registry[extension]:
+        elif filter not in cls._exporters_registry[extension]:
             raise ValueError(f".{filter} is not a supported file description.")
 
-        return cls.exporters_registry[extension][filter]()
+        return cls._exporters_registry[extension][filter]()
+
+    @classmethod
+    def load_exporter(cls, extension: str, filter: str = None):
+        """Register the exporter(s) of a given extension (and filter) from the manifest, or all of them if
+        not in the manifest"""
+        modules = [module for format_desc, module in EXPORTERS_MANIFEST.get(extension, {}).items()
+                   if filter is None or format_desc == filter]
+        for module in modules:
+            try:
+                import_module(module)
+            except ImportError as e:  # an optional dependency of the exporter is missing
+                logger.warning(str(e))
+        if filter not in cls._exporters_registry.get(extension, {}):
+            cls.load_exporters()
+
+    @classmethod
+    def load_exporters(cls):
+        """Register all the builtin and plugins exporters (done once)"""
+        if not cls._all_loaded:
+            register_exporters()
+            cls._all_loaded = True
 
     @classmethod
     def get_file_filters(cls):
         """Create the file filters string"""
+        cls.load_exporters()
         tmp_list = []
-        for extension in cls.exporters_registry:
-            for format_desc in cls.exporters_registry[extension]:
+        for extension in cls._exporters_registry:
+            for format_desc in cls._exporters_registry[extension]:
                 tmp_list.append(f"{format_desc} (*.{extension})")
         return ";;".join(tmp_list)
 
@@ -10,7 +10,8 @@ from dateutil import parser
 from numbers import Number
 import os
 from pathlib import Path
-from typing import Union, Iterable
+from typing import Callable, List, Union, Iterable
+import weakref
 
 
 import numpy as np
@@ -26,7 +27,7 @@ from pymodaq_utils.warnings import deprecation_msg
 
 from .backends import (H5Backend, backends_available, SaveType, InvalidSave, InvalidExport,
                        Node, GroupType, InvalidDataDimension, InvalidScanType,
-                       GROUP, VLARRAY)
+                       GROUP, VLARRAY, node_counters)
 from . import browsing
 
 
@@ -52,6 +53,80 @@ class DataType(BaseEnum):
     error = 'ErrorBar'
 
 
+class ChunkHint(BaseEnum):
+    """Expected access pattern of an array used to plan its chunk shape
+
+    * auto: let the hdf5 backend decide
+    * write_signal: data are written (and read) one signal at a time for each navigation index
+      (scan point or enlargeable index)
+    * read_nav: data are mostly read as whole navigation slices for a given signal index
+    """
+    auto = 0
+    write_signal = 1
+    read_nav = 2
+
+
+CHUNK_MAX_BYTES = 1024 ** 2  # upper bound of the planned chunk size
+CHUNK_MIN_BYTES = 16 * 1024  # lower bound of the planned chunk size (if the array is large enough)
+CHUNK_MAX_ROWS = 1024  # upper bound of the planned chunk length along an enlargeable dimension
+
+
+def plan_chunkshape(shape: Iterable[int], nav_ndim: int, itemsize: int,
+                    hint: ChunkHint = 'auto', enlargeable=False,
+                    max_bytes: int = CHUNK_MAX_BYTES) -> Union[tuple, None]:
+    """Compute a chunk shape aligned on the expected access pattern of an array
+
+    Parameters
+    ----------
+    shape: Iterable[int]
+        the shape of the array (the first dimension is ignored if enlargeable)
+    nav_ndim: int
+        the number of leading navigation dimensions in shape (the other ones being the signal)
+    itemsize: int
+        the size in bytes of one element of the array
+    hint: ChunkHint
+        the expected access pattern
+    enlargeable: bool
+        if True, the first dimension is the enlargeable one
+    max_bytes: int
+        upper bound of the chunk size in bytes
+
+    Returns
+    -------
+    tuple or None: the chunk shape, None to let the backend decide
+    """
+    hint = enum_checker(ChunkHint, hint)
+    if hint == ChunkHint['auto']:
+        return None
+    shape = [max(1, int(dim)) for dim in shape]
+    if enlargeable:
+        shape[0] = CHUNK_MAX_ROWS
+
+    if hint == ChunkHint['write_signal']:
+        chunk = [1 for _ in range(nav_ndim)] + shape[nav_ndim:]
+        aligned = list(range(nav_ndim, len(chunk)))
+    else:
+        chunk = shape[:nav_ndim] + [1 for _ in range(len(shape) - nav_ndim)]
+        aligned = list(range(nav_ndim))
+
+    # shrink the dimensions aligned on the access pattern if the chunk is too large
+    while int(np.prod(chunk)) * itemsize > max_bytes:
+        ind_max = max(aligned, key=lambda ind: chunk[ind], default=None)
+        if ind_max is None or chunk[ind_max] == 1:
+            break
+        chunk[ind_max] = int(np.ceil(chunk[ind_max] / 2))
+
+    # grow the other ones, starting with the fastest varying, if the chunk is too small
+    if enlargeable and 0 not in aligned:
+        chunk[0] = 1  # several signals per chunk along the enlargeable dimension, see below
+    for ind in reversed([ind for ind in range(len(chunk)) if ind not in aligned]):
+        chunk_bytes = int(np.prod(chunk)) * itemsize
+        if chunk_bytes >= CHUNK_MIN_BYTES:
+            break
+        chunk[ind] = int(min(shape[ind], np.ceil(CHUNK_MIN_BYTES / chunk_bytes)))
+    return tuple(chunk)
+
+
 class H5SaverLowLevel(H5Backend):
     """Object containing basic methods in order to structure and interact with a h5file compatible
     with the h5browser
@@ -66,10 +141,12 @@ class H5SaverLowLevel(H5Backend):
         object used to save all datas and metadas
     h5_file_path: str or Path
         The file path
+    use_index: bool
+        If True, the nodes of the file are indexed and the index saved in the file, see H5Backend
     """
 
-    def __init__(self, save_type: SaveType = 'scan', backend='tables'):
-        H5Backend.__init__(self, backend)
+    def __init__(self, save_type: SaveType = 'scan', backend='tables', use_index: bool = None):
+        H5Backend.__init__(self, backend, use_index=use_index)
 
         self.save_type = enum_checker(SaveType, save_type)
 
@@ -80,6 +157,7 @@ class H5SaverLowLevel(H5Backend):
         self._current_group = None
         self._raw_group: Union[GROUP, str] = '/RawData'
         self._logger_array = None
+        self._close_hooks: List[weakref.WeakMethod] = []
 
     @property
     def raw_group(self):
@@ -89,6 +167,25 @@ class H5SaverLowLevel(H5Backend):
     def h5_file(self):
         return self._h5file
 
+    def add_close_hook(self, hook: Callable):
+        """Register a bound method called before the file is closed, for instance to write buffered data
+
+        Only a weak reference to the method is kept so that its object can be garbage collected
+        """
+        self._close_hooks.append(weakref.WeakMethod(hook))
+
+    def close_file(self):
+        """Call the hooks registered with add_close_hook then flush data and close the h5file"""
+        try:
+            if self.isopen():
+                self._close_hooks = [ref for ref in self._close_hooks if ref() is not None]
+                for ref in self._close_hooks:
+                    hook = ref()
+                    if hook is not None:
+                        hook()
+        finally:
+            super().close_file()
+
     def init_file(self, file_name: Path, raw_group_name='RawData', new_file=False,
                   metadata: dict = None):
         """Initializes a new h5 file.
@@ -134,8 +231,7 @@ class H5SaverLowLevel(H5Backend):
             self.set_attr(self.root(), 'time', datetime_now.time().isoformat())
 
             if metadata is not None:
-                for metadata_key in metadata:
-                    self._raw_group.attrs[metadata_key] = metadata[metadata_key]
+                self._raw_group.attrs.update(metadata)
 
     def save_file(self, filename=None):
         if isinstance(filename, str) or isinstance(filename, Path) and filename != '':
@@ -174,17 +270,16 @@ class H5SaverLowLevel(H5Backend):
 
     def add_string_array(self, where, name, title='', metadata=dict([])):
         array = self.create_vlarray(where, name, dtype='string', title=title)
-        array.attrs['shape'] = (0,)
-        array.attrs['data_type'] = 'strings'
-
-        for metadat in metadata:
-            array.attrs[metadat] = metadata[metadat]
+        attributes = dict(shape=(0,), data_type='strings')
+        attributes.update(metadata)
+        array.attrs.update(attributes)
+        self._increment_node_counter(array, 'strings')
         return array
     
     def add_array(self, where: Union[GROUP, str], name: str, data_type: DataType, array_to_save: np.ndarray = None,
                   data_shape: tuple = None, array_type: np.dtype = None, data_dimension: DataDim = None,
                   scan_shape: tuple = tuple([]), add_scan_dim=False, enlargeable: bool = False,
-                  title: str = '', metadata=dict([]), ):
+                  title: str = '', metadata=dict([]), chunk_hint: ChunkHint = 'auto'):
 
         """save data arrays on the hdf5 file together with metadata
         Parameters
@@ -214,6 +309,9 @@ class H5SaverLowLevel(H5Backend):
             dictionnary whose keys will be saved as the array attributes
         add_scan_dim: if True, the scan axes dimension (scan_shape iterable) is prepended to the array shape on the hdf5
                       In that case, the array is usually initialized as zero and further populated
+        chunk_hint: ChunkHint
+            the expected access pattern of the array used to plan its chunk shape, see plan_chunkshape.
+            The chunk shape in the file (if chunked) is saved as the chunkshape attribute
 
         Returns
         -------
@@ -235,8 +333,11 @@ class H5SaverLowLevel(H5Backend):
         if enlargeable:
             # if data_shape == (1,):
             #     data_shape = None
+            shape = [0] + list(data_shape if data_shape is not None else [])
+            chunkshape = plan_chunkshape(shape, 1, np.dtype(array_type).itemsize, chunk_hint,
+                                         enlargeable=True)
             array = self.create_earray(where, utils.capitalize(name), dtype=np.dtype(array_type),
-                                       data_shape=data_shape, title=title)
+                                       data_shape=data_shape, title=title, chunkshape=chunkshape)
         else:
             if add_scan_dim:  # means it is an array initialization to zero
                 shape = list(scan_shape[:])
@@ -245,14 +346,27 @@ class H5SaverLowLevel(H5Backend):
                 if array_to_save is None:
                     array_to_save = np.zeros(shape, dtype=np.dtype(array_type))
 
-            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title)
-        self.set_attr(array, 'data_type', data_type.name)
-        self.set_attr(array, 'data_dimension', data_dimension.name)
-
-        for metadat in metadata:
-            self.set_attr(array, metadat, metadata[metadat])
+            chunkshape = plan_chunkshape(array_to_save.shape, len(scan_shape) if add_scan_dim else 0,
+                                         array_to_save.dtype.itemsize, chunk_hint)
+            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title,
+                                       chunkshape=chunkshape)
+        attributes = dict(data_type=data_type.name, data_dimension=data_dimension.name)
+        if array.chunkshape is not None:  # None for contiguous arrays
+            attributes['chunkshape'] = array.chunkshape
+        attributes.update(metadata)
+        array.attrs.update(attributes)
+        self._increment_node_counter(array, data_type.name)
         return array
 
+    def _increment_node_counter(self, array: Node, data_type: str):
+        """Keep the cached data_type counts of the parent groups in sync with a newly created array
+
+        See Also
+        --------
+        H5Backend.count_data_type_nodes
+        """
+        node_counters.increment(self.filename, array.path.rsplit('/', 1)[0] or '/', data_type)
+
     def get_set_group(self, where, name, title=''):
         """Get the group located at where if it exists otherwise creates it
 
@@ -279,9 +393,9 @@ class H5SaverLowLevel(H5Backend):
 
     def get_node_from_attribute_match(self, where, attr_name, attr_value):
         """Get a Node starting from a given node (Group) matching a pair of node attribute name and value"""
-        for node in self.walk_nodes(where):
-            if attr_name in node.attrs and node.attrs[attr_name] == attr_value:
-                return node
+        nodes = self.find_nodes(where, **{attr_name: attr_value})
+        if len(nodes) != 0:
+            return nodes[0]
 
     def get_node_from_title(self, where, title: str):
         """Get a Node starting from a given node (Group) matching the given title"""
@@ -1,9 +1,11 @@
-from typing import Union, List, TYPE_CHECKING, Iterable, Optional, Callable
+from functools import lru_cache
+from typing import Union, List, TYPE_CHECKING, Iterable, Optional, Callable, Tuple
 import numbers
+import warnings
 
 import numpy as np
 from pint.facets.numpy.numpy_func import HANDLED_UFUNCS  # imported by the data module
-from pymodaq_data import Q_
+from pymodaq_data import Q_, Unit
 from pymodaq_data import data as data_mod
 
 if TYPE_CHECKING:
@@ -11,15 +13,109 @@ if TYPE_CHECKING:
 
 HANDLED_FUNCTIONS = {}
 
+# How the units of the operands of a ufunc should be related for its result units to be known
+# from the operand units only and without any conversion of the magnitudes:
+# same: all operands have the same units
+# dimensionless: all operands are dimensionless
+# any: no restriction
+UFUNC_UNIT_RULES = dict(
+    add='same', subtract='same', maximum='same', minimum='same', fmax='same', fmin='same',
+    negative='same', positive='same', absolute='same', fabs='same', conjugate='same',
+    rint='same', floor='same', ceil='same', trunc='same',
+    equal='same', not_equal='same', greater='same', greater_equal='same', less='same',
+    less_equal='same',
+    multiply='any', divide='any', true_divide='any', sqrt='any', square='any', reciprocal='any',
+    exp='dimensionless', expm1='dimensionless', log='dimensionless', log2='dimensionless',
+    log10='dimensionless', log1p='dimensionless', sin='dimensionless', cos='dimensionless',
+    tan='dimensionless', arcsin='dimensionless', arccos='dimensionless', arctan='dimensionless',
+    sinh='dimensionless', cosh='dimensionless', tanh='dimensionless',
+)
+
+
+def process_units_for_ufuncs(inputs: List[Union[numbers.Number, Q_, np.ndarray, 'DataBase']]
+                             ) -> Union[Tuple[Union[str, None]], None]:
+    """ Get the units of the operands of a numpy operation
+
+    Returns
+    -------
+    tuple of str or None: the units of each operand (None for numbers and ndarrays) or None if one
+        of the operand is of an unsupported type
+    """
+    units = []
+    for elt in inputs:
+        if isinstance(elt, (numbers.Number, np.ndarray)):
+            units.append(None)
+        elif isinstance(elt, Q_):
+            units.append(str(elt.units))
+        elif isinstance(elt, data_mod.DataBase):
+            units.append(elt.units)
+        else:
+            return None
+    return tuple(units)
+
+
+@lru_cache(maxsize=None)
+def _get_ufunc_result_units(ufunc_name: str, units: Tuple[Union[str, None]]
+                            ) -> Tuple[bool, Union[str, None]]:
+    rule = UFUNC_UNIT_RULES.get(ufunc_name, None)
+    if rule is None:
+        return False, None
+    operand_units = [Unit('') if unit is None else Unit(unit) for unit in units]
+    if rule == 'same' and not all([unit == operand_units[0] for unit in operand_units]):
+        return False, None
+    if rule == 'dimensionless' and not all([unit == Unit('') for unit in operand_units]):
+        return False, None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            result = HANDLED_UFUNCS[ufunc_name](*[1. if unit is None else Q_(1., unit)
+                                                  for unit in units])
+    except Exception:
+        return False, None
+    if not isinstance(result, Q_):
+        return True, None
+    reduced = result.to_reduced_units()
+    if reduced.units != result.units:  # the magnitudes would have to be converted
+        return False, None
+    return True, str(reduced.units)
+
+
+def get_ufunc_result_units(ufunc_name: str,
+                           inputs: List[Union[numbers.Number, Q_, np.ndarray, 'DataBase']]
+                           ) -> Tuple[bool, Union[str, None]]:
+    """ Get the units a ufunc would produce when applied to the given operands
+
+    The result is computed once for a given ufunc and given operand units and then cached.
+
+    Parameters
+    ----------
+    ufunc_name: str
+    inputs: list of elts in a numpy operation, could be numbers, quantities, ndarray, or 'DataBase'
+
+    Returns
+    -------
+    bool: True if the ufunc can be applied directly on the magnitudes of the operands, the result
+        being the same as the one obtained through pint
+    str or None: the units of the result, None if the ufunc doesn't return a quantity (the units
+        are then unchanged)
+    """
+    units = process_units_for_ufuncs(inputs)
+    if units is None:
+        return False, None
+    return _get_ufunc_result_units(ufunc_name, units)
+
 
 def process_arguments_for_ufuncs(input: 'DataBase',
-                      inputs: List[Union[numbers.Number, Q_, np.ndarray, 'DataBase']]):
+                      inputs: List[Union[numbers.Number, Q_, np.ndarray, 'DataBase']],
+                                 with_units=True):
     """
 
     Parameters
     ----------
     input: 'DataBase'
     inputs: list of elts in a numpy operation, could be numbers, quantities, ndarray, or 'DataBase'
+    with_units: bool
+        if False, the magnitudes of the quantities and data objects are returned instead
 
     Returns
     -------
@@ -30,6 +126,7 @@ def process_arguments_for_ufuncs(input: 'DataBase',
         if isinstance(elt, numbers.Number):
             elts.append([elt for _ in range(input.length)])
         elif isinstance(elt, Q_):  # take its magnitude
+            elt = elt if with_units else elt.magnitude
             elts.append([elt for _ in range(input.length)])
         elif isinstance(elt, np.ndarray):
             if elt.size != input.size:
@@ -37,12 +134,56 @@ def process_arguments_for_ufuncs(input: 'DataBase',
             elts.append([elt for _ in range(input.length)])
         else:
             try:
-                elts.append([Q_(array, elt.units) for array in elt.data])
+                if with_units:
+                    elts.append([Q_(array, elt.units) for array in elt.data])
+                else:
+                    elts.append(list(elt.data))
             except:
                 return NotImplementedError
     return elts
 
 
+def process_stacked_arguments_for_ufuncs(input: 'DataBase',
+                                         inputs: List[Union[numbers.Number, Q_, np.ndarray,
+                                                            'DataBase']],
+                                         with_units=True):
+    """ Same as process_arguments_for_ufuncs but for data objects in contiguous mode
+
+    Parameters
+    ----------
+    input: 'DataBase'
+    inputs: list of elts in a numpy operation, could be numbers, quantities, ndarray, or 'DataBase'
+    with_units: bool
+        if False, the magnitudes of the quantities and data objects are returned instead
+
+    Returns
+    -------
+    list of numbers, quantities or numpy arrays broadcastable against the stacked arrays of input
+    or None if the operation cannot be applied on the stacked arrays
+    """
+    stacked = input.get_stacked()
+    if stacked is None:
+        return None
+    elts = []
+    for elt in inputs:
+        if isinstance(elt, numbers.Number):
+            elts.append(elt)
+        elif isinstance(elt, (Q_, np.ndarray)):
+            if np.ndim(elt) != 0 and np.shape(elt) != input.shape:
+                return None
+            if isinstance(elt, Q_) and not with_units:
+                elt = elt.magnitude
+            elts.append(elt)
+        elif hasattr(elt, 'get_stacked'):
+            elt_stacked = elt.get_stacked()
+            if elt_stacked is None or elt_stacked.shape != stacked.shape:
+                return None
+            elts.append(Q_(elt_stacked, elt.units) if with_units else elt_stacked)
+        else:
+            return None
+    return elts
+
+
 def implements(np_function):
     """Register an __array_function__ implementation for DataWithAxes."""
     def decorator(func):
@@ -63,7 +204,7 @@ def process_with_reduced_dimensions(func: Callable, dwa: 'DataWithAxes',
     else:
         remove_axis = [all_axes[axis_index] for axis_index in axis]
     dwa_func = dwa.deepcopy_with_new_data(
-        data=[np.atleast_1d(func(dwa.data[ind], axis, *args, **kwargs)) for ind in range(len(dwa))],
+        data=dwa._reduce(func, axis, *args, **kwargs),
         remove_axes_index=remove_axis
     )
     dwa_func.name += f'_{func.__name__}'
@@ -17,6 +17,12 @@ from pymodaq_utils.factory import ObjectFactory
 
 logger = set_logger(get_module_name(__file__))
 
+# static manifest of the builtin plotters: {backend: module}. The modules are only imported (hence their
+# plotters registered) when the corresponding backend is first requested
+PLOTTERS_MANIFEST = {
+    'matplotlib': 'pymodaq_data.plotting.plotter.plotters.matplotlib_plotters',
+}
+
 
 def register_plotter(parent_module_name: str = 'pymodaq_data.plotting.plotter'):
     plotters = []
@@ -52,7 +58,14 @@ class PlotterBase(metaclass=ABCMeta):
 
 
 class PlotterFactory(ObjectFactory):
-    """Factory class registering and storing interactive plotter"""
+    """Factory class registering and storing interactive plotter
+
+    Plotters are registered lazily: the module of a builtin plotter (see PLOTTERS_MANIFEST) is imported
+    when its backend is first requested, all the plotter modules being loaded if the backend is not in
+    the manifest or when the list of backends is requested.
+    """
+
+    _all_loaded = False
 
     @classmethod
     def register(cls) -> Callable:
@@ -77,15 +90,37 @@ class PlotterFactory(ObjectFactory):
 
     @classmethod
     def create(cls, key, **kwargs) -> PlotterBase:
-        builder = cls._builders[cls.__name__].get(key)
+        if key not in cls._builders.get(cls.__name__, {}):
+            cls.load_plotter(key)
+        builder = cls._builders.get(cls.__name__, {}).get(key)
         if not builder:
             raise ValueError(key)
         return builder(**kwargs)
 
+    @classmethod
+    def load_plotter(cls, backend: str):
+        """Register the plotter of a given backend from the manifest, or all of them if not in the
+        manifest"""
+        if backend in PLOTTERS_MANIFEST:
+            try:
+                import_module(PLOTTERS_MANIFEST[backend])
+            except ImportError as e:  # an optional dependency of the plotter is missing
+                logger.warning(str(e))
+        if backend not in cls._builders.get(cls.__name__, {}):
+            cls.load_plotters()
+
+    @classmethod
+    def load_plotters(cls):
+        """Register all the builtin plotters (done once)"""
+        if not cls._all_loaded:
+            register_plotter()
+            cls._all_loaded = True
+
     def get(self, backend: str, **kwargs):
         return self.create(backend, **kwargs)
 
     def backends(self) -> List[str]:
         """Returns the list of plotter backends, main identifier of a given plotter"""
-        return sorted(list(self.builders[self.__class__.__name__].keys()))
+        self.load_plotters()
+        return sorted(list(self.builders.get(self.__class__.__name__, {}).keys()))
 
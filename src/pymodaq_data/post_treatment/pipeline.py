@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Declarative chains of operations applied to DataWithAxes, compiled once per data structure
+"""
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+import hashlib
+import numbers
+from time import time
+from typing import Callable, Dict, List, Tuple, Union
+import weakref
+
+import numpy as np
+
+from pymodaq_utils import math_utils as mutils
+from pymodaq_data.data import (DataWithAxes, DataToExport, Axis, StackedArrays, squeeze_stacked)
+from pymodaq_data.post_treatment.process_to_scalar import DataProcessorBase, DataProcessorFactory
+
+
+PIPELINE_REDUCTIONS = dict(mean=np.mean, sum=np.sum, std=np.std, max=np.max, min=np.min)
+
+Kernel = Callable[[np.ndarray], np.ndarray]
+
+
+class PipelineStep(metaclass=ABCMeta):
+    """One operation of a DataPipeline
+
+    A step applies its operation either on a DataWithAxes or, once compiled against the structure of a given
+    DataWithAxes, as a kernel on the (length, *shape) stacked arrays of any data having the same structure.
+    """
+
+    @abstractmethod
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        """Apply the operation using the DataWithAxes API"""
+        ...
+
+    def compile(self, data: DataWithAxes) -> Union[Kernel, None]:
+        """Get the kernel applying the operation on the stacked arrays of data with the same structure as data
+
+        Returns
+        -------
+        Callable or None: None if the step cannot be fused and should be applied through the DataWithAxes API
+        """
+        return None
+
+
+class SliceKernel:
+    """Apply slices computed once to stacked arrays"""
+
+    def __init__(self, total_slices: tuple, do_squeeze: bool):
+        self.stacked_slices = (slice(None),) + tuple(total_slices)
+        self.total_slices = tuple(total_slices)
+        self.do_squeeze = do_squeeze
+
+    def __call__(self, stacked: np.ndarray) -> np.ndarray:
+        return squeeze_stacked(stacked[self.stacked_slices], self.do_squeeze)
+
+    def from_arrays(self, arrays: List[np.ndarray]) -> np.ndarray:
+        """Slice each array before stacking them, avoiding the copy of the whole data"""
+        return squeeze_stacked(np.stack([array[self.total_slices] for array in arrays]), self.do_squeeze)
+
+
+class SliceStep(PipelineStep):
+    """Slicing of the navigation or signal dimensions, see DataWithAxes.inav/isig/vnav/vsig"""
+
+    def __init__(self, slices, is_navigation=True, is_index=True):
+        if isinstance(slices, numbers.Number) or isinstance(slices, slice):
+            slices = [slices]
+        self.slices = list(slices)
+        self.is_navigation = is_navigation
+        self.is_index = is_index
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        return data._slicer(self.slices, self.is_navigation, is_index=self.is_index)
+
+    def compile(self, data: DataWithAxes) -> SliceKernel:
+        slices = self.slices
+        if not self.is_index:
+            slices = data._slices_as_index(slices, self.is_navigation)
+        plan = data._get_slice_plan(slices, self.is_navigation)
+        return SliceKernel(plan.get_total_slices(slices), plan.do_squeeze)
+
+
+class ReduceStep(PipelineStep):
+    """Reduction of some dimensions, same as calling the corresponding numpy function on the data
+
+    Parameters
+    ----------
+    func_name: str
+        one of the keys of PIPELINE_REDUCTIONS: mean, sum, std, max or min
+    axis: int or tuple of int
+        the axis to reduce, all of them if None
+    """
+
+    def __init__(self, func_name: str, axis: Union[int, Tuple[int]] = None):
+        if func_name not in PIPELINE_REDUCTIONS:
+            raise KeyError(f'{func_name} is not a valid reduction, possible ones are: '
+                           f'{list(PIPELINE_REDUCTIONS.keys())}')
+        self.func = PIPELINE_REDUCTIONS[func_name]
+        self.axis = axis
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        return self.func(data, axis=self.axis)
+
+    def compile(self, data: DataWithAxes) -> Kernel:
+        if self.axis is None:
+            axis = tuple(range(1, len(data.shape) + 1))
+        elif isinstance(self.axis, numbers.Integral):
+            axis = self.axis + 1 if self.axis >= 0 else self.axis
+        else:
+            axis = tuple([ax + 1 if ax >= 0 else ax for ax in self.axis])
+
+        def reduce(stacked: np.ndarray) -> np.ndarray:
+            reduced = np.asarray(self.func(stacked, axis))
+            return reduced.reshape((len(stacked), 1)) if reduced.ndim == 1 else reduced
+        return reduce
+
+
+class FTStep(PipelineStep):
+    """Fourier transform (or its inverse) along a given axis, see DataWithAxes.ft and DataWithAxes.ift"""
+
+    def __init__(self, axis: int = 0, axis_label: str = None, axis_units: str = None,
+                 labels: List[str] = None, inverse=False):
+        self.axis = axis
+        self.axis_label = axis_label
+        self.axis_units = axis_units
+        self.labels = labels
+        self.inverse = inverse
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        method = data.ift if self.inverse else data.ft
+        return method(self.axis, axis_label=self.axis_label, axis_units=self.axis_units, labels=self.labels)
+
+    def compile(self, data: DataWithAxes) -> Kernel:
+        transform = mutils.ift if self.inverse else mutils.ft
+        dim = self.axis + 1
+        return lambda stacked: transform(stacked, dim=dim)
+
+
+class InterpStep(PipelineStep):
+    """Linear interpolation of 1D data, see DataWithAxes.interp"""
+
+    def __init__(self, new_axis_data: Union[Axis, np.ndarray], **kwargs):
+        self.new_axis_data = new_axis_data
+        self.kwargs = kwargs
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        return data.interp(self.new_axis_data, **self.kwargs)
+
+    def compile(self, data: DataWithAxes) -> Kernel:
+        new_axis_data = self.new_axis_data
+        if isinstance(new_axis_data, Axis):
+            new_axis_data = new_axis_data.get_data()
+        axis_data = data.get_axis_from_index(0)[0].get_data()
+        return lambda stacked: np.stack([np.interp(new_axis_data, axis_data, array, **self.kwargs)
+                                         for array in stacked])
+
+
+class ProcessorStep(PipelineStep):
+    """Application of a data processor, see DataProcessorFactory
+
+    Parameters
+    ----------
+    processor: DataProcessorBase or str
+        the processor or the name of a registered one
+    kwargs: dict
+        extra named parameters used to create the registered processor
+    """
+
+    def __init__(self, processor: Union[DataProcessorBase, str], **kwargs):
+        if isinstance(processor, str):
+            processor = DataProcessorFactory().get(processor, **kwargs)
+        self.processor = processor
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        return self.processor.process(data)
+
+    def compile(self, data: DataWithAxes) -> Union[Kernel, None]:
+        processor = self.processor
+        sig_indexes = data.sig_indexes
+        sig_axes = processor.get_signal_axes_data(data)
+        if processor.is_stacked():
+            def process(stacked: np.ndarray) -> np.ndarray:
+                outputs = processor.operate_stacked(stacked, sig_indexes, sig_axes)
+                return stack_channels([[output[ind] for output in outputs] for ind in range(len(stacked))])
+        elif type(processor).operate_array is not DataProcessorBase.operate_array:
+            def process(stacked: np.ndarray) -> np.ndarray:
+                return stack_channels([processor.operate_array(array, sig_indexes, sig_axes)
+                                       for array in stacked])
+        else:
+            return None
+        return process
+
+
+class FunctionStep(PipelineStep):
+    """Application of any function taking and returning a DataWithAxes, never fused
+
+    The function should return data of the same structure (shape, axes...) for input data of the same structure.
+    """
+
+    def __init__(self, function: Callable[[DataWithAxes], DataWithAxes]):
+        self.function = function
+
+    def apply(self, data: DataWithAxes) -> DataWithAxes:
+        return self.function(data)
+
+
+def stack_channels(channels: List[List[np.ndarray]]) -> np.ndarray:
+    """Stack the arrays processed for each channel (channel by channel) as they would be stored in a
+    DataWithAxes"""
+    return np.stack([np.atleast_1d(array) for arrays in channels for array in arrays])
+
+
+axis_digests: Dict[int, Tuple[weakref.ref, np.ndarray, bytes]] = dict([])  # keyed by id as Axis is unhashable
+
+
+def get_axis_digest(axis: Axis) -> bytes:
+    """Get a digest of the data array of an axis holding one (not defined by a scaling and an offset)
+
+    The digest is cached as long as the axis holds the same array object, so that the same axis is not hashed
+    again for each processed data. As for the cached classification of the axis (see Axis.kind), its data array
+    should not be modified in place
+    """
+    data = axis._data  # not the data property that would copy an array shared with another axis
+    key = id(axis)
+    cached = axis_digests.get(key, None)
+    if cached is None or cached[0]() is not axis or cached[1] is not data:
+        digest = hashlib.blake2b(np.ascontiguousarray(data).data, digest_size=16).digest()
+        cached = (weakref.ref(axis, lambda ref: axis_digests.pop(key, None)), data, digest)
+        axis_digests[key] = cached
+    return cached[2]
+
+
+def get_structure_key(data: DataWithAxes) -> tuple:
+    """Get a key identifying everything but the values of the data arrays of a DataWithAxes
+
+    Two data objects with the same key give processed data with the same structure and the same axes
+    """
+    axes = []
+    for axis in data.axes:
+        axis_key = (axis.label, axis.units, axis.index, axis.spread_order, axis.size)
+        if axis._data is None:
+            axis_key += (axis.offset, axis.scaling)
+        else:
+            axis_key += (axis._data.dtype.str, get_axis_digest(axis))
+        axes.append(axis_key)
+    return (type(data), data.name, data.origin, data.units, tuple(data.labels), str(data.source),
+            data.distribution.name, len(data), tuple(data.shape), np.dtype(data[0].dtype).str,
+            tuple(data.nav_indexes), tuple(axes))
+
+
+class CompiledPipeline:
+    """The kernels of a DataPipeline resolved for a given data structure
+
+    Parameters
+    ----------
+    kernels: list of Callable or None
+        the kernel of each step, None for the steps to be applied through the DataWithAxes API
+    structures: list of DataWithAxes or None
+        for each step without kernel, the structure of the data the step applies to
+    steps: list of PipelineStep
+    template: DataWithAxes
+        the structure of the processed data
+    """
+
+    def __init__(self, kernels: List[Union[Kernel, None]], structures: List[Union[DataWithAxes, None]],
+                 steps: List[PipelineStep], template: DataWithAxes):
+        self.kernels = kernels
+        self.structures = structures
+        self.steps = steps
+        self.template = template
+
+    def run(self, data: DataWithAxes) -> DataWithAxes:
+        kernels = self.kernels
+        stacked = data.get_stacked()
+        start = 0
+        if stacked is None:
+            if len(kernels) != 0 and isinstance(kernels[0], SliceKernel):
+                stacked = kernels[0].from_arrays(data.data)
+                start = 1
+            else:
+                stacked = np.stack([np.asarray(array) for array in data.data])
+
+        for ind in range(start, len(kernels)):
+            if kernels[ind] is not None:
+                stacked = kernels[ind](stacked)
+            else:
+                processed = self.steps[ind].apply(
+                    self.structures[ind]._clone_structure(StackedArrays(stacked)))
+                if ind == len(kernels) - 1:
+                    return processed
+                stacked = processed.stack_as_array()
+
+        processed = self.template._clone_structure(StackedArrays(stacked))
+        processed.timestamp = time()
+        return processed
+
+
+class DataPipeline:
+    """Declarative chain of operations applied to DataWithAxes or to all the DataWithAxes of a DataToExport
+
+    The operations (slicing, numpy reductions, Fourier transforms, interpolation, data processors...) are
+    declared once, for instance:
+
+    >>> pipeline = DataPipeline().isig[25:75, 75:125].process('argmax')
+    >>> processed = pipeline(dwa)
+
+    The first time the pipeline is applied on data with a given structure (shape, axes, names...), it is
+    applied step by step using the DataWithAxes API while the axes bookkeeping of each step is resolved into
+    kernels acting on the stacked data arrays. Data with the same structure (for instance the next frames of
+    a detector) are then processed by running these kernels back to back, without intermediate DataWithAxes,
+    the processed data being a cheap copy of the structure obtained the first time.
+
+    Parameters
+    ----------
+    steps: list of PipelineStep
+    max_plans: int
+        the maximum number of data structures whose compiled pipeline is kept
+    """
+
+    def __init__(self, steps: List[PipelineStep] = None, max_plans: int = 64):
+        self.steps: List[PipelineStep] = list(steps) if steps is not None else []
+        self.max_plans = max_plans
+        self._plans = dict([])
+
+        self.inav = PipelineSlicer(self, True)
+        self.isig = PipelineSlicer(self, False)
+        self.vnav = PipelineSlicer(self, True, is_index=False)
+        self.vsig = PipelineSlicer(self, False, is_index=False)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}: {[step.__class__.__name__ for step in self.steps]}'
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add_step(self, step: PipelineStep) -> DataPipeline:
+        """Append a step to the pipeline, returning the pipeline itself so that calls can be chained"""
+        self.steps.append(step)
+        self._plans.clear()
+        return self
+
+    def reduce(self, func_name: str, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        """Append a ReduceStep"""
+        return self.add_step(ReduceStep(func_name, axis))
+
+    def mean(self, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        return self.reduce('mean', axis)
+
+    def sum(self, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        return self.reduce('sum', axis)
+
+    def std(self, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        return self.reduce('std', axis)
+
+    def max(self, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        return self.reduce('max', axis)
+
+    def min(self, axis: Union[int, Tuple[int]] = None) -> DataPipeline:
+        return self.reduce('min', axis)
+
+    def ft(self, axis: int = 0, axis_label: str = None, axis_units: str = None,
+           labels: List[str] = None) -> DataPipeline:
+        """Append a FTStep, see DataWithAxes.ft"""
+        return self.add_step(FTStep(axis, axis_label, axis_units, labels))
+
+    def ift(self, axis: int = 0, axis_label: str = None, axis_units: str = None,
+            labels: List[str] = None) -> DataPipeline:
+        """Append an inverse FTStep, see DataWithAxes.ift"""
+        return self.add_step(FTStep(axis, axis_label, axis_units, labels, inverse=True))
+
+    def interp(self, new_axis_data: Union[Axis, np.ndarray], **kwargs) -> DataPipeline:
+        """Append an InterpStep, see DataWithAxes.interp"""
+        return self.add_step(InterpStep(new_axis_data, **kwargs))
+
+    def process(self, processor: Union[DataProcessorBase, str], **kwargs) -> DataPipeline:
+        """Append a ProcessorStep from a processor or the name of a registered one"""
+        return self.add_step(ProcessorStep(processor, **kwargs))
+
+    def apply(self, function: Callable[[DataWithAxes], DataWithAxes]) -> DataPipeline:
+        """Append a FunctionStep"""
+        return self.add_step(FunctionStep(function))
+
+    def clear_plans(self):
+        """Forget the compiled pipelines, for instance if a processor parameter has been changed"""
+        self._plans.clear()
+
+    def compile(self, data: DataWithAxes) -> Tuple[CompiledPipeline, DataWithAxes]:
+        """Apply the steps on data with the DataWithAxes API while computing their kernels
+
+        Returns
+        -------
+        CompiledPipeline: the pipeline compiled for the structure of data
+        DataWithAxes: the processed data
+        """
+        kernels = []
+        structures = []
+        processed = data
+        for step in self.steps:
+            kernel = step.compile(processed)
+            kernels.append(kernel)
+            structures.append(processed._clone_structure(None) if kernel is None else None)
+            processed = step.apply(processed)
+        template = processed._clone_structure(processed.data)
+        return CompiledPipeline(kernels, structures, self.steps, template), processed
+
+    def __call__(self, data: Union[DataWithAxes, DataToExport]) -> Union[DataWithAxes, DataToExport]:
+        """Apply the pipeline on a DataWithAxes or on each DataWithAxes of a DataToExport"""
+        if isinstance(data, DataToExport):
+            return DataToExport(data.name, data=[self(dwa) for dwa in data])
+        if len(self.steps) == 0:
+            return data.deepcopy()
+        key = get_structure_key(data)
+        plan = self._plans.get(key, None)
+        if plan is not None:
+            return plan.run(data)
+        plan, processed = self.compile(data)
+        if len(self._plans) >= self.max_plans:
+            self._plans.pop(next(iter(self._plans)))
+        self._plans[key] = plan
+        return processed
+
+
+class PipelineSlicer:
+    """Append a SliceStep to a pipeline using the same syntax as the slicers of DataWithAxes"""
+
+    def __init__(self, pipeline: DataPipeline, is_navigation: bool, is_index=True):
+        self.pipeline = pipeline
+        self.is_navigation = is_navigation
+        self.is_index = is_index
+
+    def __getitem__(self, slices) -> DataPipeline:
+        return self.pipeline.add_step(SliceStep(slices, self.is_navigation, self.is_index))
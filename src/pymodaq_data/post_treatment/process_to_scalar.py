@@ -4,11 +4,18 @@ Created the 04/11/2022
 
 @author: Sebastien Weber
 """
+import atexit
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache
+import inspect
+import os
+import threading
 import numpy as np
 from numbers import Number
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from abc import ABCMeta, abstractmethod, abstractproperty
 
+from pymodaq_utils.enums import BaseEnum, enum_checker
 from pymodaq_utils.factory import ObjectFactory
 from pymodaq_utils import math_utils as mutils
 from pymodaq_data.data import DataWithAxes, Axis, DataRaw, DataBase, DataDim, DataCalculated
@@ -18,25 +25,191 @@ config_processors = {
 }
 
 
+class ProcessorBackend(BaseEnum):
+    """Enum for the execution backends of the data processors"""
+    sequential = 0
+    thread = 1
+    process = 2
+
+
+_executors = dict([])
+_executors_lock = threading.Lock()
+
+
+def get_executor(backend: Union[str, ProcessorBackend], n_workers: int) -> Executor:
+    """Get the pool executor shared by all processors using the same backend and number of workers"""
+    backend = enum_checker(ProcessorBackend, backend)
+    with _executors_lock:
+        if (backend.name, n_workers) not in _executors:
+            executor_class = ThreadPoolExecutor if backend == ProcessorBackend.thread else ProcessPoolExecutor
+            _executors[(backend.name, n_workers)] = executor_class(max_workers=n_workers)
+        return _executors[(backend.name, n_workers)]
+
+
+def shutdown_executors(wait=True):
+    """Shut down the pool executors shared by the processors (new ones are created when needed)
+
+    Called when the interpreter exits
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown_executors)
+
+
+@lru_cache(maxsize=None)
+def accepts_argument(builder, argument: str) -> bool:
+    """Check if a class (or function) can be called with a given keyword argument"""
+    try:
+        parameters = inspect.signature(builder).parameters
+    except (TypeError, ValueError):
+        return False
+    return argument in parameters or any([parameter.kind == inspect.Parameter.VAR_KEYWORD
+                                          for parameter in parameters.values()])
+
+
 class DataProcessorBase(metaclass=ABCMeta):
     """Apply processing functions to signal data. This function should return a DataWithAxes.
 
+    Processors either implement the operate method or, to be run in parallel, the operate_array
+    method processing a single data array (or a block of it along the first navigation axis) and the
+    build method creating the returned DataWithAxes from all the processed arrays.
+
+    Processors implementing instead the operate_stacked method process all the channels at once when
+    the data are in contiguous mode (see DataWithAxes.get_stacked), operate_array then defaults to it.
+
+    Parameters
+    ----------
+    backend: ProcessorBackend or str
+        sequential (the default), thread or process: how the process method runs the operate_array
+        method over the channels and over blocks along the first navigation axis
+    n_workers: int
+        The number of workers of the thread or process pool, default to the number of cpus
+
     Attributes
     ----------
     apply_to: DataDim
         Specify on which type of data dimensionality this processor can be applied to, if only 1D:
         apply_to = DataDim['Data1D']
+    needs_signal_axes: bool
+        If True the data of the signal axes are passed to operate_array
 
     """
 
     apply_to: DataDim = abstractproperty
+    needs_signal_axes = False
+
+    def __init__(self, backend: Union[str, ProcessorBackend] = ProcessorBackend.sequential,
+                 n_workers: int = None):
+        self.backend = enum_checker(ProcessorBackend, backend)
+        self.n_workers = n_workers if n_workers is not None else os.cpu_count()
 
     def process(self, data: DataWithAxes) -> DataWithAxes:
-        return self.operate(data)
+        if (self.backend == ProcessorBackend.sequential or self.n_workers <= 1 or
+                (type(self).operate_array is DataProcessorBase.operate_array and
+                 not self.is_stacked())):
+            return self.operate(data)
+        return self.operate_parallel(data)
+
+    def is_stacked(self) -> bool:
+        """Check if this processor implements the operate_stacked method"""
+        return type(self).operate_stacked is not DataProcessorBase.operate_stacked
+
+    def operate(self, sub_data: DataWithAxes) -> DataWithAxes:
+        sig_axes = self.get_signal_axes_data(sub_data)
+        stacked = sub_data.get_stacked() if self.is_stacked() else None
+        data_arrays = []
+        if stacked is not None:
+            outputs = self.operate_stacked(stacked, sub_data.sig_indexes, sig_axes)
+            for ind_channel in range(len(stacked)):
+                data_arrays.extend([np.atleast_1d(output[ind_channel]) for output in outputs])
+        else:
+            for array in sub_data:
+                data_arrays.extend(self.operate_array(array, sub_data.sig_indexes, sig_axes))
+        return self.build(sub_data, data_arrays)
+
+    def operate_parallel(self, sub_data: DataWithAxes) -> DataWithAxes:
+        """Same as operate but with the channels and blocks along the first navigation axis processed by
+        the pool executor"""
+        sig_axes = self.get_signal_axes_data(sub_data)
+        if len(sub_data.nav_indexes) == 0:
+            nav_index, nav_length = 0, 1
+        else:
+            nav_index = min(sub_data.nav_indexes)
+            nav_length = sub_data.shape[nav_index]
+        n_blocks = min(nav_length, max(1, -(-self.n_workers // len(sub_data))))
+        bounds = np.linspace(0, nav_length, n_blocks + 1).astype(int)
+        executor = get_executor(self.backend, self.n_workers)
+
+        futures = []
+        for array in sub_data:
+            if n_blocks == 1:
+                blocks = [array]
+            else:
+                blocks = [array[(slice(None),) * nav_index + (slice(start, stop),)]
+                          for start, stop in zip(bounds[:-1], bounds[1:])]
+            futures.append([executor.submit(self.operate_array, block, sub_data.sig_indexes, sig_axes)
+                            for block in blocks])
+        data_arrays = []
+        for channel_futures in futures:
+            results = [future.result() for future in channel_futures]
+            data_arrays.extend([outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=0)
+                                for outputs in zip(*results)])
+        return self.build(sub_data, data_arrays)
+
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int],
+                      sig_axes: List[np.ndarray]) -> List[np.ndarray]:
+        """Process a single data array
+
+        Parameters
+        ----------
+        array: np.ndarray
+            one of the data arrays or a block of it along the first navigation axis
+        sig_indexes: tuple of int
+            the signal indexes of the data
+        sig_axes: list of np.ndarray
+            the data of the signal axes if needs_signal_axes is True else an empty list
+
+        Returns
+        -------
+        list of np.ndarray: the processed arrays, whose first axis (if any) is the first navigation axis
+        """
+        if not self.is_stacked():
+            raise NotImplementedError
+        return [np.atleast_1d(output[0]) for output in
+                self.operate_stacked(array[np.newaxis], sig_indexes, sig_axes)]
+
+    def operate_stacked(self, stacked: np.ndarray, sig_indexes: Tuple[int],
+                        sig_axes: List[np.ndarray]) -> List[np.ndarray]:
+        """Process all the data arrays stacked along a new first axis
+
+        Parameters
+        ----------
+        stacked: np.ndarray
+            the stacked data arrays, of shape (number of channels, *data shape)
+        sig_indexes: tuple of int
+            the signal indexes of the data (not accounting for the stacking axis)
+        sig_axes: list of np.ndarray
+            the data of the signal axes if needs_signal_axes is True else an empty list
+
+        Returns
+        -------
+        list of np.ndarray: the processed arrays, whose first axis is the channel one
+        """
+        raise NotImplementedError
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]) -> DataWithAxes:
+        """Create the processed DataWithAxes from sub_data and the arrays returned by operate_array"""
+        raise NotImplementedError
 
-    @abstractmethod
-    def operate(self, sub_data: DataWithAxes):
-        pass
+    def get_signal_axes_data(self, sub_data: DataWithAxes) -> List[np.ndarray]:
+        if not self.needs_signal_axes:
+            return []
+        return [sub_data.get_axis_from_index(sig_index)[0].get_data() for sig_index in sub_data.sig_indexes]
 
     @staticmethod
     def flatten_signal_dim(sub_data: DataWithAxes) -> Tuple[Tuple, np.ndarray]:
@@ -51,12 +224,52 @@ class DataProcessorBase(metaclass=ABCMeta):
             data_arrays.append(data.reshape(new_shape))
         return new_shape, data_arrays
 
+    @staticmethod
+    def flatten_signal_array(array: np.ndarray, sig_indexes: Tuple[int]) -> Tuple[List[int], np.ndarray]:
+        """flattens a data array along the signal dimensions (placed after the navigation ones)"""
+        new_shape = [array.shape[ind] for ind in range(array.ndim) if ind not in sig_indexes]
+        new_shape.append(int(np.prod([array.shape[ind] for ind in sig_indexes])))
+        return new_shape, array.reshape(new_shape)
+
+    @staticmethod
+    def flatten_signal_stacked(stacked: np.ndarray, sig_indexes: Tuple[int]) -> Tuple[List[int], np.ndarray]:
+        """flattens stacked data arrays along the signal dimensions
+
+        Returns
+        -------
+        list of int: the shape of the signal dimensions
+        np.ndarray: the flattened array of shape (number of channels, *navigation shape, signal size)
+        """
+        sig_axes = [ind + 1 for ind in sig_indexes]
+        sig_shape = [stacked.shape[ind] for ind in sig_axes]
+        moved = np.moveaxis(stacked, sig_axes, range(stacked.ndim - len(sig_axes), stacked.ndim))
+        return sig_shape, moved.reshape(moved.shape[:stacked.ndim - len(sig_axes)] + (-1,))
+
     def __call__(self, **kwargs):
         return self(**kwargs)
 
 
 class DataProcessorFactory(ObjectFactory):
+    """Factory of the registered data processors
+
+    Parameters
+    ----------
+    backend: ProcessorBackend or str
+        the default execution backend of the created processors
+    n_workers: int
+        the default number of workers of the created processors
+    """
+    def __init__(self, backend: Union[str, ProcessorBackend] = ProcessorBackend.sequential,
+                 n_workers: int = None):
+        self.backend = enum_checker(ProcessorBackend, backend)
+        self.n_workers = n_workers
+
     def get(self, processor_name, **kwargs) -> DataProcessorBase:
+        """Create a processor, passing it the default backend and n_workers if it accepts them"""
+        builder = self.get_class(processor_name)
+        for argument, value in (('backend', self.backend), ('n_workers', self.n_workers)):
+            if argument not in kwargs and builder is not None and accepts_argument(builder, argument):
+                kwargs[argument] = value
         return self.create(processor_name, **kwargs)
 
     @property
@@ -73,8 +286,10 @@ class DataProcessorFactory(ObjectFactory):
 class MeanProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
 
-    def operate(self, sub_data: DataWithAxes):
-        data_arrays = [np.atleast_1d(np.mean(data, axis=sub_data.sig_indexes)) for data in sub_data]
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        return [np.atleast_1d(np.mean(array, axis=sig_indexes))]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
         return sub_data.deepcopy_with_new_data(data_arrays, sub_data.sig_indexes)
 
 
@@ -82,8 +297,10 @@ class MeanProcessor(DataProcessorBase):
 class StdProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
 
-    def operate(self, sub_data: DataWithAxes):
-        data_arrays = [np.atleast_1d(np.std(data, axis=sub_data.sig_indexes)) for data in sub_data]
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        return [np.atleast_1d(np.std(array, axis=sig_indexes))]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
         return sub_data.deepcopy_with_new_data(data_arrays, sub_data.sig_indexes)
 
 
@@ -91,8 +308,10 @@ class StdProcessor(DataProcessorBase):
 class SumProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
 
-    def operate(self, sub_data: DataWithAxes):
-        data_arrays = [np.atleast_1d(np.sum(data, axis=sub_data.sig_indexes)) for data in sub_data]
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        return [np.atleast_1d(np.sum(array, axis=sig_indexes))]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
         return sub_data.deepcopy_with_new_data(data_arrays, sub_data.sig_indexes)
 
 
@@ -100,8 +319,10 @@ class SumProcessor(DataProcessorBase):
 class MaxProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
 
-    def operate(self, sub_data: DataWithAxes):
-        data_arrays = [np.atleast_1d(np.max(data, axis=sub_data.sig_indexes)) for data in sub_data]
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        return [np.atleast_1d(np.max(array, axis=sig_indexes))]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
         return sub_data.deepcopy_with_new_data(data_arrays, sub_data.sig_indexes)
 
 
@@ -109,38 +330,38 @@ class MaxProcessor(DataProcessorBase):
 class MinProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
 
-    def operate(self, sub_data: DataWithAxes):
-        data_arrays = [np.atleast_1d(np.min(data, axis=sub_data.sig_indexes)) for data in sub_data]
+    def operate_array(self, array: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        return [np.atleast_1d(np.min(array, axis=sig_indexes))]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
         return sub_data.deepcopy_with_new_data(data_arrays, sub_data.sig_indexes)
 
 
 @DataProcessorFactory.register('argmax')
 class ArgMaxProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
+    needs_signal_axes = True
 
-    def operate(self, sub_data: DataWithAxes):
-        """Extract info from sub-DataWithAxes
+    def operate_stacked(self, stacked: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        """Extract info from stacked data arrays
 
-        Retrieve the signal axis values of the maximum position of the data
+        Retrieve the signal axes values of the maximum position of the data
 
         Notes
         -----
         For more complex processors, such as the argmin, argmax ... , one cannot use directly the numpy function
         (compared to min, max, mean...). Indeed one has to first flatten the data arrays on the signal axes, then apply
-        the function on the flatten dimension, here get the indexes of the minimum along the flattened dimension (as
-        a function of the eventual navigations dimensions). From this index, on then obtain as many indexes as signal
-        dimensions (1 for 1D Signals, 2 for 2D signals). And we do this for as many data there is in sub_data.
+        the function on the flatten dimension, here get the indexes of the maximum along the flattened dimension (as
+        a function of the channels and eventual navigations dimensions). From this index, on then obtain as many
+        indexes as signal dimensions (1 for 1D Signals, 2 for 2D signals), for all channels at once.
         """
-        new_data_arrays = []
-        new_shape, flattened_arrays = self.flatten_signal_dim(sub_data)
-
-        for dat in flattened_arrays:
-            indexes = np.unravel_index(np.nanargmax(dat, len(new_shape)-1), sub_data.shape)[len(sub_data.nav_indexes):]
-            # from the unraveled index, retrieve the corresponding axis value
-            for ind in range(len(indexes)):
-                axis_data = sub_data.get_axis_from_index(sub_data.sig_indexes[ind])[0].get_data()
-                new_data_arrays.append(np.atleast_1d(axis_data[indexes[ind]]))
-        return DataCalculated('processed_data', data=new_data_arrays, nav_indexes=sub_data.nav_indexes,
+        sig_shape, flattened = self.flatten_signal_stacked(stacked, sig_indexes)
+        indexes = np.unravel_index(np.nanargmax(flattened, axis=-1), sig_shape)
+        # from the unraveled index, retrieve the corresponding axis value
+        return [axis_data[index] for axis_data, index in zip(sig_axes, indexes)]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
+        return DataCalculated('processed_data', data=data_arrays, nav_indexes=sub_data.nav_indexes,
                               axes=[axis for axis in sub_data.axes if axis.index in sub_data.nav_indexes],
                               distribution=sub_data.distribution)
 
@@ -148,87 +369,100 @@ class ArgMaxProcessor(DataProcessorBase):
 @DataProcessorFactory.register('argmin')
 class ArgMinProcessor(DataProcessorBase):
     apply_to = DataDim['DataND']
+    needs_signal_axes = True
 
-    def operate(self, sub_data: DataWithAxes):
-        """Extract info from sub-DataWithAxes
+    def operate_stacked(self, stacked: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        """Extract info from stacked data arrays
 
-        Retrieve the signal axis values of the minimum position of the data
+        Retrieve the signal axes values of the minimum position of the data
 
         Notes
         -----
-        For more complex processors, such as the argmin, argmax ... , one cannot use directly the numpy function
-        (compared to min, max, mean...). Indeed one has to first flatten the data arrays on the signal axes, then apply
-        the function on the flatten dimension, here get the indexes of the minimum along the flattened dimension (as
-        a function of the eventual navigations dimensions). From this index, on then obtain as many indexes as signal
-        dimensions (1 for 1D Signals, 2 for 2D signals). And we do this for as many data there is in sub_data.
+        See ArgMaxProcessor
         """
-        new_data_arrays = []
-        new_shape, flattened_arrays = self.flatten_signal_dim(sub_data)
-
-        for dat in flattened_arrays:
-            indexes = np.unravel_index(np.nanargmin(dat, len(new_shape)-1), sub_data.shape)[len(sub_data.nav_indexes):]
-            # from the unraveled index, retrieve the corresponding axis value
-            for ind in range(len(indexes)):
-                axis_data = sub_data.get_axis_from_index(sub_data.sig_indexes[ind])[0].get_data()
-                new_data_arrays.append(np.atleast_1d(axis_data[indexes[ind]]))
-        return DataCalculated('processed_data', data=new_data_arrays, nav_indexes=sub_data.nav_indexes,
+        sig_shape, flattened = self.flatten_signal_stacked(stacked, sig_indexes)
+        indexes = np.unravel_index(np.nanargmin(flattened, axis=-1), sig_shape)
+        # from the unraveled index, retrieve the corresponding axis value
+        return [axis_data[index] for axis_data, index in zip(sig_axes, indexes)]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
+        return DataCalculated('processed_data', data=data_arrays, nav_indexes=sub_data.nav_indexes,
                               axes=[axis for axis in sub_data.axes if axis.index in sub_data.nav_indexes],
                               distribution=sub_data.distribution)
 
 
+class WeightedMomentsProcessor(DataProcessorBase):
+    """Base class for the processors using the data as weights of the signal axis values
+
+    The weighted moments of all the channels are computed with a single tensordot of the flattened data
+    with a (signal size, 3) basis made of ones and the first and second powers of the (centered) axis values.
+    This basis is kept as long as the processor is applied on data having the same read-only (linear) signal
+    axis.
+    """
+    needs_signal_axes = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._basis_cache: Tuple[np.ndarray, float, np.ndarray] = None
+
+    def get_moments_basis(self, values: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Get the center of the axis values and the basis of the moments computation"""
+        cache = self._basis_cache
+        if cache is not None and cache[0] is values:
+            return cache[1], cache[2]
+        center = float(np.mean(values)) if values.size else 0.
+        centered = values.ravel() - center
+        basis = np.stack((np.ones_like(centered), centered, centered ** 2), axis=1)
+        if not values.flags.writeable:  # the cached data of a linear axis, will not change
+            self._basis_cache = (values, center, basis)
+        return center, basis
+
+    def weighted_moments(self, stacked: np.ndarray, sig_indexes: Tuple[int],
+                         values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the weighted mean and variance of the axis values, the stacked data being the weights
+
+        Returns
+        -------
+        np.ndarray: the weighted means of shape (number of channels, *navigation shape)
+        np.ndarray: the weighted variances of shape (number of channels, *navigation shape)
+        """
+        _, weights = self.flatten_signal_stacked(stacked, sig_indexes)
+        center, basis = self.get_moments_basis(values)
+        moments = np.tensordot(weights, basis, axes=1)
+        first = moments[..., 1] / moments[..., 0]
+        second = moments[..., 2] / moments[..., 0]
+        return center + first, np.maximum(second - first ** 2, 0)
+
+
 @DataProcessorFactory.register('argmean')
-class ArgMeanProcessor(DataProcessorBase):
+class ArgMeanProcessor(WeightedMomentsProcessor):
     apply_to = DataDim['Data1D']
 
-    def operate(self, sub_data: DataWithAxes):
-        """Extract info from sub-DataWithAxes
+    def operate_stacked(self, stacked: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        """Extract info from stacked data arrays
 
-        Retrieve the signal mean axis values
-
-        Notes
-        -----
-        For more complex processors, such as the argmin, argmax ... , one cannot use directly the numpy function
-        (compared to min, max, mean...). Indeed one has to first flatten the data arrays on the signal axes, then apply
-        the function on the flatten dimension, here get the indexes of the minimum along the flattened dimension (as
-        a function of the eventual navigations dimensions). From this index, on then obtain as many indexes as signal
-        dimensions (1 for 1D Signals, 2 for 2D signals). And we do this for as many data there is in sub_data.
+        Retrieve the signal mean axis values, the data being used as weights
         """
-        new_data_arrays = []
-        new_shape, flattened_arrays = self.flatten_signal_dim(sub_data)
-        values = sub_data.get_axis_from_index(sub_data.sig_indexes[0])[0].get_data()
-        for dat in flattened_arrays:
-            weights = dat
-            new_data_arrays.append(np.atleast_1d(np.average(values, axis=len(new_shape) - 1, weights=weights)))
-        return DataCalculated('processed_data', data=new_data_arrays, nav_indexes=sub_data.nav_indexes,
+        mean, _ = self.weighted_moments(stacked, sig_indexes, sig_axes[0])
+        return [mean]
+
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
+        return DataCalculated('processed_data', data=data_arrays, nav_indexes=sub_data.nav_indexes,
                               axes=[axis for axis in sub_data.axes if axis.index in sub_data.nav_indexes])
 
 
 @DataProcessorFactory.register('argstd')
-class ArgStdProcessor(DataProcessorBase):
+class ArgStdProcessor(WeightedMomentsProcessor):
     apply_to = DataDim['Data1D']
 
-    def operate(self, sub_data: DataWithAxes):
-        """Extract info from sub-DataWithAxes
+    def operate_stacked(self, stacked: np.ndarray, sig_indexes: Tuple[int], sig_axes: List[np.ndarray]):
+        """Extract info from stacked data arrays
 
-        Retrieve the signal mean axis values
-
-        Notes
-        -----
-        For more complex processors, such as the argmin, argmax ... , one cannot use directly the numpy function
-        (compared to min, max, mean...). Indeed one has to first flatten the data arrays on the signal axes, then apply
-        the function on the flatten dimension, here get the indexes of the minimum along the flattened dimension (as
-        a function of the eventual navigations dimensions). From this index, on then obtain as many indexes as signal
-        dimensions (1 for 1D Signals, 2 for 2D signals). And we do this for as many data there is in sub_data.
+        Retrieve the signal standard deviation of the axis values, the data being used as weights
         """
-        new_data_arrays = []
-        new_shape, flattened_arrays = self.flatten_signal_dim(sub_data)
-        values = sub_data.get_axis_from_index(sub_data.sig_indexes[0])[0].get_data()
-        for dat in flattened_arrays:
-            weights = dat
-            w_avg = np.atleast_1d(np.average(values, axis=len(new_shape) - 1, weights=weights))
-            new_data_arrays.append(np.atleast_1d(np.sqrt(
-                np.sum(weights * (values - w_avg) ** 2, axis=len(new_shape) - 1) /
-                np.sum(weights, axis=len(new_shape) - 1))))
-        return DataCalculated('processed_data', data=new_data_arrays, nav_indexes=sub_data.nav_indexes,
-                              axes=[axis for axis in sub_data.axes if axis.index in sub_data.nav_indexes])
+        _, variance = self.weighted_moments(stacked, sig_indexes, sig_axes[0])
+        return [np.sqrt(variance)]
 
+    def build(self, sub_data: DataWithAxes, data_arrays: List[np.ndarray]):
+        return DataCalculated('processed_data', data=data_arrays, nav_indexes=sub_data.nav_indexes,
+                              axes=[axis for axis in sub_data.axes if axis.index in sub_data.nav_indexes])
@@ -38,7 +38,7 @@ class SpecialSlicersData(SpecialSlicers):
                 data_to_replace = data.get_data()
             if hasattr(self.obj, 'units') and self.obj.data is None:
                 self.obj.create_linear_data(len(self.obj))
-            self.obj.data[total_slices] = data_to_replace
+            self.obj._writable_data()[total_slices] = data_to_replace
         else:
             for ind in range(len(self.obj)):
                 if isinstance(data, np.ndarray):
@@ -4,7 +4,9 @@ Created the 28/10/2022
 
 @author: Sebastien Weber
 """
+import copy
 import logging
+import pickle
 import numpy as np
 import pint.errors
 from pint.errors import DimensionalityError
@@ -244,6 +246,20 @@ class TestAxis:
         ax = init_axis(data=data_tmp)
         assert ax.find_index(5) == 1
 
+    @pytest.mark.parametrize('axis', [
+        data_mod.Axis('linear', offset=-2., scaling=0.3, size=20),
+        data_mod.Axis('reversed linear', offset=2., scaling=-0.3, size=20),
+        data_mod.Axis('increasing', data=np.array([0.1, 0.2, 0.5, 1.1, 1.2, 2., 3.5])),
+        data_mod.Axis('decreasing', data=np.array([3.5, 2., 1.2, 1.1, 0.5, 0.2, 0.1])),
+        data_mod.Axis('non monotonic', data=np.array([0.1, 2, 23, 44, 21, 20])),
+        data_mod.Axis('single', data=np.array([1.]))])
+    def test_find_indexes(self, axis):
+        thresholds = np.linspace(-5, 50, 201) + 0.0123  # away from exact midpoints
+        expected = [mutils.find_index(axis.get_data(), threshold)[0][0] for threshold in thresholds]
+        assert np.all(axis.find_indexes(thresholds) == expected)
+        assert axis.find_index(thresholds[10]) == expected[10]
+        assert isinstance(axis.find_index(thresholds[10]), int)
+
     def test_slice_getter(self, init_axis_fixt):
         ax = init_axis_fixt
 
@@ -272,6 +288,11 @@ class TestAxis:
         assert int_axis.get_data()[0] == ax.get_data()[ind_int]
         assert int_axis == int_axis_value
 
+        for _slice in [slice(1, None, 3), slice(-5, None), slice(2, 100, 2)]:
+            sliced_axis = ax.iaxis[_slice]
+            assert len(sliced_axis) == len(ax.get_data()[_slice])
+            assert np.allclose(sliced_axis.get_data(), ax.get_data()[_slice])
+
     def test_slice_setter(self, init_axis_fixt):
         ax = init_axis_fixt
         length = len(ax)
@@ -306,6 +327,52 @@ class TestAxis:
         assert axis.scaling == 1
         assert np.allclose(axis.get_data(), DATA)
 
+    def test_linear_data_cache(self):
+        axis = data_mod.Axis('myaxis', offset=1., scaling=0.5, size=4)
+        assert not hasattr(axis, '__dict__')
+        linear_data = axis.get_data()
+        assert axis.get_data() is linear_data
+        assert not linear_data.flags.writeable
+        with pytest.raises(ValueError):
+            linear_data[0] = 0
+
+        axis.offset = 2.
+        assert np.allclose(axis.get_data(), [2., 2.5, 3., 3.5])
+        axis.scaling = 1.
+        assert np.allclose(axis.get_data(), [2., 3., 4., 5.])
+        axis.size = 2
+        assert np.allclose(axis.get_data(), [2., 3.])
+        assert np.allclose(axis.iaxis[1:].get_data(), [3.])
+        assert axis.as_dwa().data[0].flags.writeable
+
+        axis_copy = copy.deepcopy(axis)
+        assert axis_copy.iaxis.obj is axis_copy
+        assert np.allclose(pickle.loads(pickle.dumps(axis)).get_data(), [2., 3.])
+
+    @pytest.mark.parametrize('data, kind', [(np.linspace(0, 1, 1000), 'linear'),
+                                            (np.linspace(1, 0, 1000), 'linear'),
+                                            (np.ones((1000,)), 'linear'),
+                                            (np.array([0.1, 0.2, 0.5, 1.1]), 'monotonic'),
+                                            (np.array([3.5, 2., 1.2, 1.1]), 'monotonic'),
+                                            (np.array([0.1, 2, 23, 44, 21, 20]), 'irregular')])
+    @pytest.mark.parametrize('chunk_size', [1, 3, 65536])
+    def test_classify_axis_data(self, data, kind, chunk_size):
+        assert data_mod.classify_axis_data(data, chunk_size) == kind
+        assert (kind == 'linear') == np.allclose(np.diff(data), np.mean(np.diff(data)))
+
+    def test_kind_cache(self):
+        axis = data_mod.Axis('myaxis', data=np.array([0.1, 0.2, 0.5, 1.1]))
+        assert axis.kind == 'monotonic'
+        assert axis._kind == 'monotonic'
+        assert not axis.is_axis_linear()
+        axis.data = np.array([0.1, 2, 23, 44, 21, 20])
+        assert axis.kind == 'irregular'
+        axis.iaxis[:] = np.array([0.1, 0.2, 0.5, 1.1, 1.3, 1.4])
+        assert axis.kind == 'monotonic'
+        axis.data = np.array([1., 2., 3.])
+        assert axis.kind == 'linear'
+        assert axis.is_axis_linear()
+
     def test_get_data_at(self):
         DATA = np.array([0, 1, 6, 8, 9])
         axis = init_axis(DATA)
@@ -593,6 +660,51 @@ class TestDataWithAxesUniform:
         for ind in IND_TO_REMOVE:
             assert data.get_axis_from_index(ind)[0] not in new_data.axes
 
+    def test_deepcopy_with_new_data_structure(self):
+        sig_axis = data_mod.Axis('sig', data=np.array([0., 1., 3., 7., 8.]), index=0)
+        data = data_mod.DataRaw('mydata', data=[np.ones((5,)), np.zeros((5,))],
+                                labels=['a', 'b'], axes=[sig_axis], errors=[np.ones((5,)),
+                                                                            np.ones((5,))])
+        data.add_extra_attribute(extra=[1, 2])
+
+        new_arrays = [np.full((5,), 2.), np.full((5,), 3.)]
+        new_data = data.deepcopy_with_new_data(new_arrays)
+        assert new_data.data[0] is new_arrays[0]
+        assert new_data.errors is None
+        assert new_data.labels == data.labels
+        assert new_data.labels is not data.labels
+        assert new_data.extra == [1, 2]
+        assert new_data.extra is not data.extra
+        assert new_data.inav.obj is new_data
+
+        new_axis = new_data.axes[0]
+        assert new_axis is not sig_axis
+        assert np.shares_memory(new_axis.get_data(), sig_axis.get_data())
+        assert not new_axis.get_data().flags.writeable
+        new_axis.iaxis[1] = np.array(2.)
+        assert new_axis.get_data()[1] == pytest.approx(2.)
+        assert sig_axis.get_data()[1] == pytest.approx(1.)
+        assert sig_axis.get_data().flags.writeable  # the original axis is left untouched
+        sig_axis.data[2] = 5.
+        assert sig_axis.get_data()[2] == pytest.approx(5.)
+
+        other_axis = data.deepcopy_with_new_data(new_arrays).axes[0]
+        assert np.shares_memory(other_axis.data, sig_axis.get_data())  # reading doesn't copy
+        with pytest.raises(ValueError):
+            other_axis.data[4] = 9.
+        other_axis.vaxis[8.] = np.array(9.)  # copied on write through the slicers
+        assert other_axis.get_data()[4] == pytest.approx(9.)
+        assert not np.shares_memory(other_axis.get_data(), sig_axis.get_data())
+        assert sig_axis.get_data()[4] == pytest.approx(8.)
+        assert np.allclose((other_axis * 2).get_data(), 2 * other_axis.get_data())
+
+        new_errors = [np.full((5,), 0.1), np.full((5,), 0.2)]
+        new_data = data.deepcopy_with_new_data(new_arrays, errors=new_errors)
+        assert new_data.errors is new_errors
+
+        with pytest.raises(IndexError):
+            data.deepcopy_with_new_data([np.ones((5,))], remove_axes_index=3)
+
     @pytest.mark.parametrize("IND_MEAN", [0, 1, 2])
     def test_mean(self, IND_MEAN):
         data, shape = init_dataND()
@@ -958,6 +1070,22 @@ class TestSlicingUniform:
         assert data_2.get_axis_from_index(0)[0].size == 3
         assert data_2.get_axis_from_index(1)[0].size == 2
 
+    def test_slice_unsorted_nav_indexes(self):
+        data_raw = data_mod.DataRaw('mydata', data=[np.arange(5 * 6 * 3.).reshape((5, 6, 3))],
+                                    nav_indexes=(1, 0),
+                                    axes=[data_mod.Axis('nav0', data=np.linspace(0, 4, 5),
+                                                        index=0),
+                                          data_mod.Axis('nav1', data=np.linspace(10, 60, 6),
+                                                        index=1),
+                                          data_mod.Axis('sig', data=np.arange(3.), index=2)])
+        assert data_raw.nav_indexes == (1, 0)
+        for _ in range(2):  # the second slicing uses the cached slice plan
+            assert data_raw.vnav[1., 30.] == data_raw.inav[1, 2]
+            assert np.allclose(data_raw.vnav[1., 30.][0], data_raw[0][1, 2])
+            data_sliced = data_raw.vnav[0.:3., 20.]
+            assert data_sliced == data_raw.inav[0:3, 1]
+            assert data_sliced.shape == (3, 3)
+
     def test_slice_ellipsis(self, init_data_uniform):
         data_raw = init_data_uniform
         assert data_raw.shape == (Nn0, Nn1, DATA2D.shape[0], DATA2D.shape[1])
@@ -1002,6 +1130,43 @@ class TestSlicingUniform:
         assert data_2.get_axis_from_index(2)[0].size == 3
         assert data_2.get_axis_from_index(3)[0].size == 2
 
+    def test_slice_plan_cache(self, init_data_uniform):
+        data_raw = init_data_uniform
+        data_array = np.random.rand(*data_raw.shape)
+        data_raw.data = [data_array]
+        assert len(data_raw._am._slice_plans) == 0
+
+        for ind in range(Nn0):
+            data_sliced = data_raw.inav[ind, 1:4]
+            assert np.allclose(data_sliced[0], data_array[ind, 1:4])
+            assert data_sliced.nav_indexes == (0,)
+            assert data_sliced.get_axis_from_index(0)[0].size == 3
+            assert np.allclose(data_sliced.get_axis_from_index(0)[0].get_data(),
+                               data_raw.get_axis_from_index(1)[0].get_data()[1:4])
+        assert len(data_raw._am._slice_plans) == 1
+
+        for ind in range(DATA2D.shape[1]):
+            data_sliced = data_raw.isig[:, ind]
+            assert np.allclose(data_sliced[0], data_array[..., ind])
+            assert data_sliced.get_axis_from_index(2)[0].label == 'signal0'
+        assert len(data_raw._am._slice_plans) == 2
+
+        data_raw.inav[0:2, 0:3]
+        data_raw.inav[0:2, 0:4]
+        assert len(data_raw._am._slice_plans) == 4
+
+        data_raw._am.axes = data_raw.axes
+        assert len(data_raw._am._slice_plans) == 0
+
+    def test_slicer_axes_copies(self, init_data_uniform):
+        data_raw = init_data_uniform
+        data_sliced = data_raw.inav[0, :]
+        axis = data_sliced.get_axis_from_index(0)[0]
+        assert axis.iaxis.obj is axis
+        assert axis is not data_raw.get_axis_from_index(1)[0]
+        axis.index = 2
+        assert data_raw.get_axis_from_index(1)[0].index == 1
+
     def test_slicing_setter(self):
         data_raw, shape = init_dataND()
         assert data_raw.shape == (5, 6, 3)
@@ -1262,6 +1427,117 @@ class TestDataToExport:
         dat2bis = data.remove(dat2)
         assert dat2 is dat2bis
 
+    def test_lookup_index(self, ini_data_to_export, monkeypatch):
+        dat1, dat2, dte = ini_data_to_export
+        for ind in range(3):
+            roi = init_data(data=DATA1D, Ndata=2, name=f'roi{ind:02d}')
+            roi.origin = 'toexport'
+            dte.append(roi)
+        assert dte.get_names() == ['data2D', 'data1D', 'roi00', 'roi01', 'roi02']
+
+        def no_comparison(*args, **kwargs):
+            raise AssertionError('arrays should not be compared')
+        monkeypatch.setattr(data_mod.DataBase, '__eq__', no_comparison)
+
+        new_roi = init_data(data=DATA1D, Ndata=2, name='roi01')
+        new_roi.origin = 'toexport'
+        dte.append(new_roi)  # replacement is moved at the end of the list
+        assert dte.get_names() == ['data2D', 'data1D', 'roi00', 'roi02', 'roi01']
+        assert dte.index_from_name_origin('roi01', 'toexport') == 4
+        assert dte.get_full_names('Data1D') == ['toexport/data1D', 'toexport/roi00',
+                                                'toexport/roi01', 'toexport/roi02']
+        assert dte.get_dim_presents() == ['Data1D', 'Data2D']
+
+        dte[1] = init_data(data=DATA0D, name='data0D')
+        assert dte.get_data_from_name('data1D') is None
+        assert dte.get_names('Data0D') == ['data0D']
+
+        dte.remove(dte.get_data_from_name('roi00'))
+        assert dte.pop(0) is dat1
+        assert dte.get_names() == ['data0D', 'roi02', 'roi01']
+        assert dte.get_dim_presents() == ['Data0D', 'Data1D']
+        monkeypatch.undo()
+
+        # renaming or changing the origin of stored data invalidates the index
+        dte[1].name = 'renamed'
+        assert dte.get_data_from_name('roi02') is None
+        assert dte.get_data_from_name('renamed') is dte[1]
+        dte[2].origin = 'det0'
+        assert dte.get_data_from_full_name('det0/roi01') is dte[2]
+        dte[0].set_dim('Data2D')
+        assert dte.get_names('Data2D') == ['data0D']
+
+    def test_lookup_index_invalidation(self, ini_data_to_export, monkeypatch):
+        dat1, dat2, dte = ini_data_to_export
+        other_dte = data_mod.DataToExport('other', data=[dat2])
+        unrelated = init_data(data=DATA1D, name='unrelated')
+        dte.get_data_from_name('data2D')
+
+        # only the DataToExport storing a renamed object have their indexes invalidated
+        unrelated.name = 'renamed'
+        dat1.deepcopy().name = 'renamed'
+        dat1._clone_structure().origin = 'elsewhere'
+        assert not dte._index_stale
+        dat2.name = 'data1D_renamed'
+        assert dte._index_stale and other_dte._index_stale
+        assert dte.get_data_from_name('data1D_renamed') is dat2
+        assert other_dte.get_data_from_name('data1D_renamed') is dat2
+
+        # positions are found without scanning the stored list
+        monkeypatch.setattr(data_mod.DataToExport, 'data', property(lambda dte: 1 / 0))
+        assert dte.index_from_name_origin('data1D_renamed', 'toexport') == 1
+        monkeypatch.undo()
+        dte.pop(0)
+        assert dte._position(dat2) == 0
+
+        # copies rebuild their own indexes
+        dte_copy = copy.deepcopy(dte)
+        dte_copy[0].name = 'copied'
+        assert dte_copy.get_data_from_name('copied') is dte_copy[0]
+        assert dte.get_data_from_name('data1D_renamed') is dat2
+        assert dte_copy.index_from_name_origin('copied', 'toexport') == 0
+
+    def test_append_without_copy(self, ini_data_to_export):
+        dat1, dat2, dte = ini_data_to_export
+        dat3 = init_data(data=DATA1D.copy(), Ndata=2, name='data1D')
+        dat3.origin = 'toexport'
+        dte.append(dat3, copy=False)
+        assert dte.get_data_from_name('data1D') is dat3
+        assert dte.get_names() == ['data2D', 'data1D']
+        dte.append(data_mod.DataToExport('other', data=[dat1]), copy=False)
+        assert dte[1] is dat1
+
+    def test_debug_ownership(self, monkeypatch):
+        monkeypatch.setattr(data_mod.DataToExport, 'debug_ownership', True)
+        dte = data_mod.DataToExport('toexport')
+        frame = DATA2D.copy()
+        buffer = frame.reshape((frame.size,))  # a producer view bypassing the read-only flag
+        dwa = init_data(data=frame, name='frame')
+        dte.append(dwa, copy=False)
+        assert dte[0] is dwa
+        with pytest.raises(ValueError):
+            dwa.data[0][0, 0] = -1
+        dte.check_adopted_data()
+
+        buffer[0] = -1
+        with pytest.raises(data_mod.DataMutationError):
+            dte.check_adopted_data()
+        with pytest.raises(data_mod.DataMutationError):
+            dte.append(init_data(data=DATA2D, name='frame'), copy=False)
+
+    def test_lookup_index_duplicates(self):
+        dat1 = init_data(data=DATA1D, name='data', source='raw')
+        dat1.origin = 'det0'
+        dat2 = init_data(data=DATA1D, name='data', source='calculated')
+        dat2.origin = 'det1'
+        dte = data_mod.DataToExport('toexport', data=[dat1, dat2])
+        assert dte.get_data_from_name('data') is dat1
+        assert dte.get_data_from_name_origin('data', 'det1') is dat2
+        assert dte.get_data_from_source('calculated').data == [dat2]
+        dte.pop(0)
+        assert dte.get_data_from_name('data') is dat2
+        assert len(dte.get_data_from_source('raw')) == 0
+
     def test_get_names(self, ini_data_to_export):
         dat1, dat2, data = ini_data_to_export
         assert data.get_names() == ['data2D', 'data1D']
@@ -1488,6 +1764,108 @@ class TestNumpyUfunc:
         assert np.allclose(dwa_ufunc[0], q.magnitude * DATA1D)
 
 
+class TestUfuncFastPath:
+    @pytest.mark.parametrize('units', ['', 'm', 'mm*m', 'V/mV'])
+    @pytest.mark.parametrize('operation', [lambda dwa: dwa + dwa,
+                                           lambda dwa: dwa * 2,
+                                           lambda dwa: dwa / dwa,
+                                           lambda dwa: dwa * dwa,
+                                           lambda dwa: -dwa,
+                                           lambda dwa: np.sqrt(dwa),
+                                           lambda dwa: np.greater(dwa, dwa)])
+    def test_same_as_pint(self, monkeypatch, units, operation):
+        dwa = data_mod.DataRaw('mydata', units=units, data=[np.arange(5), np.arange(5) + 1])
+        result = operation(dwa)
+
+        monkeypatch.setattr(data_mod, 'get_ufunc_result_units', lambda *args: (False, None))
+        expected = operation(dwa)
+
+        assert result.units == expected.units
+        for ind in range(len(result)):
+            assert result[ind].dtype == expected[ind].dtype
+            assert np.array_equal(result[ind], expected[ind], equal_nan=True)
+
+    def test_result_units(self):
+        dwa = data_mod.DataRaw('mydata', units='m', data=[np.arange(5.)])
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('add', (dwa, dwa)) == (True, 'm')
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('multiply', (dwa, 2)) == (True, 'm')
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('multiply', (dwa, dwa)) == \
+               (True, 'm ** 2')
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('greater', (dwa, dwa)) == \
+               (True, None)
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('add', (dwa, 2)) == (False, None)
+        assert pymodaq_data.numpy_func.get_ufunc_result_units('sin', (dwa,)) == (False, None)
+        assert pymodaq_data.numpy_func.get_ufunc_result_units(
+            'multiply', (dwa, data_mod.Q_(1., 'mm'))) == (False, None)
+
+        with pytest.raises(DimensionalityError):
+            dwa + 2
+
+
+class TestContiguous:
+    def init_data(self, contiguous=True) -> data_mod.DataWithAxes:
+        arrays = [np.random.rand(5, 6) for _ in range(3)]
+        return data_mod.DataRaw('mydata', data=arrays, units='m', nav_indexes=(0,),
+                                axes=[data_mod.Axis('nav', data=np.linspace(0, 4, 5), index=0),
+                                      data_mod.Axis('sig', data=np.linspace(0, 5, 6), index=1)],
+                                contiguous=contiguous)
+
+    def test_storage(self):
+        dwa = self.init_data()
+        assert dwa.contiguous
+        stacked = dwa.get_stacked()
+        assert stacked.shape == (3, 5, 6)
+        for ind in range(len(dwa)):
+            assert np.shares_memory(dwa[ind], stacked)
+
+        array = np.random.rand(5, 6)
+        dwa[1] = array
+        assert np.allclose(stacked[1], array)
+        assert dwa.get_stacked() is stacked
+
+        dwa_copy = dwa.deepcopy()
+        assert dwa_copy.contiguous
+        assert dwa_copy.get_stacked() is not None
+        assert not np.shares_memory(dwa_copy.get_stacked(), stacked)
+
+        stacked_array = dwa.stack_as_array(axis=-1)
+        assert np.allclose(stacked_array, np.stack(dwa.data, axis=-1))
+        assert not np.shares_memory(stacked_array, stacked)
+
+        dwa.data.append(np.random.rand(5, 6))
+        assert dwa.get_stacked() is None
+        dwa.data = dwa.data
+        assert dwa.get_stacked().shape == (4, 5, 6)
+
+        dwa.contiguous = False
+        assert not dwa.contiguous
+        assert dwa.get_stacked() is None
+
+    def test_operations(self):
+        dwa = self.init_data()
+        dwa_list = dwa.deepcopy()
+        dwa_list.contiguous = False
+
+        for result, expected in [(dwa + dwa, dwa_list + dwa_list),
+                                 (dwa * 2, dwa_list * 2),
+                                 (np.sqrt(dwa * dwa), np.sqrt(dwa_list * dwa_list)),
+                                 (dwa.average(dwa * 3, 2), dwa_list.average(dwa_list * 3, 2)),
+                                 (dwa.mean(1), dwa_list.mean(1)),
+                                 (dwa.sum(0), dwa_list.sum(0)),
+                                 (np.max(dwa), np.max(dwa_list)),
+                                 (np.std(dwa, axis=1), np.std(dwa_list, axis=1))]:
+            assert result.contiguous
+            assert result.units == expected.units
+            assert result.shape == expected.shape
+            for ind in range(len(result)):
+                assert np.allclose(result[ind], expected[ind])
+
+        assert dwa == dwa_list
+        assert dwa_list == dwa
+        assert dwa * 2 > dwa * 0.5
+        assert not dwa == dwa * 2
+
+
 class TestFuncNumpy:
     def test_all(self):
         dwa_bool = data_mod.DataRaw('raw', units='', data=[DATA1D == DATA1D])
@@ -1579,3 +1957,74 @@ class TestFuncNumpy:
         assert not np.allclose(dwa_a, dwa_b * 0.1)
 
 
+
+
+class InMemoryLazyArray(data_mod.LazyArray):
+    """LazyArray over a numpy array recording the size of every read"""
+    def __init__(self, array: np.ndarray):
+        super().__init__(array.shape, array.dtype)
+        self._array = array
+        self.read_sizes = []
+
+    def _read(self, item) -> np.ndarray:
+        data = self._array[item]
+        self.read_sizes.append(data.size)
+        return data
+
+
+class TestLazyReduction:
+    @pytest.mark.parametrize('func', [np.sum, np.mean, np.max, np.min, np.std, np.var])
+    @pytest.mark.parametrize('axis', [None, 0, (0, 2), (1, 2)])
+    @pytest.mark.parametrize('dtype', [np.float32, int, complex])
+    def test_reduce(self, func, axis, dtype, monkeypatch):
+        if dtype is complex and func in (np.max, np.min):
+            return
+        array = (np.random.rand(11, 4, 3) * 10).astype(dtype)
+        if dtype is complex:
+            array = array + 1j * np.random.rand(11, 4, 3)
+        lazy = InMemoryLazyArray(array)
+        monkeypatch.setattr(lazy, 'chunk_bytes', array.itemsize * 12 * 3)  # blocks of 3 rows
+        reduced = lazy.reduce(func, axis)
+        expected = func(array, axis)
+        assert reduced.dtype == np.asarray(expected).dtype
+        assert np.allclose(reduced, expected, rtol=1e-4)
+        assert max(lazy.read_sizes) == 3 * 12
+
+    @pytest.mark.filterwarnings('error::RuntimeWarning')
+    def test_ddof_and_fallback(self):
+        array = np.random.rand(11, 4)
+        lazy = InMemoryLazyArray(array)
+        lazy.chunk_bytes = array.itemsize * 4
+        assert np.allclose(lazy.reduce(np.std, 0, ddof=1), np.std(array, 0, ddof=1))
+        assert np.allclose(lazy.reduce(np.var, None, ddof=1), np.var(array, None, ddof=1))
+        assert max(lazy.read_sizes) == 4
+        assert np.allclose(lazy.reduce(np.median, 0), np.median(array, 0))
+        assert lazy.read_sizes[-1] == array.size
+
+    @pytest.mark.filterwarnings('ignore::RuntimeWarning')
+    @pytest.mark.parametrize('func', [np.sum, np.mean, np.std])
+    @pytest.mark.parametrize('axis', [None, 0, 1])
+    def test_empty_first_dimension(self, func, axis):
+        array = np.zeros((0, 4))  # for instance an empty enlargeable array
+        reduced = InMemoryLazyArray(array).reduce(func, axis)
+        expected = np.asarray(func(array, axis))
+        assert reduced.shape == expected.shape
+        assert np.allclose(reduced, expected, equal_nan=True)
+
+    def test_dwa_reduction(self):
+        arrays = [np.random.rand(6, 5, 4) for _ in range(2)]
+        axes = [data_mod.Axis('nav0', data=np.linspace(0, 5, 6), index=0),
+                data_mod.Axis('nav1', data=np.linspace(0, 4, 5), index=1),
+                data_mod.Axis('sig', data=np.linspace(0, 3, 4), index=2)]
+        dwa = data_mod.DataRaw('mydata', data=arrays, nav_indexes=(0, 1), axes=axes)
+        lazy_arrays = [InMemoryLazyArray(array) for array in arrays]
+        for lazy in lazy_arrays:
+            lazy.chunk_bytes = 2 * 5 * 4 * 8  # blocks of 2 rows
+        dwa_lazy = data_mod.DataRaw('mydata', data=lazy_arrays, nav_indexes=(0, 1), axes=axes)
+        for func in (np.mean, np.std, np.max):
+            for axis in (0, (0, 1), None):
+                reduced = func(dwa_lazy, axis=axis)
+                assert reduced == func(dwa, axis=axis)
+                assert reduced.nav_indexes == func(dwa, axis=axis).nav_indexes
+        assert dwa_lazy.mean(0) == dwa.mean(0)
+        assert all([max(array.read_sizes) == 2 * 5 * 4 for array in dwa_lazy.data])
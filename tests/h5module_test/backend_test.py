@@ -144,6 +144,26 @@ class TestH5Backend:
 
         bck.close_file()
 
+    def test_attrs_update_snapshot(self, get_backend):
+        bck = get_backend
+        attrs = dict(attr1='one attr', attr2=(10, 15), attr3=12.4, title='a title')
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        g1.attrs.update(attrs)
+        assert 'attr1' in g1.attrs
+        assert 'title' in g1.attrs
+        assert 'not_an_attr' not in g1.attrs
+
+        snapshot = g1.attrs.snapshot()
+        assert snapshot == g1.attrs.to_dict()
+        assert snapshot['TITLE'] == 'a title'
+        for attr in ['attr1', 'attr2', 'attr3']:
+            assert snapshot[attr] == g1.attrs[attr]
+        utils.check_vals_in_iterable(snapshot['attr2'], attrs['attr2'])
+
+        array = bck.create_carray(g1, 'array', np.array([1, 2, 3]))
+        assert array.attrs.snapshot()['shape'] == (3,)
+        bck.close_file()
+
     @pytest.mark.parametrize('group_type', backends.GroupType.names())
     def test_add_group(self, get_backend, group_type):
         bck = get_backend
@@ -241,6 +261,197 @@ class TestH5Backend:
         for gr in gps:
             assert gr in nodes
 
+    def test_node_cache(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array = bck.create_carray(g1, 'array', np.array([1, 2, 3]))
+        sarray = bck.create_vlarray(g1, 'sarray', dtype='string')
+
+        node = bck.get_node('/g1/array')
+        assert isinstance(node, backends.CARRAY)
+        assert bck.get_node('/g1', 'array') is node
+        assert bck.get_node(g1, 'array') is node
+        assert bck.get_children('/g1')['array'] is node
+        assert g1.children()['array'] is node
+        assert node.parent_node is bck.get_node('/g1')
+        assert isinstance(bck.get_children(g1)['sarray'], backends.StringARRAY)
+        assert [child.name for child in bck.walk_nodes('/')] == \
+               [child.name for child in bck.walk_nodes('/')]
+
+        g1.remove_children()
+        with pytest.raises(backends.NodeError):
+            bck.get_node('/g1/array')
+        g11 = bck.get_set_group(g1, 'array')  # a new node at the same path
+        assert isinstance(bck.get_node('/g1/array'), backends.GROUP)
+        assert bck.get_node('/g1/array') == g11
+
+        filename = bck.filename
+        bck.close_file()
+        bck.open_file(filename, 'a')
+        node = bck.get_node('/g1/array')
+        assert isinstance(node, backends.GROUP)
+        assert node.node == bck.get_node('/g1', 'array').node
+        assert bck.get_node('/g1/array') is node
+
+    def test_node_index(self, get_backend):
+        bck = get_backend
+        filename = bck.filename
+        bck.close_file()
+        assert not bck.use_index
+        bck.use_index = True
+        bck.open_file(filename, 'w')
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        g11 = bck.get_set_group(g1, 'g11')
+        for ind, group in enumerate([g1, g11, g11]):
+            array = bck.create_carray(group, f'array{ind:02d}', np.array([1, 2, 3]))
+            array.attrs.update(dict(data_type='data', data_dimension='Data1D'))
+        bck.create_carray(g11, 'bkg', np.array([1, 2, 3])).attrs['data_type'] = 'bkg'
+        g11.attrs['pixmap2D'] = 'a png'
+
+        def check_lookups():
+            g1, g11 = bck.get_node('/g1'), bck.get_node('/g1/g11')
+            assert [node.name for node in bck.find_nodes('/', data_type='data')] == \
+                   ['array00', 'array01', 'array02']
+            assert [node.path for node in bck.find_nodes(g11, data_type='data')] == \
+                   ['/g1/g11/array01', '/g1/g11/array02']
+            assert bck.find_nodes('/', data_type='bkg')[0].path == '/g1/g11/bkg'
+            assert bck.find_nodes('/', pixmap2D=True) == [g11]
+            assert bck.find_nodes(g1, CLASS='GROUP') == [g1, g11]
+            assert bck.find_nodes('/', shape=(3,), data_dimension='Data1D')[0].name == 'array00'
+            assert bck.count_data_type_nodes(g1, 'data') == 3
+            assert bck.has_node('/g1/g11/bkg')
+            assert not bck.has_node('/g1/bkg')
+            for attributes in [dict(CLASS='GROUP'), dict(CLASS='CARRAY')]:  # in the order of walk_nodes
+                assert bck.find_nodes('/', **attributes) == \
+                       [node for node in bck.walk_nodes('/') if backends.match_node_attributes(node, attributes)]
+
+        for name in ['b', 'a', 'c']:  # created out of the alphabetical order
+            group = bck.get_set_group(bck.root(), name)
+            bck.create_carray(bck.get_set_group(group, 'sub'), 'array', np.array([1, 2, 3]))
+
+        check_lookups()
+        assert bck.get_index()['/g1/g11'] == backends.node_index.get(bck)['/g1/g11']
+
+        filename = bck.filename
+        bck.close_file()
+        assert backends.node_index.get(bck) is None
+        bck.open_file(filename, 'a')
+        assert bck.has_index()
+        assert backends.node_index.get(bck) is not None
+        assert backends.INDEX_NODE_NAME not in bck.get_children('/')
+        assert backends.INDEX_NODE_NAME not in bck.root().children_name()
+        check_lookups()
+
+        bck.get_node('/g1/g11').remove_children()
+        assert bck.find_nodes('/', data_type='data') == [bck.get_node('/g1/array00')]
+        assert not bck.has_node('/g1/g11/bkg')
+
+    def test_legacy_node_index(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        bck.create_carray(g1, 'array', np.array([1, 2, 3])).attrs['data_type'] = 'data'
+        assert backends.node_index.get(bck) is None
+        assert bck.get_index() is None
+        assert bck.find_nodes('/', data_type='data')[0].path == '/g1/array'
+
+        filename = bck.filename
+        bck.close_file()
+        bck.open_file(filename, 'a')
+        assert not bck.has_index()
+        bck.use_index = True
+        bck.rebuild_index()
+        assert bck.has_index()
+        assert list(bck.get_index().keys()) == ['/', '/g1', '/g1/array']
+        assert bck.find_nodes('/', data_type='data')[0].path == '/g1/array'
+
+    def test_stale_node_index(self, get_backend):
+        bck = get_backend
+        filename = bck.filename
+        bck.close_file()
+        bck.use_index = True
+        bck.open_file(filename, 'w')
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        for ind in range(2):
+            bck.create_carray(g1, f'a{ind}', np.array([1, 2, 3])).attrs['data_type'] = 'data'
+        bck.close_file()
+
+        bck.open_file(filename, 'r')
+        assert bck.has_index() and bck.get_index() is backends.node_index.get(bck)
+        other_bck = backends.H5Backend(bck.backend, use_index=True)
+        other_bck.open_file(filename, 'r')  # doesn't wipe the index of bck
+        assert backends.node_index.get(bck) is not None
+        other_bck.close_file()
+        assert [node.name for node in bck.find_nodes('/', data_type='data')] == ['a0', 'a1']
+        bck.close_file()
+
+        if bck.backend == 'tables':  # modify the file without pymodaq
+            with tables.open_file(filename, 'a') as h5file:
+                h5file.remove_node('/g1/a0')
+                h5file.create_array('/g1', 'a2', np.array([1, 2, 3])).attrs['data_type'] = 'data'
+        else:
+            with h5py.File(filename, 'a') as h5file:
+                del h5file['/g1/a0']
+                h5file['/g1/a2'] = np.array([1, 2, 3])
+                h5file['/g1/a2'].attrs.update(dict(CLASS='CARRAY', data_type='data'))
+        bck.open_file(filename, 'a')
+        assert bck.has_index()
+        assert not bck.has_node('/g1/a0')
+        assert bck.has_node('/g1/a2')
+        assert [node.name for node in bck.find_nodes('/', data_type='data')] == ['a1', 'a2']
+
+        bck.close_file()  # the rebuilt index is saved and trusted again
+        bck.open_file(filename, 'r')
+        assert backends.node_index.get(bck) is not None
+        assert list(bck.get_index().keys()) == ['/', '/g1', '/g1/a1', '/g1/a2']
+
+    def test_read_selection(self, get_backend):
+        bck = get_backend
+        array_data = generate_random_data((4, 5, 6, 7))
+        carray = bck.create_carray('/', 'carray', obj=array_data)
+        carray.attrs['nav_indexes'] = (0, 1)
+
+        assert np.allclose(carray.read_selection(), array_data)
+        assert np.allclose(carray.read_selection(nav=(2, -1)), array_data[2, -1])
+        assert np.allclose(carray.read_selection(nav=slice(1, 3), sig=(4, slice(None, -2))),
+                           array_data[1:3, :, 4, :-2])
+        assert np.allclose(carray.read_selection(step=2), array_data[::2, ::2, ::2, ::2])
+        assert np.allclose(carray.read_selection(nav=1, sig=slice(None, None, 3), step=(1, 2, 1, 2)),
+                           array_data[1, ::2, ::3, ::2])
+        assert carray.read_selection(nav=(slice(3, 1), 0)).shape == (0, 6, 7)
+
+        out = np.zeros((6, 7))
+        assert carray.read_selection(nav=(0, 1), out=out) is out
+        assert np.allclose(out, array_data[0, 1])
+
+        with pytest.raises(IndexError):
+            carray.read_selection(nav=(4, 0))
+        with pytest.raises(IndexError):
+            carray.read_selection(sig=(0, 0, 0))
+        with pytest.raises(ValueError):
+            carray.read_selection(nav=slice(None, None, -1))
+        with pytest.raises(TypeError):
+            carray.read_selection(nav=[0, 1])
+
+    def test_count_data_type_nodes(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        g11 = bck.get_set_group(g1, 'g11')
+        for ind, group in enumerate([g1, g11, g11]):
+            array = bck.create_carray(group, f'array{ind:02d}', np.array([1, 2, 3]))
+            array.attrs['data_type'] = 'Data'
+        assert bck.count_data_type_nodes(g1, 'Data') == 3
+        assert bck.count_data_type_nodes(g11, 'Data') == 2
+        assert bck.count_data_type_nodes(g1, 'Axis') == 0
+        assert bck.count_data_type_nodes(array, 'Data') == 1
+
+        backends.node_counters.increment(bck.filename, g11.path, 'Data')
+        assert bck.count_data_type_nodes(g1, 'Data') == 4
+        assert bck.count_data_type_nodes(g11, 'Data') == 3
+
+        g11.remove_children()
+        assert bck.count_data_type_nodes(g1, 'Data') == 1
+        assert bck.count_data_type_nodes(g11, 'Data') == 0
+
     def test_carray(self, get_backend):
         bck = get_backend
         g1 = bck.get_set_group(bck.root(), 'g1')
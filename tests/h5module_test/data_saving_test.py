@@ -4,6 +4,8 @@ Created the 21/11/2022
 
 @author: Sebastien Weber
 """
+import threading
+
 import numpy as np
 import pytest
 from pathlib import Path
@@ -12,7 +14,8 @@ from pymodaq_data.h5modules import saving
 from pymodaq_data.h5modules.data_saving import (
     DataLoader, AxisSaverLoader, DataSaverLoader, DataToExportSaver,
     DataEnlargeableSaver, DataToExportTimedSaver, SPECIAL_GROUP_NAMES, DataToExportExtendedSaver,
-    DataToExportEnlargeableSaver, DataExtendedSaver, DataLoader, BkgSaver, squeeze)
+    DataToExportEnlargeableSaver, DataExtendedSaver, DataLoader, BkgSaver, squeeze,
+    DataToExportAsyncSaver, SaverQueueFull, LazyH5Array, BufferPool)
 from pymodaq_data.data import Axis, DataWithAxes, DataSource, DataToExport, DataRaw, DataDim
 
 
@@ -174,6 +177,21 @@ class TestAxisSaverLoader:
         for axis_ini, axis_out in zip(axes_ini, axis_saver.get_axes(axis_node)):
             assert axis_ini == axis_out
 
+    def test_next_node_index_after_reopen(self, get_h5saver):
+        h5saver = get_h5saver
+        axis_saver = AxisSaverLoader(h5saver)
+        for ind in range(2):
+            axis_saver.add_axis(h5saver.raw_group, init_axis(index=ind))
+        assert axis_saver._get_next_data_type_index_in_group(h5saver.raw_group) == 2
+
+        file_path = Path(h5saver.h5_file_path).joinpath(h5saver.h5_file_name)
+        h5saver.close_file()
+        h5saver.init_file(file_name=file_path, new_file=False)
+        assert axis_saver._get_next_data_type_index_in_group(h5saver.raw_group) == 2
+        axis_node = axis_saver.add_axis(h5saver.raw_group, init_axis(index=2))
+        assert axis_node.name == axis_saver._format_node_name(2)
+        assert axis_saver._get_next_data_type_index_in_group(h5saver.raw_group) == 3
+
 
 class TestDataSaverLoader:
     def test_init(self, get_h5saver):
@@ -249,6 +267,7 @@ class TestDataSaverLoader:
         assert len(loaded_data) == 2
         assert loaded_data == data
         assert loaded_data.labels == data.labels
+        assert 'chunkshape' not in loaded_data.extra_attributes
         for ind in range(Ndata):
             assert np.all(loaded_data.errors[ind] == errors[ind])
 
@@ -293,6 +312,61 @@ class TestDataSaverLoader:
 
         assert loaded_data == data-data
 
+    @pytest.mark.parametrize('backend', ['tables', 'h5py'])
+    def test_load_reuse_buffers(self, tmp_path, backend):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        data_saver = DataSaverLoader(h5saver)
+        bkg_saver = BkgSaver(h5saver)
+
+        data = DataWithAxes(name='mydata', data=[DATA2D * 1., DATA2D * 2.], source='raw',
+                            dim='Data2D', distribution='uniform')
+        data_saver.add_data(h5saver.raw_group, data)
+        bkg_saver.add_data('/RawData', data * 0.5)
+
+        expected = data_saver.load_data('/RawData/Data01', load_all=True, with_bkg=True)
+        loaded = data_saver.load_data('/RawData/Data01', load_all=True, with_bkg=True,
+                                      reuse_buffers=True)
+        assert loaded == expected
+        assert loaded == data * 0.5
+        buffers = [array for array in loaded.data]
+        loaded_again = data_saver.load_data('/RawData/Data01', load_all=True, with_bkg=True,
+                                            reuse_buffers=True)
+        assert loaded_again == expected
+        for array, buffer in zip(loaded_again.data, buffers):
+            assert np.shares_memory(array, buffer)
+
+        out = [np.zeros(DATA2D.shape) for _ in range(2)]
+        arrays = data_saver.get_data_arrays('/RawData/Data01', load_all=True, out=out)
+        for ind, array in enumerate(arrays):
+            assert np.shares_memory(array, out[ind])
+            assert np.allclose(out[ind], DATA2D * (ind + 1))
+        loaded = data_saver.load_data('/RawData/Data01', load_all=True, with_bkg=True, out=out)
+        assert loaded == expected
+        for ind, array in enumerate(loaded.data):
+            assert np.shares_memory(array, out[ind])
+        h5saver.close_file()
+
+    @pytest.mark.parametrize('backend', ['tables', 'h5py'])
+    def test_load_reuse_buffers_int_data(self, tmp_path, backend):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        data_saver = DataSaverLoader(h5saver)
+        bkg_saver = BkgSaver(h5saver)
+
+        data_array = np.arange(12, dtype=np.int32).reshape((3, 4))
+        data = DataWithAxes(name='mydata', data=[data_array], source='raw', dim='Data2D',
+                            distribution='uniform')
+        data_saver.add_data(h5saver.raw_group, data)
+        bkg_saver.add_data('/RawData', DataWithAxes(name='mydata', data=[data_array * 0.5], source='raw',
+                                                    dim='Data2D', distribution='uniform'))
+
+        for _ in range(2):
+            loaded = data_saver.get_data_arrays('/RawData/Data00', with_bkg=True, reuse_buffers=True)
+            assert loaded[0].dtype == np.float64
+            assert np.allclose(loaded[0], data_array * 0.5)
+        h5saver.close_file()
+
 
     def test_extra_attributes_and_timestamping(self, get_h5saver):
         h5saver = get_h5saver
@@ -327,6 +401,26 @@ class TestDataSaverLoader:
         assert loaded_data.timestamp == data.timestamp
 
 
+class TestBufferPool:
+    def test_get(self, monkeypatch):
+        pool = BufferPool()
+        buffer = pool.get((5, 6), float)
+        assert buffer.shape == (5, 6)
+        assert buffer.dtype == np.float64
+        assert pool.get((5, 6), float) is buffer
+        assert pool.get((5, 6), float, index=1) is not buffer
+        assert pool.get((5, 6), float, tag='bkg') is not buffer
+        assert pool.get((5, 6), np.int32) is not buffer
+        assert pool.nbytes == 3 * buffer.nbytes + 30 * 4
+
+        monkeypatch.setattr(BufferPool, 'max_bytes', 2 * buffer.nbytes)
+        other = pool.get((2, 3), float)
+        assert pool.nbytes <= 2 * buffer.nbytes
+        assert pool.get((2, 3), float) is other
+        pool.clear()
+        assert pool.nbytes == 0
+
+
 class TestBkgSaver:
     def test_load_data(self, get_h5saver):
         h5saver = get_h5saver
@@ -386,6 +480,45 @@ class TestDataEnlargeableSaver:
         if Nenl > 0:
             assert len(dwa_back.get_nav_axes()[0]) == 2
 
+    @pytest.mark.parametrize('backend', ['tables', 'h5py'])
+    @pytest.mark.parametrize('data_array', [DATA0D, DATA1D, DATA2D])
+    def test_buffered_add_data(self, tmp_path, backend, data_array):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        data_saver = DataEnlargeableSaver(h5saver, buffer_size=3)
+
+        data = DataWithAxes(name='mydata', data=[data_array], source='raw',
+                            distribution='uniform',)
+        data.create_missing_axes()
+
+        for ind in range(4):
+            data_saver.add_data(h5saver.raw_group, data.deepcopy() * ind, axis_values=[ind])
+            if ind < 2:
+                assert data_saver.buffer_length == ind + 1
+        data_node = h5saver.get_node('/RawData/EnlData00')
+        assert data_node.attrs['shape'] == tuple([3] + list(data_array.shape))
+        assert data_saver.buffer_length == 1
+
+        data_saver.flush()
+        assert data_saver.buffer_length == 0
+        assert data_node.attrs['shape'] == tuple([4] + list(data_array.shape))
+        axis_node = data_saver._axis_saver.get_node_from_index('/RawData', 0)
+        assert axis_node.attrs['shape'] == (4,)
+        assert np.allclose(squeeze(axis_node.read()), [0, 1, 2, 3])
+
+        array_back = data_node.read()
+        for ind in range(4):
+            assert np.allclose(array_back[ind], data_array * ind)
+        data_saver.close_file()
+
+    def test_buffer_time(self, get_h5saver):
+        h5saver = get_h5saver
+        data_saver = DataEnlargeableSaver(h5saver, buffer_size=None, buffer_time=0.)
+        data = DataWithAxes(name='mydata', data=[DATA1D], source='raw')
+        data_saver.add_data(h5saver.raw_group, data)
+        assert data_saver.buffer_length == 0
+        assert h5saver.get_node('/RawData/EnlData00').attrs['shape'] == (1, DATA1D.size)
+
 
 class TestDataExtendedSaver:
     def test_init(self, get_h5saver):
@@ -484,6 +617,59 @@ class TestDataToExportEnlargeableSaver:
             f'/RawData/{DataDim.from_data_array(data_array).name}/CH00/EnlData00')
         assert data_loaded.inav[0] == dwa
 
+    @pytest.mark.parametrize('close_from_h5saver', [False, True])
+    def test_buffered_save(self, tmp_path, init_data_to_export, close_from_h5saver):
+        file_path = tmp_path.joinpath('h5file.h5')
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.init_file(file_name=file_path)
+        data_to_export = init_data_to_export
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        data_saver = DataToExportEnlargeableSaver(h5saver, buffer_size=10)
+        Nadd_data = 4
+        for ind in range(Nadd_data):
+            data_saver.add_data(det_group, data_to_export, axis_values=[float(ind)])
+        assert data_saver.buffer_length == Nadd_data
+        for node in h5saver.walk_nodes('/'):
+            if 'shape' in node.attrs and node.name != 'Logger' and 'data' in node.attrs['data_type']:
+                assert node.attrs['shape'][0] == 0
+        if close_from_h5saver:  # the buffered data are flushed from the close hook
+            h5saver.close_file()
+        else:
+            data_saver.close_file()
+
+        h5saver.init_file(file_name=file_path)
+        for node in h5saver.walk_nodes('/'):
+            if 'shape' in node.attrs and node.name != 'Logger' and 'data' in node.attrs['data_type']:
+                assert node.attrs['shape'][0] == Nadd_data
+        nav_group = h5saver.get_node('/RawData/MyDet/NavAxes')
+        axis_node = AxisSaverLoader(h5saver).get_node_from_index(nav_group, 0)
+        assert axis_node.attrs['size'] == Nadd_data
+        assert np.allclose(squeeze(axis_node.read()), np.arange(Nadd_data))
+        h5saver.close_file()
+
+    @pytest.mark.parametrize('buffer_size, copies', [(1, [False] * 4),
+                                                     (3, [True, True, False, True]),
+                                                     (None, [True] * 4)])
+    def test_buffered_copies(self, get_h5saver, init_data_to_export, buffer_size, copies,
+                             monkeypatch):
+        h5saver = get_h5saver
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+        data_saver = DataToExportEnlargeableSaver(h5saver, buffer_size=buffer_size)
+
+        copied = []
+        add_data = data_saver._data_saver.add_data
+
+        def spy_add_data(where, dwa, **kwargs):
+            copied.append(kwargs['copy'])
+            add_data(where, dwa, **kwargs)
+
+        monkeypatch.setattr(data_saver._data_saver, 'add_data', spy_add_data)
+        for ind in range(len(copies)):
+            data_saver.add_data(det_group, init_data_to_export, axis_values=[float(ind)])
+        n_dwa = len(init_data_to_export)
+        assert copied == [copy for copy in copies for _ in range(n_dwa)]
+
 
 class TestDataToExportTimedSaver:
     def test_save(self, get_h5saver, init_data_to_export):
@@ -524,6 +710,97 @@ class TestDataToExportExtendedSaver:
         data_saver.add_data(det_group, data_to_export, INDEXES)
 
 
+class BlockingTimedSaver(DataToExportTimedSaver):
+    """Timed saver waiting for an event before each write"""
+    def __init__(self, h5saver, event: threading.Event):
+        super().__init__(h5saver)
+        self.event = event
+
+    def add_data(self, *args, **kwargs):
+        self.event.wait()
+        super().add_data(*args, **kwargs)
+
+
+class TestDataToExportAsyncSaver:
+    def test_save(self, tmp_path, init_data_to_export):
+        file_path = tmp_path.joinpath('h5file.h5')
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.init_file(file_name=file_path)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        Nadd_data = 5
+        with DataToExportAsyncSaver(DataToExportTimedSaver(h5saver), queue_size=2) as saver:
+            for ind in range(Nadd_data):
+                saver.add_data(det_group, init_data_to_export)
+            saver.join()
+            assert saver.queue_depth == 0
+            stats = saver.stats
+            assert stats['written'] == Nadd_data
+            assert stats['dropped'] == 0
+            assert stats['max_queue_depth'] <= 2
+            assert stats['latency_max'] >= stats['latency_mean'] > 0.
+        assert not saver.isopen()
+        assert not h5saver.isopen()
+        with pytest.raises(ValueError):
+            saver.add_data(det_group, init_data_to_export)
+
+        h5saver.init_file(file_name=file_path)
+        for node in h5saver.walk_nodes('/'):
+            if 'shape' in node.attrs and node.name != 'Logger' and 'data' in node.attrs['data_type']:
+                assert node.attrs['shape'][0] == Nadd_data
+        h5saver.close_file()
+
+    @pytest.mark.parametrize('policy', ['drop_oldest', 'error'])
+    def test_queue_full(self, get_h5saver, init_data_to_export, policy):
+        h5saver = get_h5saver
+        event = threading.Event()
+        saver = DataToExportAsyncSaver(BlockingTimedSaver(h5saver, event), queue_size=2,
+                                       policy=policy)
+        saver.add_data(h5saver.raw_group, init_data_to_export)
+        while saver.queue_depth != 0:  # the writer thread is now waiting for the event
+            pass
+        saver.add_data(h5saver.raw_group, init_data_to_export)
+        saver.add_data(h5saver.raw_group, init_data_to_export)
+        if policy == 'error':
+            with pytest.raises(SaverQueueFull):
+                saver.add_data(h5saver.raw_group, init_data_to_export)
+        else:
+            saver.add_data(h5saver.raw_group, init_data_to_export)
+            assert saver.stats['dropped'] == 1
+        event.set()
+        saver.join()
+        assert saver.stats['written'] == 3
+        assert len(saver.errors) == 0
+        saver.close()
+
+    def test_close_error(self, get_h5saver, init_data_to_export, monkeypatch):
+        h5saver = get_h5saver
+        timed_saver = DataToExportTimedSaver(h5saver)
+
+        def close_file():
+            raise IOError('cannot close')
+
+        monkeypatch.setattr(timed_saver, 'close_file', close_file)
+        saver = DataToExportAsyncSaver(timed_saver)
+        saver.add_data(h5saver.raw_group, init_data_to_export)
+
+        raised = []
+
+        def close():
+            try:
+                saver.close()
+            except IOError as e:
+                raised.append(e)
+
+        closing_thread = threading.Thread(target=close, daemon=True)
+        closing_thread.start()
+        closing_thread.join(timeout=10)
+        assert not closing_thread.is_alive()
+        assert len(raised) == 1
+        assert saver.errors == raised
+        assert not saver.isopen()
+
+
 class TestDataLoader:
     def test_load_normal_data(self, get_h5saver, init_data_to_export):
         h5saver = get_h5saver
@@ -540,6 +817,11 @@ class TestDataLoader:
         for ind in range(len(data_loaded)):
             assert np.all(data_loaded[ind] == pytest.approx(DATA2D))
 
+        out = [np.zeros(DATA2D.shape)]
+        data_loaded = data_loader.load_data('/RawData/MyDet/Data2D/CH00/Data00', out=out)
+        assert np.shares_memory(data_loaded[0], out[0])
+        assert np.allclose(out[0], DATA2D)
+
     def test_load_one_node(self, get_h5saver, init_data_to_export):
         h5saver = get_h5saver
         data_to_export = init_data_to_export
@@ -639,3 +921,103 @@ class TestDataLoader:
         # axis node from this type of loading should be 'index'
         assert dwa.axes[0].units == UNITS  # should not be that as the retrieved axis units of an
         # axis node from this type of loading should be ''
+
+    @pytest.mark.parametrize('backend', ['tables', 'h5py'])
+    @pytest.mark.parametrize('data_array', [DATA0D, DATA1D, DATA2D])
+    def test_load_lazy(self, tmp_path, backend, data_array, monkeypatch):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        EXT_SHAPE = (3, 4)
+        data_saver = DataToExportExtendedSaver(h5saver, extended_shape=EXT_SHAPE)
+        data_saver.add_nav_axes(h5saver.raw_group,
+                                [Axis('navaxis0', '', data=np.linspace(0, EXT_SHAPE[0] - 1,
+                                                                       EXT_SHAPE[0]), index=0),
+                                 Axis('navaxis1', '', data=np.linspace(0, EXT_SHAPE[1] - 1,
+                                                                       EXT_SHAPE[1]), index=1)])
+        for ind0 in range(EXT_SHAPE[0]):
+            for ind1 in range(EXT_SHAPE[1]):
+                dwa = DataRaw('mydata', data=[data_array * (ind0 + 1) + ind1,
+                                              -data_array * ind1])
+                data_saver.add_data(h5saver.raw_group, DataToExport('dte', data=[dwa]),
+                                    [ind0, ind1])
+
+        path = f'/RawData/{DataDim.from_data_array(data_array).name}/CH00/Data00'
+        data_loader = DataLoader(h5saver)
+        dwa_eager = data_loader.load_data(path, load_all=True)
+        dwa_lazy = data_loader.load_data(path, load_all=True, lazy=True)
+        assert all([isinstance(array, LazyH5Array) for array in dwa_lazy.data])
+        assert dwa_lazy.shape == dwa_eager.shape
+        assert dwa_lazy.nav_indexes == dwa_eager.nav_indexes
+
+        items = []
+        read_backend = LazyH5Array._read_backend
+
+        def spy_read_backend(proxy, item):
+            items.append(item)
+            return read_backend(proxy, item)
+        monkeypatch.setattr(LazyH5Array, '_read_backend', spy_read_backend)
+
+        assert dwa_lazy.inav[1, 2] == dwa_eager.inav[1, 2]
+        assert len(items) == len(dwa_lazy)
+        assert not any([all([it == slice(None) for it in item]) for item in items])
+        # only hyperslabs have been read
+
+        assert dwa_lazy.inav[:, 1:3] == dwa_eager.inav[:, 1:3]
+        assert np.allclose(dwa_lazy[1][..., 0], dwa_eager[1][..., 0])
+        assert dwa_lazy.deepcopy().data[0] is dwa_lazy.data[0]
+
+        monkeypatch.setattr(LazyH5Array, 'chunk_bytes', 1)  # reads the nav rows one by one
+        n_items = len(items)
+        assert np.mean(dwa_lazy) == np.mean(dwa_eager)
+        assert np.std(dwa_lazy, axis=0) == np.std(dwa_eager, axis=0)
+        assert len(items) - n_items == len(dwa_lazy) * 2 * EXT_SHAPE[0]
+        assert not any([all([it == slice(None) for it in item]) for item in items[n_items:]])
+        assert dwa_lazy + 1 == dwa_eager + 1
+        assert all([it == slice(None) for it in items[-1]])
+        h5saver.close_file()
+
+    @pytest.mark.parametrize('backend', ['tables', 'h5py'])
+    @pytest.mark.parametrize('data_array', [DATA0D, DATA1D, DATA2D])
+    def test_load_selection(self, tmp_path, backend, data_array):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        EXT_SHAPE = (3, 4)
+        data_saver = DataToExportExtendedSaver(h5saver, extended_shape=EXT_SHAPE)
+        data_saver.add_nav_axes(h5saver.raw_group,
+                                [Axis('navaxis0', '', data=np.linspace(0, EXT_SHAPE[0] - 1,
+                                                                       EXT_SHAPE[0]), index=0),
+                                 Axis('navaxis1', '', offset=1., scaling=0.5, size=EXT_SHAPE[1],
+                                      index=1)])
+        for ind0 in range(EXT_SHAPE[0]):
+            for ind1 in range(EXT_SHAPE[1]):
+                dwa = DataRaw('mydata', data=[data_array * (ind0 + 1) + ind1])
+                data_saver.add_data(h5saver.raw_group, DataToExport('dte', data=[dwa]),
+                                    [ind0, ind1])
+
+        path = f'/RawData/{DataDim.from_data_array(data_array).name}/CH00/Data00'
+        data_loader = DataLoader(h5saver)
+        dwa = data_loader.load_data(path)
+
+        point = data_loader.load_data(path, nav=(1, 2))
+        assert point == dwa.inav[1, 2]
+        assert point.axes == dwa.inav[1, 2].axes
+        assert point.nav_indexes == ()
+
+        preview = data_loader.load_data(path, step=2)
+        expected = dwa.inav[::2, ::2]
+        if len(dwa.sig_indexes) != 0:
+            expected = expected.isig[tuple([slice(None, None, 2) for _ in dwa.sig_indexes])]
+        assert preview == expected
+        assert preview.get_nav_axes() == expected.get_nav_axes()
+        assert preview.nav_indexes == (0, 1)
+
+        if len(dwa.sig_indexes) != 0:
+            line = data_loader.load_data(path, nav=(slice(None), 3), sig=1)
+            expected = dwa.inav[:, 3].isig[(1,) + tuple([slice(None) for _ in dwa.sig_indexes[1:]])]
+            assert line == expected
+            assert line.get_nav_axes() == expected.get_nav_axes()
+            assert line.get_sig_index() == expected.get_sig_index()
+
+        node = h5saver.get_node(path)
+        assert np.allclose(node.read_selection(nav=(1, 2)), dwa.inav[1, 2][0])
+        h5saver.close_file()
@@ -1,3 +1,5 @@
+import sys
+
 import numpy as np
 from pathlib import Path
 import pytest
@@ -73,6 +75,34 @@ class TestH5Exporter:
             assert ext in list(factory.exporters_registry.keys())
 
 
+def test_lazy_exporters_registration(monkeypatch):
+    monkeypatch.setattr(h5export.ExporterFactory, '_exporters_registry', {})
+    monkeypatch.setattr(h5export.ExporterFactory, '_all_loaded', False)
+    monkeypatch.delitem(sys.modules, 'pymodaq_data.h5modules.exporters.base', raising=False)
+
+    exporter = h5export.ExporterFactory.create_exporter('npy', 'Binary NumPy format')
+    assert exporter.FORMAT_EXTENSION == 'npy'
+    assert 'pymodaq_data.h5modules.exporters.base' in sys.modules
+    assert not h5export.ExporterFactory._all_loaded  # found from the manifest
+
+    with pytest.raises(ValueError):
+        h5export.ExporterFactory.create_exporter('xyz', 'Unknown format')
+    assert h5export.ExporterFactory._all_loaded
+
+
+def test_exporters_registry_access(monkeypatch):
+    monkeypatch.setattr(h5export.ExporterFactory, '_exporters_registry', {})
+    monkeypatch.setattr(h5export.ExporterFactory, '_all_loaded', False)
+    monkeypatch.setattr(h5export, 'register_exporters',
+                        lambda: register_exporter('pymodaq_data.h5modules'))
+    monkeypatch.delitem(sys.modules, 'pymodaq_data.h5modules.exporters.base', raising=False)
+
+    # accessing the registry registers all the exporters
+    assert 'txt' in h5export.ExporterFactory.exporters_registry
+    assert h5export.ExporterFactory._all_loaded
+    assert h5export.ExporterFactory().exporters_registry is h5export.ExporterFactory._exporters_registry
+
+
 def test_register_exporter():
 
     exporter_modules = register_exporter('pymodaq_data.h5modules')
@@ -80,7 +80,44 @@ class TestH5SaverLowLevel:
         #"todo
         pass
 
+    @pytest.mark.parametrize('backend', tested_backend)
+    @pytest.mark.parametrize('chunk_hint', saving.ChunkHint.names())
+    def test_add_array_chunk_hint(self, tmp_path, backend, chunk_hint):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        array = h5saver.add_array(h5saver.raw_group, 'scan', 'data', data_shape=(64, 128),
+                                  array_type=np.float64, scan_shape=(10, 20), add_scan_dim=True,
+                                  data_dimension='Data2D', chunk_hint=chunk_hint)
+        earray = h5saver.add_array(h5saver.raw_group, 'enl', 'data', data_shape=(128,),
+                                   array_type=np.float64, enlargeable=True,
+                                   data_dimension='Data1D', chunk_hint=chunk_hint)
+        for node in [array, earray]:
+            if node.chunkshape is None:
+                assert 'chunkshape' not in node.attrs
+            else:
+                assert node.attrs['chunkshape'] == node.chunkshape
+        if chunk_hint == 'write_signal':
+            assert array.chunkshape == (1, 1, 64, 128)
+            assert earray.chunkshape[1:] == (128,)
+        elif chunk_hint == 'read_nav':
+            assert array.chunkshape[:2] == (10, 20)
+        h5saver.close_file()
+
     def test_incremental_group(self, get_h5saver_lowlevel):
         # "todo
         h5saver = get_h5saver_lowlevel
 
+
+def test_plan_chunkshape():
+    assert saving.plan_chunkshape((10, 20, 64, 128), 2, 8, 'auto') is None
+    assert saving.plan_chunkshape((10, 20, 64, 128), 2, 8, 'write_signal') == (1, 1, 64, 128)
+    assert saving.plan_chunkshape((10, 20, 2048, 2048), 2, 8, 'write_signal') == (1, 1, 256, 512)
+    assert saving.plan_chunkshape((10, 20, 512), 2, 8, 'read_nav') == (10, 20, 11)
+    # scalar data in a scan: the whole (small) array fits in a single chunk
+    assert saving.plan_chunkshape((10, 20), 2, 8, 'write_signal') == (10, 20)
+    # enlargeable: several signals per chunk
+    assert saving.plan_chunkshape((0,), 1, 8, 'write_signal', enlargeable=True) == \
+           (saving.CHUNK_MAX_ROWS,)
+    assert saving.plan_chunkshape((0, 256), 1, 8, 'write_signal', enlargeable=True) == (8, 256)
+    chunk = saving.plan_chunkshape((100, 100, 100, 100), 2, 8, 'read_nav')
+    assert np.prod(chunk) * 8 <= saving.CHUNK_MAX_BYTES
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+# budget in seconds of a cold "import pymodaq_data" (including numpy and pint), generous to avoid
+# failures on slow machines while still catching a heavy dependency imported eagerly
+IMPORT_BUDGET = 3.
+
+# modules that should only be imported when exporters, plotters or h5 files are used
+LAZY_MODULES = ('pymodaq_data.h5modules', 'pymodaq_data.h5modules.exporters.base',
+                'pymodaq_data.plotting.plotter.plotters.matplotlib_plotters', 'tables', 'h5py',
+                'matplotlib', 'hyperspy')
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True,
+                          text=True, check=True)
+
+
+def test_import_lazy_modules():
+    result = run_python('import sys; import pymodaq_data.data; '
+                        f'print([module for module in {LAZY_MODULES} if module in sys.modules])')
+    assert result.stdout.strip() == '[]'
+
+
+def test_import_time_budget():
+    result = run_python('import pymodaq_data')
+    cumulative = [int(line.split('|')[1]) for line in result.stderr.splitlines()
+                  if line.startswith('import time:') and line.split('|')[2].strip() == 'pymodaq_data']
+    assert len(cumulative) == 1
+    assert cumulative[0] * 1e-6 < IMPORT_BUDGET
+
+
+def test_lazy_plotter_registration():
+    pytest.importorskip('matplotlib')
+    result = run_python('from pymodaq_data.data import plotter_factory; '
+                        'print(plotter_factory.backends())')
+    assert 'matplotlib' in result.stdout
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from pymodaq_data.data import DataRaw, Axis, DataToExport
+from pymodaq_data.post_treatment.pipeline import DataPipeline, get_structure_key
+from pymodaq_data.post_treatment.process_to_scalar import DataProcessorFactory
+
+processors = DataProcessorFactory()
+
+x = np.linspace(-1, 1, 40)
+y = np.linspace(-2, 2, 20)
+
+
+def init_frame(contiguous=False, name='camera'):
+    return DataRaw(name, data=[np.random.rand(20, 40) for _ in range(2)], contiguous=contiguous,
+                   axes=[Axis('y', 's', data=y, index=0), Axis('x', 's', data=x, index=1)])
+
+
+def init_spectra(contiguous=False):
+    return DataRaw('spectra', data=[np.random.rand(5, 40) for _ in range(3)], nav_indexes=(0,),
+                   contiguous=contiguous,
+                   axes=[Axis('nav', 'm', data=np.linspace(0, 4, 5), index=0),
+                         Axis('wavelength', 'nm', data=np.linspace(500, 600, 40) ** 2, index=1)])
+
+
+def assert_same(processed, expected):
+    assert processed == expected
+    assert processed.name == expected.name
+    assert processed.axes == expected.axes
+    assert processed.labels == expected.labels
+    assert processed.nav_indexes == expected.nav_indexes
+    assert processed.dim == expected.dim
+
+
+@pytest.mark.parametrize('contiguous', [False, True])
+@pytest.mark.parametrize('processor_name', processors.functions)
+def test_pipeline_processors(contiguous, processor_name):
+    pipeline = DataPipeline().isig[5:15, 10:30]
+    if processor_name in ('argmean', 'argstd'):
+        pipeline.vsig[-1.:1., 0.]
+    pipeline.process(processor_name)
+    for _ in range(3):
+        frame = init_frame(contiguous)
+        sub_data = frame.isig[5:15, 10:30]
+        if processor_name in ('argmean', 'argstd'):
+            sub_data = sub_data.vsig[-1.:1., 0.]
+        assert_same(pipeline(frame), processors.get(processor_name).process(sub_data))
+    assert len(pipeline._plans) == 1
+
+
+@pytest.mark.parametrize('contiguous', [False, True])
+def test_pipeline_reductions_and_ft(contiguous):
+    pipeline = DataPipeline().vsig[-1.5:1.5, -0.5:0.5].mean(axis=0).ft(0).ift(0)
+    pipeline_sum = DataPipeline().inav[1:4].sum()
+    for _ in range(3):
+        frame = init_frame(contiguous)
+        expected = np.mean(frame.vsig[-1.5:1.5, -0.5:0.5], axis=0).ft(0).ift(0)
+        assert_same(pipeline(frame), expected)
+
+        spectra = init_spectra(contiguous)
+        assert_same(pipeline_sum(spectra), np.sum(spectra.inav[1:4]))
+
+
+def test_pipeline_interp():
+    new_axis = np.linspace(-0.8, 0.8, 15)
+    pipeline = DataPipeline().isig[:, 3].interp(new_axis)
+    for _ in range(2):
+        frame = init_frame()
+        assert_same(pipeline(frame), frame.isig[:, 3].interp(new_axis))
+
+
+def test_pipeline_function_step():
+    pipeline = DataPipeline().isig[2:18, 0:35].apply(lambda dwa: dwa.abs()).max(axis=1)
+    for _ in range(2):
+        frame = init_frame() - 0.5
+        assert_same(pipeline(frame), np.max(frame.isig[2:18, 0:35].abs(), axis=1))
+
+    last_step = DataPipeline().inav[2].apply(lambda dwa: dwa * 2)
+    spectra = init_spectra()
+    assert_same(last_step(spectra), spectra.inav[2] * 2)
+
+
+def test_pipeline_structures():
+    pipeline = DataPipeline().isig[2:4].process('sum')
+    spectra = init_spectra()
+    other_axis = init_spectra()
+    other_axis.axes[1].data = np.linspace(0, 1, 40) ** 3
+    other_shape = DataRaw('spectra', data=[np.random.rand(7, 40) for _ in range(3)], nav_indexes=(0,))
+
+    for data in (spectra, other_axis, other_shape, spectra):
+        assert_same(pipeline(data), processors.get('sum').process(data.isig[2:4]))
+    assert len(pipeline._plans) == 3
+
+    pipeline.isig[0]
+    assert len(pipeline._plans) == 0
+
+
+def test_structure_key_shared_axes():
+    spectra = init_spectra()
+    copied = spectra.deepcopy_with_new_data([np.random.rand(5, 40) for _ in range(3)])
+    shared = copied.axes[1]._data
+    assert not shared.flags.writeable  # read-only view of the original axis data
+    axes_key = get_structure_key(spectra)[-1]
+    assert get_structure_key(copied)[-1] == axes_key
+    assert copied.axes[1]._data is shared  # not copied by the key computation
+    assert get_structure_key(copied)[-1] == axes_key
+
+    copied.axes[1].data = np.linspace(0, 1, 40) ** 3
+    assert get_structure_key(copied)[-1] != axes_key
+
+
+def test_pipeline_dte():
+    pipeline = DataPipeline().isig[5:15, 10:30].process('max')
+    for _ in range(2):
+        dte = DataToExport('frames', data=[init_frame(name='cam0'), init_frame(True, name='cam1')])
+        processed = pipeline(dte)
+        assert isinstance(processed, DataToExport)
+        assert processed.name == 'frames'
+        assert len(processed) == 2
+        for dwa in dte:
+            assert_same(processed.get_data_from_name(dwa.name),
+                        processors.get('max').process(dwa.isig[5:15, 10:30]))
+    assert len(pipeline._plans) == 2
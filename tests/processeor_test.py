@@ -1,7 +1,9 @@
 import numpy as np
+import pytest
 
-from pymodaq_data.post_treatment.process_to_scalar import DataProcessorFactory
-from pymodaq_data.data import DataRaw, Axis
+from pymodaq_data.post_treatment.process_to_scalar import (DataProcessorFactory, DataProcessorBase,
+                                                            get_executor, shutdown_executors)
+from pymodaq_data.data import DataRaw, Axis, DataDim
 
 from pymodaq_utils import math_utils as mutils
 
@@ -37,3 +39,103 @@ data = DataRaw('mydata', data=[dat], nav_indexes=(0,),
 new_data = processors.get('sum', **config_processors).operate(data.isig[25:75, 75:125])
 print(new_data)
 print(new_data.data)
+
+
+@pytest.mark.parametrize('processor_name', processors.functions)
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_backends(processor_name, backend):
+    data_1d = DataRaw('mydata', data=[np.random.rand(7, 30) for _ in range(3)], nav_indexes=(0,),
+                      axes=[Axis('nav', data=np.linspace(0, 6, 7), index=0),
+                            Axis('sig', data=np.linspace(-1, 1, 30), index=1)])
+    for sub_data in (data_1d, data.isig[25:75, 75:125]):
+        if processor_name in ('argmean', 'argstd'):
+            sub_data = sub_data.inav[3]
+        if processors.get(processor_name).apply_to < sub_data.dim:
+            continue
+        expected = processors.get(processor_name).process(sub_data)
+        parallel_factory = DataProcessorFactory(backend=backend, n_workers=4)
+        processor = parallel_factory.get(processor_name)
+        assert processor.backend == backend
+        assert processor.n_workers == 4
+        processed = processor.process(sub_data)
+        assert processed == expected
+        assert processed.axes == expected.axes
+        assert processed.labels == expected.labels
+
+
+class LegacyProcessorFactory(DataProcessorFactory):
+    pass
+
+
+@LegacyProcessorFactory.register('legacy')
+class LegacyProcessor(DataProcessorBase):
+    """Processor whose __init__ does not accept the backend and n_workers arguments"""
+    apply_to = DataDim['DataND']
+
+    def __init__(self):
+        super().__init__()
+
+    def operate(self, sub_data):
+        return sub_data
+
+
+def test_factory_arguments():
+    factory = LegacyProcessorFactory(backend='thread', n_workers=2)
+    processor = factory.get('legacy')
+    assert processor.backend == 'sequential'
+    with pytest.raises(TypeError):
+        factory.get('legacy', backend='thread')
+
+    processor = DataProcessorFactory(backend='thread', n_workers=2).get('sum')
+    assert processor.backend == 'thread'
+    assert processor.n_workers == 2
+
+
+def test_shutdown_executors():
+    executor = get_executor('thread', 2)
+    assert get_executor('thread', 2) is executor
+    shutdown_executors()
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+    assert get_executor('thread', 2) is not executor
+    shutdown_executors()
+
+
+@pytest.mark.parametrize('contiguous', [False, True])
+def test_stacked_kernels(contiguous):
+    arrays = [np.random.rand(7, 30) for _ in range(3)]
+    sig = np.linspace(-1, 1, 30)
+    data_1d = DataRaw('mydata', data=arrays, nav_indexes=(0,), contiguous=contiguous,
+                      axes=[Axis('nav', data=np.linspace(0, 6, 7), index=0),
+                            Axis('sig', data=sig, index=1)])
+    assert (data_1d.get_stacked() is not None) == contiguous
+
+    for processor_name, func in (('argmax', np.argmax), ('argmin', np.argmin)):
+        processed = processors.get(processor_name).process(data_1d)
+        for array, processed_array in zip(arrays, processed):
+            assert np.allclose(processed_array, sig[func(array, axis=1)])
+
+    for processor_name in ('argmean', 'argstd'):
+        processed = processors.get(processor_name).process(data_1d)
+        for array, processed_array in zip(arrays, processed):
+            means = np.array([np.average(sig, weights=weights) for weights in array])
+            if processor_name == 'argmean':
+                assert np.allclose(processed_array, means)
+            else:
+                assert np.allclose(processed_array,
+                                   [np.sqrt(np.average((sig - mean) ** 2, weights=weights))
+                                    for mean, weights in zip(means, array)])
+
+    data_2d = DataRaw('mydata', data=[dat, 2 * dat[:, ::-1, ::-1]], nav_indexes=(0,), contiguous=contiguous,
+                      axes=[Axis('nav', data=np.linspace(0, Nnav - 1, Nnav), index=0),
+                            Axis('sigy', data=y, index=1),
+                            Axis('sigx', data=x, index=2)])
+    roi = data_2d.isig[25:75, 75:125]
+    assert (roi.get_stacked() is not None) == contiguous
+    processed = processors.get('argmax').process(roi)
+    assert len(processed) == 4
+    for ind_channel, array in enumerate(roi):
+        for ind_nav in range(Nnav):
+            iy, ix = np.unravel_index(np.argmax(array[ind_nav]), array.shape[1:])
+            assert processed[2 * ind_channel][ind_nav] == y[25:75][iy]
+            assert processed[2 * ind_channel + 1][ind_nav] == x[75:125][ix]